@@ -0,0 +1,273 @@
+"""
+Scaling benchmark of the analysis pipeline.
+
+Sweeps the mesh size for the BeamMeshGenerator bilinear and biquadratic meshes and the full and reduced integration,
+and times each phase of the analysis separately: mesh generation, DOF numbering, element stiffness, assembly, solve,
+recovery, averaging and export. The phases are run through the same Runner methods as run_analysis.
+
+Every case runs in a fresh process, so the peak resident memory of a case is not hidden by the previous ones. The peak
+of the memory allocated by Python and NumPy is also traced for each phase. The results are written as JSON, one
+record per case, e.g.:
+
+    python -m Benchmarks.scaling_benchmark --sizes 10 20 40 80 --repeat 3 --output benchmark.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import scipy
+
+from Engine.Runner import Runner
+from Pre.BeamMeshGenerator import BeamMeshGenerator
+
+PHASES = ['mesh_generation', 'dof_numbering', 'element_stiffness', 'assembly', 'solve', 'recovery', 'averaging', 'export']
+
+MESH_GENERATORS = {'quad4': 'generate_bilinear_mesh', 'quad8': 'generate_biquadratic_mesh'}
+
+# Beam of the examples, clamped at x = width and loaded at the tip
+BEAM = {'width': 60., 'height': 20., 'x_origin': 0., 'y_origin': -10., 'young_modulus': 200000., 'poisson_ratio': 0.3, 'thickness': 5., 'load': -1000.}
+
+
+class PhaseTimer(object):
+    """
+    Times the phases of a case and traces the peak memory allocated during each one.
+
+    Attributes:
+        trace_memory (bool): Traces the allocations with tracemalloc, which slows down the phases a little.
+
+        timings (Dict[str, float]): Wall-clock time in seconds of each phase.
+
+        peak_memory (Dict[str, int]): Peak of the traced memory in bytes during each phase.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        """Initializes a PhaseTimer object."""
+        self.trace_memory = trace_memory
+        self.timings: Dict[str, float] = {}
+        self.peak_memory: Dict[str, int] = {}
+
+    def run(self, phase: str, function: Callable, *args, **kwargs):
+        """Runs a phase and returns its result."""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.timings[phase] = time.perf_counter() - start
+
+        if self.trace_memory:
+            self.peak_memory[phase] = tracemalloc.get_traced_memory()[1]
+
+        return result
+
+
+def build_model(element_type: str, num_elements_x: int, num_elements_y: int) -> Runner:
+    """Builds the beam of the examples with the given mesh, clamped at its right end and loaded at its lower left corner."""
+    runner = Runner()
+    getattr(BeamMeshGenerator(runner.geometry), MESH_GENERATORS[element_type])(width=BEAM['width'], height=BEAM['height'],
+                                                                               num_elements_x=num_elements_x, num_elements_y=num_elements_y,
+                                                                               x_origin=BEAM['x_origin'], y_origin=BEAM['y_origin'])
+    runner.set_linear_elastic_material(young_modulus=BEAM['young_modulus'], poisson_ratio=BEAM['poisson_ratio'], thickness=BEAM['thickness'])
+
+    coordinates = runner.geometry.store.coordinates
+    x_end = BEAM['x_origin'] + BEAM['width']
+    for node in np.flatnonzero(np.isclose(coordinates[:, 0], x_end)):
+        runner.set_boundary_conditions(node, True, True)
+    tip = np.flatnonzero(np.isclose(coordinates[:, 0], BEAM['x_origin']) & np.isclose(coordinates[:, 1], BEAM['y_origin']))[0]
+    runner.apply_nodal_load(tip, 0., BEAM['load'])
+
+    return runner
+
+
+def run_case(element_type: str, num_elements_x: int, num_elements_y: int, intgr_type: str, renumbering: Optional[str] = None,
+             solver_type: str = 'auto', stiffness_cache: bool = False, export: bool = True, trace_memory: bool = True) -> dict:
+    """
+    Runs the analysis of one case phase by phase.
+
+    Args:
+        element_type (str): 'quad4' or 'quad8'.
+
+        num_elements_x (int): Number of elements along the beam.
+
+        num_elements_y (int): Number of elements across the beam.
+
+        intgr_type (str): Type of numerical integration of the stiffness matrix and of the stress and strain.
+
+        renumbering (Optional[str]): DOF renumbering method, see Runner.number_dofs.
+
+        solver_type (str): Linear solver backend, see Runner.select_solver.
+
+        stiffness_cache (bool): Enables the stiffness cache of the Runner, which integrates a uniform mesh once, so the
+            element_stiffness phase no longer scales with the number of elements.
+
+        export (bool): Times the export of the results store and of the VTU files to a temporary directory.
+
+        trace_memory (bool): Traces the peak memory of each phase.
+
+    Returns:
+        dict: Timings in seconds and peak traced memory in bytes of each phase, and the size of the model.
+    """
+    timer = PhaseTimer(trace_memory)
+    if trace_memory:
+        tracemalloc.start()
+
+    runner = timer.run('mesh_generation', build_model, element_type, num_elements_x, num_elements_y)
+    if stiffness_cache:
+        runner.set_stiffness_cache()
+
+    timer.run('dof_numbering', runner.number_dofs, renumbering)
+    elements_stiffness_matrices = timer.run('element_stiffness', runner.compute_elements_stiffness_matrices, intgr_type)
+    timer.run('assembly', runner.assemble_stiffness_matrix, elements_stiffness_matrices, 'sparse')
+    del elements_stiffness_matrices
+
+    def solve():
+        runner.global_force_vector = runner.geometry.assemble_global_forces_vector()
+        return runner.solve_displacements(solver_type)
+
+    timer.run('solve', solve)
+    timer.run('recovery', runner.compute_elements_stress_strain, intgr_type)
+    timer.run('averaging', runner.average_nodal_stress_strain)
+
+    if export:
+        with tempfile.TemporaryDirectory() as directory:
+            def export_results():
+                store = runner.write_results(os.path.join(directory, 'store'))
+                runner.export_vtk(os.path.join(directory, 'results'), store=store)
+
+            timer.run('export', export_results)
+
+    if trace_memory:
+        tracemalloc.stop()
+
+    cache = runner.stiffness_cache
+    return {'element_type': element_type,
+            'num_elements_x': num_elements_x,
+            'num_elements_y': num_elements_y,
+            'intgr_type': intgr_type,
+            'num_nodes': len(runner.geometry.nodes),
+            'num_elements': len(runner.geometry.elements),
+            'num_free_dofs': runner.geometry.count_global_free_dofs(),
+            'stiffness_nonzeros': int(runner.global_stiffness_matrix.nnz),
+            'solver': runner.solver.name,
+            'solver_timings': dict(runner.solver.timings),
+            'stiffness_cache': None if cache is None else {'hits': cache.hits, 'misses': cache.misses},
+            'timings': timer.timings,
+            'total_time': sum(timer.timings.values()),
+            'peak_traced_memory': timer.peak_memory,
+            'max_displacement': float(np.abs(runner.global_displacement_vector).max())}
+
+
+def run_case_in_process(connection, kwargs: dict):
+    """Runs a case in a worker process and sends back its record with the peak resident memory of the process."""
+    try:
+        record = run_case(**kwargs)
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        record['peak_resident_memory'] = max_rss if platform.system() == 'Darwin' else max_rss * 1024
+    except Exception as error:
+        record = {'error': repr(error)}
+    connection.send(record)
+    connection.close()
+
+
+def run_isolated(kwargs: dict) -> dict:
+    """Runs a case in a fresh process."""
+    connection, worker_connection = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.get_context('spawn').Process(target=run_case_in_process, args=(worker_connection, kwargs))
+    process.start()
+    worker_connection.close()
+    record = connection.recv()
+    process.join()
+    return record
+
+
+def run_benchmark(sizes: List[int], element_types: List[str], intgr_types: List[str], aspect_ratio: int = 4, repeat: int = 1, **options) -> List[dict]:
+    """
+    Runs every combination of mesh size, element type and integration type.
+
+    The mesh has size elements along the beam and max(size // aspect_ratio, 1) across. With repeat > 1 each case is run
+    several times and the record of the fastest total time is kept, its timings are those of a single run.
+
+    Args:
+        sizes (List[int]): Numbers of elements along the beam.
+
+        element_types (List[str]): Element types ('quad4', 'quad8').
+
+        intgr_types (List[str]): Integration types ('full', 'reduced').
+
+        aspect_ratio (int): Ratio of the number of elements along and across the beam.
+
+        repeat (int): Number of runs of each case.
+
+        **options: Keyword arguments of run_case.
+
+    Returns:
+        List[dict]: Records of the cases.
+    """
+    records = []
+    for element_type in element_types:
+        for intgr_type in intgr_types:
+            for size in sizes:
+                kwargs = dict(options, element_type=element_type, num_elements_x=size, num_elements_y=max(size // aspect_ratio, 1), intgr_type=intgr_type)
+                runs = [run_isolated(kwargs) for _ in range(repeat)]
+                failed = [run for run in runs if 'error' in run]
+                record = failed[0] if failed else min(runs, key=lambda run: run['total_time'])
+                record.update({key: kwargs[key] for key in ('element_type', 'num_elements_x', 'num_elements_y', 'intgr_type')}, repeat=repeat)
+                records.append(record)
+
+                if 'error' in record:
+                    print(f"{element_type} {intgr_type} {size}: {record['error']}")
+                else:
+                    print(f"{element_type} {intgr_type} {size}: {record['num_free_dofs']} dofs, "
+                          + ', '.join(f'{phase} {elapsed:.4f}' for phase, elapsed in record['timings'].items())
+                          + f" s, peak RSS {record['peak_resident_memory'] / 2 ** 20:.1f} MiB")
+
+    return records
+
+
+def environment() -> dict:
+    """Returns the versions and the machine the benchmark ran on."""
+    return {'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'scipy': scipy.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count()}
+
+
+def main(argv: Optional[List[str]] = None):
+    """Runs the benchmark from the command line and writes the results to a JSON file."""
+    parser = argparse.ArgumentParser(description='Scaling benchmark of the analysis pipeline.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 40, 80, 160], help='numbers of elements along the beam')
+    parser.add_argument('--element-types', nargs='+', default=list(MESH_GENERATORS), choices=list(MESH_GENERATORS))
+    parser.add_argument('--intgr-types', nargs='+', default=['full', 'reduced'], choices=['full', 'reduced'])
+    parser.add_argument('--aspect-ratio', type=int, default=4, help='ratio of the numbers of elements along and across the beam')
+    parser.add_argument('--repeat', type=int, default=1, help='runs of each case, the fastest one is kept')
+    parser.add_argument('--renumbering', choices=['rcm', 'amd', 'nested_dissection'], default=None)
+    parser.add_argument('--solver-type', default='auto')
+    parser.add_argument('--stiffness-cache', action='store_true', help='integrates every distinct shape instead of every element')
+    parser.add_argument('--no-export', action='store_true', help='skips the export phase')
+    parser.add_argument('--no-trace-memory', action='store_true', help='skips tracemalloc, only the peak resident memory is recorded')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON file of the results')
+    args = parser.parse_args(argv)
+
+    options = {'renumbering': args.renumbering, 'solver_type': args.solver_type, 'stiffness_cache': args.stiffness_cache,
+               'export': not args.no_export, 'trace_memory': not args.no_trace_memory}
+    records = run_benchmark(args.sizes, args.element_types, args.intgr_types, args.aspect_ratio, args.repeat, **options)
+
+    with open(args.output, 'w') as file:
+        json.dump({'environment': environment(), 'phases': PHASES, 'options': options, 'cases': records}, file, indent=2)
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
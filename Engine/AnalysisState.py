@@ -0,0 +1,103 @@
+from typing import Dict, Hashable, List, Optional
+import numpy as np
+
+
+class AnalysisState(object):
+    """
+    Represents the state of the analyses run on a geometry, so repeated analyses only recompute what changed.
+
+    Each stage of the analysis is recorded with a key built from the modification counters of the mesh store, the
+    analysis options and the keys of the stages it depends on. A stage is up to date while its key does not change.
+    The result arrays are kept as buffers that are reset, not reallocated, between runs of the same size.
+
+    Attributes:
+        stage_keys (Dict[str, Hashable]): Key of the last computation of each stage.
+
+        executed_stages (List[str]): Stages computed by the last analysis, the other ones were reused.
+
+        buffers (Dict[str, np.ndarray]): Preallocated result arrays by name.
+    """
+
+    def __init__(self):
+        """Initializes an AnalysisState object."""
+        self.stage_keys: Dict[str, Hashable] = {}
+        self.executed_stages: List[str] = []
+        self.buffers: Dict[str, np.ndarray] = {}
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the state."""
+        return 'AnalysisState'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the state."""
+        return f'{self.name} with stages {list(self.stage_keys)}'
+
+    def begin_run(self):
+        """Starts a new analysis, clearing the list of executed stages."""
+        self.executed_stages = []
+
+    def is_up_to_date(self, stage: str, key: Hashable) -> bool:
+        """
+        Checks if a stage was already computed with the given key.
+
+        Args:
+            stage (str): Name of the stage.
+
+            key (Hashable): Key of the inputs of the stage.
+
+        Returns:
+            bool: True if the stage can be reused.
+        """
+        return stage in self.stage_keys and self.stage_keys[stage] == key
+
+    def mark_computed(self, stage: str, key: Hashable):
+        """
+        Records that a stage was computed with the given key.
+
+        Args:
+            stage (str): Name of the stage.
+
+            key (Hashable): Key of the inputs of the stage.
+        """
+        self.stage_keys[stage] = key
+        self.executed_stages.append(stage)
+
+    def get_key(self, stage: str) -> Optional[Hashable]:
+        """Returns the key of the last computation of a stage, None if it was never computed."""
+        return self.stage_keys.get(stage)
+
+    def invalidate(self, stage: Optional[str] = None):
+        """
+        Forces a stage, or every stage when None, to be recomputed by the next analysis.
+
+        Args:
+            stage (Optional[str]): Name of the stage.
+        """
+        if stage is None:
+            self.stage_keys.clear()
+        else:
+            self.stage_keys.pop(stage, None)
+
+    def get_buffer(self, name: str, shape: tuple, dtype: type = float) -> np.ndarray:
+        """
+        Returns a zeroed result array, reusing the previous one when its shape and type match.
+
+        Args:
+            name (str): Name of the buffer.
+
+            shape (tuple): Shape of the array.
+
+            dtype (type): Data type of the array.
+
+        Returns:
+            np.ndarray: The zeroed array.
+        """
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != np.dtype(dtype):
+            buffer = np.zeros(shape, dtype=dtype)
+            self.buffers[name] = buffer
+        else:
+            buffer.fill(0)
+        return buffer
+
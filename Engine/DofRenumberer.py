@@ -0,0 +1,300 @@
+import heapq
+from typing import Optional
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, reverse_cuthill_mckee, shortest_path
+
+from Engine.Geometry import Geometry
+
+
+class DofRenumberer(object):
+    """
+    Computes node orderings that reduce the bandwidth or the fill-in of the global stiffness matrix.
+
+    The orderings are computed on the nodal graph, where two nodes are adjacent when they share an element, so both
+    degrees of freedom of a node are always numbered together.
+
+    Attributes:
+        geometry (Geometry): The geometry to be renumbered.
+
+        NESTED_DISSECTION_LEAF_SIZE (int): Size under which the nested dissection stops splitting a subgraph.
+    """
+
+    NESTED_DISSECTION_LEAF_SIZE = 64
+
+    def __init__(self, geometry: Geometry):
+        """
+        Initializes a DofRenumberer object.
+
+        Args:
+            geometry (Geometry): The geometry to be renumbered.
+        """
+        self.geometry = geometry
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the renumberer."""
+        return 'DofRenumberer'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the renumberer."""
+        return self.name
+
+    def compute_node_order(self, method: str) -> np.ndarray:
+        """
+        Computes the order in which the nodes are numbered.
+
+        Args:
+            method (str): Renumbering method ('rcm' for reverse Cuthill-McKee, 'amd' for approximate minimum degree or
+                'nested_dissection').
+
+        Returns:
+            np.ndarray: Node indices (label - 1) in their new order.
+
+        Raises:
+            ValueError: If the method is not supported.
+        """
+        graph = self.geometry.build_nodal_graph()
+
+        if method == 'rcm':
+            return self.reverse_cuthill_mckee(graph)
+        elif method == 'amd':
+            return self.approximate_minimum_degree(graph)
+        elif method == 'nested_dissection':
+            return self.nested_dissection(graph)
+        else:
+            raise ValueError('method must be either "rcm", "amd" or "nested_dissection"')
+
+    @staticmethod
+    def reverse_cuthill_mckee(graph: csr_matrix) -> np.ndarray:
+        """Orders the nodes with the reverse Cuthill-McKee algorithm, which reduces the bandwidth."""
+        return np.asarray(reverse_cuthill_mckee(graph, symmetric_mode=True), dtype=int)
+
+    @staticmethod
+    def approximate_minimum_degree(graph: csr_matrix) -> np.ndarray:
+        """
+        Orders the nodes with the approximate minimum degree algorithm (AMD), which reduces the fill-in of the
+        factorization.
+
+        The elimination runs on the quotient graph: an eliminated node becomes an element holding the list of its
+        uneliminated neighbours, instead of joining them into an explicit clique, so the memory stays proportional to
+        the nodal graph. The elements adjacent to the pivot, and the elements whose list falls inside the new element
+        (aggressive absorption), are absorbed into it. The degrees are the approximate external degrees of Amestoy,
+        Davis and Duff, an upper bound computed from the sizes of the element lists without forming their union. Nodes
+        with the same adjacency are merged into supervariables and eliminated together.
+
+        The elimination runs on the nodal graph, so each node stands for both of its degrees of freedom. The ordering
+        reduces the fill-in, not the bandwidth, so its profile is usually larger than the one of 'rcm'.
+        """
+        num_nodes = graph.shape[0]
+        variable_adjacency = [set(graph.indices[graph.indptr[i]:graph.indptr[i + 1]].tolist()) - {i} for i in range(num_nodes)]
+        element_adjacency = [set() for _ in range(num_nodes)]
+        elements = {}
+        element_weights = {}
+
+        # Number of nodes of each supervariable and the nodes it holds, in elimination order
+        weights = [1] * num_nodes
+        members = [[i] for i in range(num_nodes)]
+        alive = [True] * num_nodes
+        degrees = [len(neighbours) for neighbours in variable_adjacency]
+        remaining = num_nodes
+
+        heap = [(degree, i) for i, degree in enumerate(degrees)]
+        heapq.heapify(heap)
+
+        order = []
+        while heap:
+            degree, pivot = heapq.heappop(heap)
+            if not alive[pivot] or degree != degrees[pivot]:
+                continue
+
+            alive[pivot] = False
+            order.extend(members[pivot])
+            remaining -= weights[pivot]
+
+            # The pivot becomes an element, absorbing the elements adjacent to it
+            pivot_elements = element_adjacency[pivot]
+            pivot_list = variable_adjacency[pivot]
+            for element in pivot_elements:
+                pivot_list |= elements.pop(element)
+                del element_weights[element]
+            pivot_list.discard(pivot)
+            variable_adjacency[pivot] = element_adjacency[pivot] = None
+
+            elements[pivot] = pivot_list
+            element_weights[pivot] = pivot_weight = sum(weights[i] for i in pivot_list)
+
+            # The edges covered by the new element are pruned
+            for i in pivot_list:
+                element_adjacency[i] -= pivot_elements
+                element_adjacency[i].add(pivot)
+                variable_adjacency[i] -= pivot_list
+                variable_adjacency[i].discard(pivot)
+
+            # Weight of the nodes of each other element outside the new element, |Le \ Lp|
+            external_weights = {}
+            for i in pivot_list:
+                for element in element_adjacency[i]:
+                    if element != pivot:
+                        external_weights[element] = external_weights.get(element, element_weights[element]) - weights[i]
+
+            absorbed = [element for element, weight in external_weights.items() if weight == 0]
+            for element in absorbed:
+                for i in elements.pop(element):
+                    element_adjacency[i].discard(element)
+                del element_weights[element]
+
+            for i in pivot_list:
+                external_degree = sum(external_weights[element] for element in element_adjacency[i] if element != pivot)
+                external_degree += sum(weights[j] for j in variable_adjacency[i])
+                degrees[i] = min(remaining - weights[i], degrees[i] + pivot_weight - weights[i], external_degree + pivot_weight - weights[i])
+
+            # Nodes of the new element with the same adjacency are indistinguishable, they are merged
+            groups = {}
+            for i in pivot_list:
+                groups.setdefault((frozenset(variable_adjacency[i]), frozenset(element_adjacency[i])), []).append(i)
+            for group in groups.values():
+                principal = group[0]
+                for i in group[1:]:
+                    weights[principal] += weights[i]
+                    members[principal] += members[i]
+                    degrees[principal] -= weights[i]
+                    alive[i] = False
+
+                    for j in variable_adjacency[i]:
+                        variable_adjacency[j].discard(i)
+                    for element in element_adjacency[i]:
+                        elements[element].discard(i)
+                    variable_adjacency[i] = element_adjacency[i] = None
+
+            for i in elements[pivot]:
+                heapq.heappush(heap, (degrees[i], i))
+
+        return np.array(order, dtype=int)
+
+    @staticmethod
+    def bisect(graph: csr_matrix) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Splits a connected graph into two parts and the vertex separator between them.
+
+        A breadth-first level structure is built from a pseudo-peripheral node. The level at which half of the nodes
+        is reached is the separator, since nodes of non-consecutive levels are never adjacent.
+
+        Args:
+            graph (csr_matrix): Adjacency matrix of a connected graph.
+
+        Returns:
+            (np.ndarray, np.ndarray, np.ndarray): Indices of the first part, the second part and the separator.
+        """
+        # Find a pseudo-peripheral node by restarting the breadth-first search from the farthest node
+        levels = shortest_path(graph, unweighted=True, indices=0)
+        for _ in range(4):
+            new_levels = shortest_path(graph, unweighted=True, indices=int(np.argmax(levels)))
+            if new_levels.max() <= levels.max():
+                break
+            levels = new_levels
+
+        levels = levels.astype(int)
+        counts = np.bincount(levels)
+        separator_level = int(np.searchsorted(np.cumsum(counts), len(levels) / 2.))
+
+        part_a = np.flatnonzero(levels < separator_level)
+        part_b = np.flatnonzero(levels > separator_level)
+        separator = np.flatnonzero(levels == separator_level)
+        return part_a, part_b, separator
+
+    def nested_dissection(self, graph: csr_matrix) -> np.ndarray:
+        """Orders the nodes by nested dissection: both parts of a bisection are numbered before their separator."""
+        return self._nested_dissection(graph, np.arange(graph.shape[0]))
+
+    def _nested_dissection(self, graph: csr_matrix, nodes: np.ndarray) -> np.ndarray:
+        """Recursively orders a subgraph, nodes holds the original indices of its nodes."""
+        if len(nodes) <= self.NESTED_DISSECTION_LEAF_SIZE:
+            return nodes[self.reverse_cuthill_mckee(graph)]
+
+        num_components, labels = connected_components(graph, directed=False)
+        if num_components > 1:
+            return np.concatenate([self._dissect_component(graph, nodes, np.flatnonzero(labels == component)) for component in range(num_components)])
+
+        part_a, part_b, separator = self.bisect(graph)
+        if len(part_a) == 0 or len(part_b) == 0:
+            return nodes[self.reverse_cuthill_mckee(graph)]
+
+        return np.concatenate([self._dissect_component(graph, nodes, part_a),
+                               self._dissect_component(graph, nodes, part_b),
+                               nodes[separator]])
+
+    def _dissect_component(self, graph: csr_matrix, nodes: np.ndarray, subset: np.ndarray) -> np.ndarray:
+        """Orders the subgraph induced by a subset of the nodes of a graph."""
+        return self._nested_dissection(graph[subset][:, subset], nodes[subset])
+
+    def compute_node_partition(self, num_parts: int) -> np.ndarray:
+        """
+        Partitions the nodes into subdomains by recursive graph bisection.
+
+        The largest part is bisected until there are num_parts parts. The separators of all bisections form the
+        interface, so nodes of different parts never share an element.
+
+        Args:
+            num_parts (int): Number of parts.
+
+        Returns:
+            np.ndarray: Part of each node with shape (n_nodes,), -1 for the interface nodes.
+
+        Raises:
+            ValueError: If num_parts is smaller than 1.
+        """
+        if num_parts < 1:
+            raise ValueError('num_parts must be at least 1')
+
+        graph = self.geometry.build_nodal_graph()
+        labels = np.zeros(graph.shape[0], dtype=int)
+        parts = [np.arange(graph.shape[0])]
+
+        while len(parts) < num_parts:
+            largest = max(range(len(parts)), key=lambda part: len(parts[part]))
+            nodes = parts[largest]
+            part_a, part_b, separator = self._split(graph[nodes][:, nodes])
+            if len(part_a) == 0 or len(part_b) == 0:
+                break
+
+            labels[nodes[separator]] = -1
+            labels[nodes[part_b]] = len(parts)
+            parts[largest] = nodes[part_a]
+            parts.append(nodes[part_b])
+
+        return labels
+
+    def _split(self, graph: csr_matrix) -> (np.ndarray, np.ndarray, np.ndarray):
+        """Splits a graph in two parts, between components when it is not connected and by bisection otherwise."""
+        num_components, labels = connected_components(graph, directed=False)
+        if num_components == 1:
+            return self.bisect(graph)
+
+        # Largest components first, each one to the smallest part
+        sizes = np.bincount(labels)
+        in_part_b = np.zeros(num_components, dtype=bool)
+        size_a = size_b = 0
+        for component in np.argsort(-sizes, kind='stable'):
+            if size_b < size_a:
+                in_part_b[component] = True
+                size_b += sizes[component]
+            else:
+                size_a += sizes[component]
+
+        return np.flatnonzero(~in_part_b[labels]), np.flatnonzero(in_part_b[labels]), np.array([], dtype=int)
+
+    def compute_bandwidth_and_profile(self, node_order: Optional[np.ndarray] = None) -> (int, int):
+        """
+        Computes the bandwidth and the profile of the global stiffness matrix for a node order.
+
+        The global indices of the geometry are not modified, see Geometry.compute_nodal_global_indices to apply an order.
+
+        Args:
+            node_order (Optional[np.ndarray]): Node indices in their numbering order, creation order if None.
+
+        Returns:
+            (int, int): Half bandwidth (largest distance from a diagonal entry to the first nonzero entry of its row)
+                and profile (sum of those distances over all rows).
+        """
+        return self.geometry.compute_bandwidth_and_profile(self.geometry.number_nodal_dofs(node_order))
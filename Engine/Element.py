@@ -4,22 +4,35 @@ import numpy as np
 from Engine.Gauss import Gauss
 from Engine.Node import Node
 from Engine.Material import Material
+from Engine.MeshStore import MeshStore
+from Engine.ReferenceElement import ReferenceElement
 
 
 class Element(object):
     """
     Represents a finite element used in structural analysis.
 
+    The elements of a Geometry are bound to the MeshStore of the geometry, so their coordinates and connectivity
+    vectors are read from its arrays. Elements created directly read them from their nodes.
+
     Attributes:
         nodes (List[Node]): List of nodes that define the element.
 
         material (Optional[Material]): Material assigned to the element.
 
-        gauss (Gauss): Gauss quadrature method for numerical integration.
+        gauss (Gauss): Gauss quadrature method for numerical integration, shared by all elements.
 
         elem_dofs (int): Number of degrees of freedom associated with the element.
+
+        store (Optional[MeshStore]): Store the element is bound to, None for elements created directly.
+
+        index (Optional[int]): Index of the element in the store.
     """
 
+    __slots__ = ('label', 'nodes', 'material', 'elem_dofs', 'stress_gp', 'strain_gp', 'store', 'index')
+
+    gauss = Gauss()
+
     def __init__(self, nodes: List[Node] = None, material: Optional[Material] = None):
         """
         Initializes an Element object.
@@ -35,13 +48,28 @@ class Element(object):
             nodes = []
         self.nodes = nodes
         self.material = material
-        self.gauss = Gauss()
         self.elem_dofs: int = 0
 
         # Element data
         self.stress_gp = None
         self.strain_gp = None
 
+        # Array storage
+        self.store = None
+        self.index = None
+
+    def bind(self, store: MeshStore, index: int):
+        """
+        Binds the element to a row of the connectivity of a store.
+
+        Args:
+            store (MeshStore): Store that holds the mesh arrays.
+
+            index (int): Index of the element in the store.
+        """
+        self.store = store
+        self.index = index
+
     @property
     def name(self):
         """Returns the name of the element."""
@@ -75,6 +103,8 @@ class Element(object):
             material (Material): Material assigned to the element.
         """
         self.material = material
+        if self.store is not None:
+            self.store.mark_modified('materials')
 
     def count_elem_dofs(self) -> int:
         """
@@ -116,6 +146,108 @@ class Element(object):
         """Computes the element stiffness matrix."""
         raise NotImplementedError('Method compute_elem_stiffness_matrix not implemented')
 
+    def get_reference_element(self, intgr_type: str) -> ReferenceElement:
+        """Returns the reference quantities shared by all elements of this type for the given integration type."""
+        return ReferenceElement.get(type(self), intgr_type)
+
+    def construct_extrapolation_matrix(self, number_gp: int) -> np.ndarray:
+        """Constructs the matrix that extrapolates values from the ordered Gauss points to the nodes."""
+        raise NotImplementedError('Method construct_extrapolation_matrix not implemented')
+
+    @classmethod
+    def compute_block_b_matrices(cls, coordinates: np.ndarray, intgr_type: str, ordered: bool = False) -> (np.ndarray, np.ndarray):
+        """
+        Computes the B matrices and Jacobian determinants of a block of elements of this type at all Gauss points.
+
+        The Jacobians of all elements and Gauss points are stacked and inverted in closed form.
+
+        Args:
+            coordinates (np.ndarray): Nodal coordinates of the elements with shape (n_elem, n_nodes, 2).
+
+            intgr_type (str): Type of numerical integration.
+
+            ordered (bool): Uses the ordered Gauss points of the stress and strain recovery instead of the integration
+                points.
+
+        Returns:
+            (np.ndarray, np.ndarray): B matrices with shape (n_elem, n_gp, 3, 2 * n_nodes) and Jacobian determinants
+                with shape (n_elem, n_gp).
+        """
+        reference = ReferenceElement.get(cls, intgr_type)
+        shape_derivatives = reference.ordered_shape_derivatives if ordered else reference.shape_derivatives
+
+        jacobians = cls.block_jacobian(shape_derivatives, coordinates)
+        jacobian_determinants = cls.block_jacobian_determinant(jacobians)
+        inverse_jacobians = cls.block_inverse_jacobian(jacobians, jacobian_determinants)
+
+        derivatives = np.einsum('egab,gbn->egan', inverse_jacobians, shape_derivatives)
+        return cls.assemble_block_b_matrices(derivatives), jacobian_determinants
+
+    @classmethod
+    def compute_block_stiffness_matrices(cls, coordinates: np.ndarray, elastic_matrix: np.ndarray, thickness: float, stiff_intgr_type: str, return_b_matrices: bool = False):
+        """
+        Computes the stiffness matrices of a block of elements of this type at once.
+
+        The B matrices of all elements and Gauss points are contracted with einsum, which avoids the small array
+        allocations of compute_elem_stiffness_matrix.
+
+        Args:
+            coordinates (np.ndarray): Nodal coordinates of the elements with shape (n_elem, n_nodes, 2).
+
+            elastic_matrix (np.ndarray): Elastic matrix of the material.
+
+            thickness (float): Thickness of the elements.
+
+            stiff_intgr_type (str): Type of numerical integration.
+
+            return_b_matrices (bool): Also returns the B matrices at the integration points, so they can be reused by
+                the stress and strain recovery.
+
+        Returns:
+            np.ndarray: Element stiffness matrices with shape (n_elem, 2 * n_nodes, 2 * n_nodes), followed by the B
+                matrices with shape (n_elem, n_gp, 3, 2 * n_nodes) when return_b_matrices is True.
+        """
+        reference = ReferenceElement.get(cls, stiff_intgr_type)
+
+        b_matrices, jacobian_determinants = cls.compute_block_b_matrices(coordinates, stiff_intgr_type)
+        stiffness_matrices = cls.integrate_block_stiffness_matrices(b_matrices, jacobian_determinants, reference.weights, elastic_matrix, thickness)
+
+        if return_b_matrices:
+            return stiffness_matrices, b_matrices
+        return stiffness_matrices
+
+    @classmethod
+    def compute_block_stress_strain(cls, coordinates: np.ndarray, elem_displacements: np.ndarray, elastic_matrix: np.ndarray, stress_strain_intgr_type: str, b_matrices: Optional[np.ndarray] = None) -> (np.ndarray, np.ndarray):
+        """
+        Computes the stress and strain at the Gauss points of a block of elements of this type at once.
+
+        The strains of all elements and Gauss points are computed in a single batched contraction.
+
+        Args:
+            coordinates (np.ndarray): Nodal coordinates of the elements with shape (n_elem, n_nodes, 2).
+
+            elem_displacements (np.ndarray): Element displacement vectors with shape (n_elem, 2 * n_nodes), or
+                (n_elem, 2 * n_nodes, n_cases) for several load cases.
+
+            elastic_matrix (np.ndarray): Elastic matrix of the material.
+
+            stress_strain_intgr_type (str): Type of numerical integration.
+
+            b_matrices (Optional[np.ndarray]): B matrices at the ordered Gauss points with shape
+                (n_elem, n_gp, 3, 2 * n_nodes), e.g. cached from the stiffness pass. Computed when None.
+
+        Returns:
+            (np.ndarray, np.ndarray): Stress and strain at the ordered Gauss points, both with shape (n_elem, n_gp, 3)
+                or (n_elem, n_gp, 3, n_cases).
+        """
+        if b_matrices is None:
+            b_matrices, _ = cls.compute_block_b_matrices(coordinates, stress_strain_intgr_type, ordered=True)
+
+        strain = np.einsum('egia,ea...->egi...', b_matrices, elem_displacements)
+        stress = np.einsum('ij,egj...->egi...', elastic_matrix, strain)
+
+        return stress, strain
+
     def assemble_elem_b_matrix(self, shape_derivative: np.ndarray) -> np.ndarray:
         """Assembles the B matrix for the element."""
         num_nodes = len(self.nodes)
@@ -132,9 +264,93 @@ class Element(object):
 
         return b_matrix
 
+    @staticmethod
+    def block_jacobian(shape_derivatives: np.ndarray, coordinates: np.ndarray) -> np.ndarray:
+        """
+        Computes the Jacobian matrices of a block of elements at all Gauss points.
+
+        Args:
+            shape_derivatives (np.ndarray): Parametric derivatives of the shape functions with shape (n_gp, 2, n_nodes).
+
+            coordinates (np.ndarray): Nodal coordinates of the elements with shape (n_elem, n_nodes, 2).
+
+        Returns:
+            np.ndarray: Jacobian matrices with shape (n_elem, n_gp, 2, 2).
+        """
+        return np.einsum('gan,enb->egab', shape_derivatives, coordinates)
+
+    @staticmethod
+    def block_jacobian_determinant(jacobians: np.ndarray) -> np.ndarray:
+        """Computes the determinants of stacked 2x2 Jacobian matrices in closed form."""
+        return jacobians[..., 0, 0] * jacobians[..., 1, 1] - jacobians[..., 0, 1] * jacobians[..., 1, 0]
+
+    @staticmethod
+    def block_inverse_jacobian(jacobians: np.ndarray, determinants: np.ndarray) -> np.ndarray:
+        """Computes the inverses of stacked 2x2 Jacobian matrices in closed form."""
+        inverse = np.empty_like(jacobians)
+        inverse[..., 0, 0] = jacobians[..., 1, 1] / determinants
+        inverse[..., 0, 1] = -jacobians[..., 0, 1] / determinants
+        inverse[..., 1, 0] = -jacobians[..., 1, 0] / determinants
+        inverse[..., 1, 1] = jacobians[..., 0, 0] / determinants
+        return inverse
+
+    @staticmethod
+    def assemble_block_b_matrices(shape_derivatives: np.ndarray) -> np.ndarray:
+        """
+        Assembles the B matrices of a block of elements at all Gauss points.
+
+        Args:
+            shape_derivatives (np.ndarray): Cartesian derivatives of the shape functions with shape (..., 2, n_nodes).
+
+        Returns:
+            np.ndarray: B matrices with shape (..., 3, 2 * n_nodes).
+        """
+        num_nodes = shape_derivatives.shape[-1]
+
+        b_matrices = np.zeros(shape_derivatives.shape[:-2] + (3, 2 * num_nodes))
+        b_matrices[..., 0, 0::2] = shape_derivatives[..., 0, :]
+        b_matrices[..., 1, 1::2] = shape_derivatives[..., 1, :]
+        b_matrices[..., 2, 0::2] = shape_derivatives[..., 1, :]
+        b_matrices[..., 2, 1::2] = shape_derivatives[..., 0, :]
+
+        return b_matrices
+
+    @staticmethod
+    def integrate_block_stiffness_matrices(b_matrices: np.ndarray, jacobian_determinants: np.ndarray, weights: np.ndarray, elastic_matrix: np.ndarray, thickness: float) -> np.ndarray:
+        """
+        Integrates the stiffness matrices of a block of elements.
+
+        Args:
+            b_matrices (np.ndarray): B matrices with shape (n_elem, n_gp, 3, n_dofs).
+
+            jacobian_determinants (np.ndarray): Jacobian determinants with shape (n_elem, n_gp).
+
+            weights (np.ndarray): Products of the Gauss weights with shape (n_gp,).
+
+            elastic_matrix (np.ndarray): Elastic matrix of the material.
+
+            thickness (float): Thickness of the elements.
+
+        Returns:
+            np.ndarray: Element stiffness matrices with shape (n_elem, n_dofs, n_dofs).
+        """
+        factors = jacobian_determinants * (thickness * weights)
+        elastic_b_matrices = np.einsum('ij,egjb->egib', elastic_matrix, b_matrices)
+        return np.einsum('eg,egia,egib->eab', factors, b_matrices, elastic_b_matrices, optimize=True)
+
+    def get_coordinates(self) -> np.ndarray:
+        """Returns the nodal coordinates of the element with shape (n_nodes, 2)."""
+        if self.store is not None:
+            return self.store.coordinates[self.store.get_connectivity(self.index)]
+        return np.array([[node.x, node.y] for node in self.nodes])
+
     # This vector is used to assemble the global stiffness matrix
     def get_connectivity_vector(self) -> np.ndarray:
         """Returns the connectivity vector for global assembly."""
+        if self.store is not None:
+            node_indices = self.store.get_connectivity(self.index)
+            return np.where(self.store.constraints[node_indices], -1, self.store.dof_map[node_indices]).ravel()
+
         steering = np.full(self.count_elem_dofs(), -1)
         for i, node in enumerate(self.nodes):
             if not node.is_constrained_x():
@@ -160,6 +376,20 @@ class Element(object):
         """Computes the stress and strain at the gauss points."""
         raise NotImplementedError('Method compute_stress_strain not implemented')
 
-    def extrapolate_stress_strain_gp_to_nodes(self, stress_strain_intgr_type: str):
-        """Extrapolates the stress or strain from the gauss points to the nodes."""
-        raise NotImplementedError('Method extrapolate_stress_strain_gp_to_nodes not implemented')
+    def extrapolate_stress_strain_gp_to_nodes(self, stress_strain_intgr_type: str) -> (np.ndarray, np.ndarray):
+        """
+        Extrapolates the stress and strain from the Gauss points to the nodes.
+
+        Args:
+            stress_strain_intgr_type (str): Type of numerical integration.
+
+        Returns:
+            (np.ndarray, np.ndarray): Stress and strain at the nodes of the element with shape (n_nodes, 3).
+        """
+        # Each row corresponds to a node and each column to an ordered gauss point
+        extrapolation_matrix = self.get_reference_element(stress_strain_intgr_type).extrapolation_matrix
+
+        stress_nodes = extrapolation_matrix @ self.stress_gp
+        strain_nodes = extrapolation_matrix @ self.strain_gp
+
+        return stress_nodes, strain_nodes
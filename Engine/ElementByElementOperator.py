@@ -0,0 +1,149 @@
+from typing import Callable, List, Optional
+import numpy as np
+
+
+class ElementByElementOperator(object):
+    """
+    Represents the global stiffness matrix as a matrix-free, element-by-element operator.
+
+    The global matrix is never assembled. The product K @ u gathers the element displacements through the connectivity
+    vectors, multiplies them by the element stiffness matrices in a batched einsum and scatter-adds the result. The
+    element matrices are either cached (O(n_elem * n_dofs^2) memory) or recomputed in chunks at every product.
+
+    Attributes:
+        num_dofs (int): Number of global free degrees of freedom.
+
+        chunk_size (int): Number of elements whose matrices are recomputed at once when they are not cached.
+
+        groups (List[dict]): Element groups, each with a 'connectivity' array of shape (n_elem, n_dofs) and either the
+            cached 'element_matrices' or a 'compute_element_matrices' callable.
+    """
+
+    def __init__(self, num_dofs: int, chunk_size: int = 4096):
+        """
+        Initializes an ElementByElementOperator object.
+
+        Args:
+            num_dofs (int): Number of global free degrees of freedom.
+
+            chunk_size (int): Number of elements whose matrices are recomputed at once when they are not cached.
+        """
+        self.num_dofs = num_dofs
+        self.chunk_size = chunk_size
+        self.groups: List[dict] = []
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the operator."""
+        return 'Element-by-Element Operator'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the operator."""
+        num_elements = sum(len(group['connectivity']) for group in self.groups)
+        return f'{self.name} with {self.num_dofs} dofs and {num_elements} elements'
+
+    @property
+    def shape(self) -> (int, int):
+        """Returns the shape of the represented global matrix."""
+        return self.num_dofs, self.num_dofs
+
+    def add_group(self, connectivity: np.ndarray, element_matrices: Optional[np.ndarray] = None, compute_element_matrices: Optional[Callable[[np.ndarray], np.ndarray]] = None):
+        """
+        Adds a group of elements with the same number of degrees of freedom.
+
+        Args:
+            connectivity (np.ndarray): Connectivity vectors of the elements with shape (n_elem, n_dofs), -1 for
+                constrained degrees of freedom.
+
+            element_matrices (Optional[np.ndarray]): Cached element stiffness matrices with shape (n_elem, n_dofs, n_dofs).
+
+            compute_element_matrices (Optional[Callable[[np.ndarray], np.ndarray]]): Computes the stiffness matrices of
+                the elements of the group with the given local indices, used when the matrices are not cached.
+
+        Raises:
+            ValueError: If neither the element matrices nor a way to compute them is given.
+        """
+        if element_matrices is None and compute_element_matrices is None:
+            raise ValueError('Either element_matrices or compute_element_matrices must be given')
+
+        # Constrained dofs point to an extra slot that always holds zero
+        connectivity = np.where(connectivity == -1, self.num_dofs, connectivity)
+
+        self.groups.append({'connectivity': connectivity,
+                            'element_matrices': element_matrices,
+                            'compute_element_matrices': compute_element_matrices})
+
+    def _iterate_blocks(self):
+        """Yields the connectivity and stiffness matrices of the elements, chunk by chunk when they are not cached."""
+        for group in self.groups:
+            connectivity = group['connectivity']
+            if group['element_matrices'] is not None:
+                yield connectivity, group['element_matrices']
+            else:
+                for start in range(0, len(connectivity), self.chunk_size):
+                    indices = np.arange(start, min(start + self.chunk_size, len(connectivity)))
+                    yield connectivity[indices], group['compute_element_matrices'](indices)
+
+    def matvec(self, vector: np.ndarray) -> np.ndarray:
+        """
+        Computes the product of the global stiffness matrix and a vector.
+
+        Args:
+            vector (np.ndarray): Vector of global free degrees of freedom.
+
+        Returns:
+            np.ndarray: Product K @ vector.
+        """
+        extended_vector = np.append(vector, 0.)
+
+        result = np.zeros(self.num_dofs + 1)
+        for connectivity, element_matrices in self._iterate_blocks():
+            elem_result = np.einsum('eab,eb->ea', element_matrices, extended_vector[connectivity])
+            result += np.bincount(connectivity.ravel(), weights=elem_result.ravel(), minlength=self.num_dofs + 1)
+
+        return result[:self.num_dofs]
+
+    def __matmul__(self, vector: np.ndarray) -> np.ndarray:
+        """Computes the product of the global stiffness matrix and a vector."""
+        return self.matvec(vector)
+
+    def diagonal(self) -> np.ndarray:
+        """Returns the diagonal of the global stiffness matrix."""
+        result = np.zeros(self.num_dofs + 1)
+        for connectivity, element_matrices in self._iterate_blocks():
+            elem_diagonal = np.einsum('eaa->ea', element_matrices)
+            result += np.bincount(connectivity.ravel(), weights=elem_diagonal.ravel(), minlength=self.num_dofs + 1)
+
+        return result[:self.num_dofs]
+
+    def get_nodal_blocks(self, nodal_dofs: np.ndarray) -> np.ndarray:
+        """
+        Returns the 2x2 diagonal blocks of the global stiffness matrix associated with each node.
+
+        Args:
+            nodal_dofs (np.ndarray): Global indices of the x and y degrees of freedom of each node with shape
+                (n_nodes, 2), -1 for constrained degrees of freedom.
+
+        Returns:
+            np.ndarray: Nodal blocks with shape (n_nodes, 2, 2), entries of constrained degrees of freedom are zero.
+        """
+        # Position of each free dof inside the nodal block, 0 for x and 1 for y
+        dof_node = np.full(self.num_dofs + 1, -1)
+        dof_direction = np.zeros(self.num_dofs + 1, dtype=int)
+        for direction in range(2):
+            free = nodal_dofs[:, direction] != -1
+            dof_node[nodal_dofs[free, direction]] = np.flatnonzero(free)
+            dof_direction[nodal_dofs[free, direction]] = direction
+
+        num_nodes = len(nodal_dofs)
+        blocks = np.zeros(num_nodes * 4)
+        for connectivity, element_matrices in self._iterate_blocks():
+            rows = connectivity[:, :, None]
+            cols = connectivity[:, None, :]
+
+            # Only the entries that couple two dofs of the same node belong to a nodal block
+            same_node = (dof_node[rows] == dof_node[cols]) & (dof_node[rows] != -1)
+            positions = dof_node[rows] * 4 + dof_direction[rows] * 2 + dof_direction[cols]
+            blocks += np.bincount(positions[same_node], weights=element_matrices[same_node], minlength=num_nodes * 4)
+
+        return blocks.reshape(num_nodes, 2, 2)
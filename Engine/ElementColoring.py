@@ -0,0 +1,136 @@
+from typing import List, Optional
+import numpy as np
+
+from Engine.Geometry import Geometry
+
+
+class ElementColoring(object):
+    """
+    Partitions the elements into colors such that no two elements of the same color share a node.
+
+    The elements of a color can be scatter-added to the global matrix or to the nodes concurrently, since they never
+    write to the same entry. The structured grids of BeamMeshGenerator are colored with the 4-color pattern of the
+    parity of their cell indices, any other connectivity with a greedy algorithm.
+
+    Attributes:
+        geometry (Geometry): The geometry to be colored.
+    """
+
+    def __init__(self, geometry: Geometry):
+        """
+        Initializes an ElementColoring object.
+
+        Args:
+            geometry (Geometry): The geometry to be colored.
+        """
+        self.geometry = geometry
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the coloring."""
+        return 'ElementColoring'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the coloring."""
+        return self.name
+
+    def compute_colors(self) -> np.ndarray:
+        """
+        Computes the color of each element, with the structured pattern when possible and greedily otherwise.
+
+        Returns:
+            np.ndarray: Color of each element with shape (n_elem,).
+        """
+        colors = self.compute_structured_colors()
+        if colors is not None and self.is_valid(colors):
+            return colors
+        return self.compute_greedy_colors()
+
+    def compute_structured_colors(self) -> Optional[np.ndarray]:
+        """
+        Colors the elements of the structured grids of the geometry by the parity of their cell indices.
+
+        Returns:
+            Optional[np.ndarray]: Color of each element, None if some elements do not belong to a structured grid.
+        """
+        num_elements = len(self.geometry.elements)
+        colors = np.full(num_elements, -1)
+
+        for grid in self.geometry.structured_grids:
+            num_elements_x, num_elements_y = grid['shape']
+            elements = np.arange(num_elements_x * num_elements_y)
+            if grid['order'] == 'column':
+                i, j = np.divmod(elements, num_elements_y)
+            else:
+                j, i = np.divmod(elements, num_elements_x)
+
+            first_element = grid['first_element']
+            colors[first_element:first_element + len(elements)] = i % 2 + 2 * (j % 2)
+
+        if np.any(colors == -1):
+            return None
+        return colors
+
+    def compute_greedy_colors(self) -> np.ndarray:
+        """
+        Colors the elements greedily, each element taking the lowest color not used by the elements of its nodes.
+
+        Returns:
+            np.ndarray: Color of each element with shape (n_elem,).
+        """
+        # Colors used around each node, as bit masks
+        node_masks = [0] * self.geometry.store.num_nodes
+
+        connectivity = self.geometry.store.connectivity.tolist()
+        if not self.geometry.store.is_uniform:
+            # The padding of the elements with fewer nodes is dropped
+            connectivity = [[node for node in element_nodes if node != -1] for element_nodes in connectivity]
+
+        colors = []
+        for element_nodes in connectivity:
+            used = 0
+            for node in element_nodes:
+                used |= node_masks[node]
+
+            # Lowest bit not set
+            color = (~used & (used + 1)).bit_length() - 1
+            colors.append(color)
+
+            for node in element_nodes:
+                node_masks[node] |= 1 << color
+
+        return np.array(colors, dtype=int)
+
+    def is_valid(self, colors: np.ndarray) -> bool:
+        """
+        Checks that no two elements of the same color share a node.
+
+        Args:
+            colors (np.ndarray): Color of each element.
+
+        Returns:
+            bool: True if the coloring is valid.
+        """
+        connectivity = self.geometry.store.connectivity
+        if len(colors) != len(connectivity):
+            return False
+
+        num_nodes = self.geometry.store.num_nodes
+        keys = np.repeat(colors, connectivity.shape[1]) * num_nodes + connectivity.ravel()
+        keys = keys[connectivity.ravel() != -1]
+        return len(np.unique(keys)) == len(keys)
+
+    @staticmethod
+    def group_by_color(colors: np.ndarray) -> List[np.ndarray]:
+        """
+        Groups the elements by color.
+
+        Args:
+            colors (np.ndarray): Color of each element.
+
+        Returns:
+            List[np.ndarray]: Sorted element indices of each color.
+        """
+        order = np.argsort(colors, kind='stable')
+        boundaries = np.flatnonzero(np.diff(colors[order])) + 1
+        return np.split(order, boundaries) if len(order) else []
@@ -12,6 +12,8 @@ class QuadraticQuadElement(Element):
     Represents a quadratic quadrilateral finite element used in structural analysis.
     """
 
+    __slots__ = ()
+
     def __init__(self, nodes: List[Node] = None, material: Optional[Material] = None):
         """
         Initializes a QuadraticQuadElement object.
@@ -113,51 +115,40 @@ class QuadraticQuadElement(Element):
 
     def compute_elem_stiffness_matrix(self, stiff_intgr_type: str) -> np.ndarray:
         """Computes the element stiffness matrix."""
-        number_gp = self.get_number_gp(stiff_intgr_type)
+        reference = self.get_reference_element(stiff_intgr_type)
 
         stiffness = np.zeros((self.count_elem_dofs(), self.count_elem_dofs()))
 
-        weights = self.gauss.get_weights(number_gp)
-
-        for i, weight in enumerate(weights):
-
-            wi = weights[i]
-
-            points = self.gauss.get_points(number_gp)
-
-            for j, point in enumerate(points):
-                wj = weights[j]
+        elastic_matrix = self.material.get_elastic_matrix(True)  # True for plane stress
 
-                shape_derivative = self.shape_functions_derivative(points[i], points[j])
+        thickness = self.get_thickness()
 
-                jacobian = self.jacobian(shape_derivative)
-                jacobian_determinant = self.jacobian_determinant(jacobian)
-                inverse_jacobian = self.inverse_jacobian(jacobian)
-
-                derivative = inverse_jacobian @ shape_derivative
-
-                elastic_matrix = self.material.get_elastic_matrix(True)  # True for plane stress
+        for shape_derivative, weight in zip(reference.shape_derivatives, reference.weights):
+            jacobian = self.jacobian(shape_derivative)
+            jacobian_determinant = self.jacobian_determinant(jacobian)
+            inverse_jacobian = self.inverse_jacobian(jacobian)
 
-                thickness = self.get_thickness()
+            derivative = inverse_jacobian @ shape_derivative
 
-                b_matrix = self.assemble_elem_b_matrix(derivative)
+            b_matrix = self.assemble_elem_b_matrix(derivative)
 
-                stiffness += jacobian_determinant * thickness * wi * wj * (b_matrix.T @ elastic_matrix @ b_matrix)
+            stiffness += jacobian_determinant * thickness * weight * (b_matrix.T @ elastic_matrix @ b_matrix)
         return stiffness
 
     def compute_stress_strain(self, global_displacement_vector: np.ndarray, stress_strain_intgr_type: str) -> (np.ndarray, np.ndarray):
         """Computes stress and strain at the Gauss points."""
-        number_gp = self.get_number_gp(stress_strain_intgr_type)
+        reference = self.get_reference_element(stress_strain_intgr_type)
 
         self.stress_gp = []
         self.strain_gp = []
 
-        arranged_gauss_points = self.gauss.get_ordered_points(number_gp)
+        elastic_matrix = self.material.get_elastic_matrix(True)
+
+        # Compute the element displacement vector from the global displacement vector
+        elem_displacement_vector = self.get_elem_displacement_from_global(global_displacement_vector)
 
         # Compute the stress and strain at the gauss points in ordered manner
-        for i in range(len(arranged_gauss_points)):
-            xi, eta = arranged_gauss_points[i]
-            shape_derivative = self.shape_functions_derivative(xi, eta)
+        for shape_derivative in reference.ordered_shape_derivatives:
             jacobian = self.jacobian(shape_derivative)
             inverse_jacobian = self.inverse_jacobian(jacobian)
 
@@ -165,14 +156,10 @@ class QuadraticQuadElement(Element):
 
             b_matrix = self.assemble_elem_b_matrix(derivative)
 
-            # Compute the element displacement vector from the global displacement vector
-            elem_displacement_vector = self.get_elem_displacement_from_global(global_displacement_vector)
-
             # Compute the strain
             strain = b_matrix @ elem_displacement_vector
 
             # Compute the stress
-            elastic_matrix = self.material.get_elastic_matrix(True)
             stress = elastic_matrix @ strain
 
             # Store the stress and strain at the gauss points
@@ -189,7 +176,7 @@ class QuadraticQuadElement(Element):
 
     def construct_extrapolation_matrix_2GP(self) -> np.ndarray:
         """Constructs the extrapolation matrix for the element using 2 Gauss points."""
-        num_nodes = len(self.nodes)
+        num_nodes = self.max_nodes
 
         # Construct parametric coordinates
         parametric_coords = np.array([[-1, -1], [0, -1], [1, -1], [1, 0], [1, 1], [0, 1], [-1, 1], [-1, 0]])
@@ -212,7 +199,7 @@ class QuadraticQuadElement(Element):
 
     def construct_extrapolation_matrix_3GP(self) -> np.ndarray:
         """Constructs the extrapolation matrix for the element using 3 Gauss points."""
-        num_nodes = len(self.nodes)
+        num_nodes = self.max_nodes
 
         # Construct parametric coordinates
         parametric_coords = np.array([[-1, -1], [0, -1], [1, -1], [1, 0], [1, 1], [0, 1], [-1, 1], [-1, 0]])  # Spiral
@@ -232,10 +219,14 @@ class QuadraticQuadElement(Element):
 
         return extrapolation_matrix
 
-    def extrapolate_stress_strain_gp_to_nodes(self, stress_strain_intgr_type: str):
-        """Extrapolates the stress or strain from the Gauss points to the nodes."""
-        number_gp = self.get_number_gp(stress_strain_intgr_type)
+    def construct_extrapolation_matrix(self, number_gp: int) -> np.ndarray:
+        """
+        Constructs the matrix that extrapolates values from the ordered Gauss points to the nodes.
+
+        :param number_gp: Number of Gauss points per direction.
 
+        :return: Extrapolation matrix, each row corresponds to a node and each column to a gauss point.
+        """
         if number_gp == 2:
             # Each row corresponds to all shape functions evaluated at a gauss point and each column to gauss point (i.e., specific shape function)
             extrapolation_matrix = self.construct_extrapolation_matrix_2GP()
@@ -250,17 +241,4 @@ class QuadraticQuadElement(Element):
         if not np.allclose(check_ones, 1.0):
             raise ValueError('The sum of all columns of each row of the extrapolation matrix must be equal to 1')
 
-        # Extrapolate the stress and strain from the gauss points to the nodes
-        strain_xx = extrapolation_matrix @ self.strain_gp[:, 0]
-        strain_yy = extrapolation_matrix @ self.strain_gp[:, 1]
-        strain_xy = extrapolation_matrix @ self.strain_gp[:, 2]
-
-        stress_xx = extrapolation_matrix @ self.stress_gp[:, 0]
-        stress_yy = extrapolation_matrix @ self.stress_gp[:, 1]
-        stress_xy = extrapolation_matrix @ self.stress_gp[:, 2]
-
-        # Put the extrapolated values in the correct nodes
-        for i, node in enumerate(self.nodes):
-            # node.strain corresponds to a list of lists of type [[elem_label, (nparray) strain], ...]
-            node.strain.append([self.label, np.array([strain_xx[i], strain_yy[i], strain_xy[i]])])
-            node.stress.append([self.label, np.array([stress_xx[i], stress_yy[i], stress_xy[i]])])
+        return extrapolation_matrix
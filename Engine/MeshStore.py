@@ -0,0 +1,245 @@
+from typing import Optional
+import numpy as np
+
+
+class MeshStore(object):
+    """
+    Represents the array-backed storage of the nodes and elements of a mesh.
+
+    Node and Element objects are lightweight views over these arrays. The arrays grow by doubling their capacity, so
+    nodes and elements can still be added one at a time.
+
+    Elements with different numbers of nodes can be mixed, e.g. bilinear and quadratic quadrilaterals. The rows of the
+    connectivity are then padded with -1 up to the largest number of nodes, and element_num_nodes gives the number of
+    nodes of each element.
+
+    Attributes:
+        num_nodes (int): Number of nodes.
+
+        num_elements (int): Number of elements.
+
+        nodes_per_element (int): Largest number of nodes of an element, the width of the connectivity, 0 while there
+            are no elements.
+
+        nodal_stress (Optional[np.ndarray]): Average stress at the nodes with shape (n_nodes, 3), None before the
+            stress is recovered.
+
+        nodal_strain (Optional[np.ndarray]): Average strain at the nodes with shape (n_nodes, 3), None before the
+            strain is recovered.
+
+        versions (dict): Modification counters of the 'geometry', 'constraints', 'loads' and 'materials', see
+            mark_modified.
+    """
+
+    def __init__(self, nodes_capacity: int = 16, elements_capacity: int = 16):
+        """
+        Initializes a MeshStore object.
+
+        Args:
+            nodes_capacity (int): Initial number of nodes the arrays can hold.
+
+            elements_capacity (int): Initial number of elements the arrays can hold.
+        """
+        self.num_nodes = 0
+        self.num_elements = 0
+        self.nodes_per_element = 0
+
+        self._coordinates = np.zeros((nodes_capacity, 2))
+        self._constraints = np.zeros((nodes_capacity, 2), dtype=bool)
+        self._loads = np.zeros((nodes_capacity, 2))
+        self._dof_map = np.full((nodes_capacity, 2), -1, dtype=np.int64)
+        self._connectivity = np.full((elements_capacity, 0), -1, dtype=np.int32)
+        self._element_num_nodes = np.zeros(elements_capacity, dtype=np.int32)
+
+        # Modification counters, compared by the analysis state to find the stages to recompute
+        self.versions = {'geometry': 0, 'constraints': 0, 'loads': 0, 'materials': 0}
+
+        # Results
+        self.nodal_stress: Optional[np.ndarray] = None
+        self.nodal_strain: Optional[np.ndarray] = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the store."""
+        return 'MeshStore'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the store."""
+        return f'{self.name} with {self.num_nodes} nodes and {self.num_elements} elements'
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """Returns the nodal coordinates with shape (n_nodes, 2)."""
+        return self._coordinates[:self.num_nodes]
+
+    @property
+    def constraints(self) -> np.ndarray:
+        """Returns the constraint mask of the nodes with shape (n_nodes, 2), True where the dof is constrained."""
+        return self._constraints[:self.num_nodes]
+
+    @property
+    def loads(self) -> np.ndarray:
+        """Returns the nodal loads with shape (n_nodes, 2)."""
+        return self._loads[:self.num_nodes]
+
+    @property
+    def dof_map(self) -> np.ndarray:
+        """Returns the global indices of the nodal dofs with shape (n_nodes, 2), -1 for constrained dofs."""
+        return self._dof_map[:self.num_nodes]
+
+    @property
+    def connectivity(self) -> np.ndarray:
+        """Returns the node indices of the elements with shape (n_elements, nodes_per_element), padded with -1."""
+        return self._connectivity[:self.num_elements]
+
+    @property
+    def element_num_nodes(self) -> np.ndarray:
+        """Returns the number of nodes of each element with shape (n_elements,)."""
+        return self._element_num_nodes[:self.num_elements]
+
+    @property
+    def is_uniform(self) -> bool:
+        """Returns whether every element has nodes_per_element nodes, so the connectivity has no padding."""
+        return bool(np.all(self.element_num_nodes == self.nodes_per_element))
+
+    def get_connectivity(self, indices) -> np.ndarray:
+        """
+        Returns the node indices of an element or of a group of elements, without the padding of the widest elements.
+
+        Args:
+            indices: Index of an element, or indices of elements.
+
+        Returns:
+            np.ndarray: Node indices with shape (n_nodes,) for an element, or (n_elem, n_nodes) with n_nodes the largest
+                number of nodes of the group, padded with -1.
+        """
+        if np.ndim(indices) == 0:
+            return self._connectivity[indices, :self._element_num_nodes[indices]]
+
+        rows = self.connectivity[indices]
+        num_nodes = self.element_num_nodes[indices]
+        return rows[:, :num_nodes.max()] if len(num_nodes) else rows
+
+    def mark_modified(self, kind: str):
+        """
+        Marks a kind of mesh data as modified, so the analysis stages that depend on it are recomputed.
+
+        Node, Element and Geometry methods call it on their own, it only has to be called after writing the arrays
+        directly.
+
+        Args:
+            kind (str): Kind of data ('geometry', 'constraints', 'loads' or 'materials').
+
+        Raises:
+            ValueError: If the kind is not supported.
+        """
+        if kind not in self.versions:
+            raise ValueError('kind must be either "geometry", "constraints", "loads" or "materials"')
+        self.versions[kind] += 1
+
+    def _reserve_nodes(self, num_nodes: int):
+        """Grows the node arrays so they can hold at least num_nodes nodes."""
+        capacity = len(self._coordinates)
+        if num_nodes <= capacity:
+            return
+
+        new_capacity = max(num_nodes, 2 * capacity)
+        for attribute, fill_value in (('_coordinates', 0.), ('_constraints', False), ('_loads', 0.), ('_dof_map', -1)):
+            old = getattr(self, attribute)
+            new = np.full((new_capacity, 2), fill_value, dtype=old.dtype)
+            new[:self.num_nodes] = old[:self.num_nodes]
+            setattr(self, attribute, new)
+
+    def _reserve_elements(self, num_elements: int, nodes_per_element: int):
+        """Grows the connectivity arrays so they can hold at least num_elements elements of nodes_per_element nodes."""
+        capacity = len(self._connectivity)
+        width = max(self.nodes_per_element, nodes_per_element)
+        if num_elements <= capacity and width == self.nodes_per_element:
+            return
+
+        new_capacity = capacity if num_elements <= capacity else max(num_elements, 2 * capacity)
+        new = np.full((new_capacity, width), -1, dtype=np.int32)
+        new[:self.num_elements, :self.nodes_per_element] = self._connectivity[:self.num_elements]
+        self._connectivity = new
+        self.nodes_per_element = width
+
+        new_num_nodes = np.zeros(new_capacity, dtype=np.int32)
+        new_num_nodes[:self.num_elements] = self._element_num_nodes[:self.num_elements]
+        self._element_num_nodes = new_num_nodes
+
+    def add_node(self, x: float, y: float) -> int:
+        """
+        Adds a node.
+
+        Args:
+            x (float): X-coordinate of the node.
+
+            y (float): Y-coordinate of the node.
+
+        Returns:
+            int: Index of the new node.
+        """
+        self._reserve_nodes(self.num_nodes + 1)
+        self._coordinates[self.num_nodes] = (x, y)
+        self.num_nodes += 1
+        self.mark_modified('geometry')
+        return self.num_nodes - 1
+
+    def add_nodes(self, coordinates: np.ndarray) -> np.ndarray:
+        """
+        Adds several nodes at once.
+
+        Args:
+            coordinates (np.ndarray): Nodal coordinates with shape (n, 2).
+
+        Returns:
+            np.ndarray: Indices of the new nodes.
+        """
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        start = self.num_nodes
+        self._reserve_nodes(start + len(coordinates))
+        self._coordinates[start:start + len(coordinates)] = coordinates
+        self.num_nodes += len(coordinates)
+        self.mark_modified('geometry')
+        return np.arange(start, self.num_nodes)
+
+    def add_element(self, node_indices) -> int:
+        """
+        Adds an element.
+
+        Args:
+            node_indices: Indices of the nodes of the element.
+
+        Returns:
+            int: Index of the new element.
+
+        Raises:
+            ValueError: If the element refers to nodes that do not exist.
+        """
+        return int(self.add_elements(np.asarray(node_indices).reshape(1, -1))[0])
+
+    def add_elements(self, connectivity: np.ndarray) -> np.ndarray:
+        """
+        Adds several elements at once.
+
+        Args:
+            connectivity (np.ndarray): Node indices of the elements with shape (n, n_nodes).
+
+        Returns:
+            np.ndarray: Indices of the new elements.
+
+        Raises:
+            ValueError: If the elements refer to nodes that do not exist.
+        """
+        connectivity = np.asarray(connectivity)
+        if connectivity.size and (connectivity.min() < 0 or connectivity.max() >= self.num_nodes):
+            raise ValueError('Element connectivity refers to nodes that do not exist')
+
+        start = self.num_elements
+        nodes_per_element = connectivity.shape[1]
+        self._reserve_elements(start + len(connectivity), nodes_per_element)
+        self._connectivity[start:start + len(connectivity), :nodes_per_element] = connectivity
+        self._element_num_nodes[start:start + len(connectivity)] = nodes_per_element
+        self.num_elements += len(connectivity)
+        self.mark_modified('geometry')
+        return np.arange(start, self.num_elements)
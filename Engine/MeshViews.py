@@ -0,0 +1,152 @@
+import operator
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+from Engine.Element import Element
+from Engine.Elements.BilinearQuadElement import BilinearQuadElement
+from Engine.Elements.QuadraticQuadElement import QuadraticQuadElement
+from Engine.Material import Material
+from Engine.MeshStore import MeshStore
+from Engine.Node import Node
+
+
+class LazyViews(object):
+    """
+    Represents the sequence of the views over the rows of a MeshStore, each view created on its first access.
+
+    Rows added in bulk only reserve a slot, so adding a mesh of millions of nodes or elements does not build millions
+    of Python objects. A view, once created, is kept, so the same object is returned by every access.
+
+    Attributes:
+        store (MeshStore): Store whose rows are viewed.
+    """
+
+    def __init__(self, store: MeshStore):
+        """
+        Initializes a LazyViews object.
+
+        Args:
+            store (MeshStore): Store whose rows are viewed.
+        """
+        self.store = store
+        self._views: list = []
+
+    def __len__(self) -> int:
+        """Returns the number of rows."""
+        return len(self._views)
+
+    def __getitem__(self, index):
+        """Returns the view of a row, or a list of views for a slice, creating them if needed."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._views)))]
+
+        index = operator.index(index)
+        view = self._views[index]
+        if view is None:
+            index %= len(self._views)
+            view = self._views[index] = self._create_view(index)
+        return view
+
+    def __iter__(self) -> Iterator:
+        """Iterates over the views of all rows."""
+        for index in range(len(self._views)):
+            yield self[index]
+
+    def append(self, view):
+        """Appends the view of a row created eagerly."""
+        self._views.append(view)
+
+    def reserve(self, count: int):
+        """Appends count rows whose views are created on their first access."""
+        self._views.extend([None] * count)
+
+    def is_created(self) -> np.ndarray:
+        """Returns whether the view of each row was created."""
+        return np.fromiter((view is not None for view in self._views), dtype=bool, count=len(self._views))
+
+    def _create_view(self, index: int):
+        """Creates the view of a row."""
+        raise NotImplementedError('Method _create_view not implemented')
+
+
+class NodeViews(LazyViews):
+    """Represents the nodes of a Geometry, Node views labelled by their index + 1."""
+
+    def _create_view(self, index: int) -> Node:
+        """Creates the view of a node."""
+        node = Node.view(self.store, index)
+        node.label = index + 1
+        return node
+
+
+class ElementViews(LazyViews):
+    """
+    Represents the elements of a Geometry, bound to the connectivity of the store and labelled by their index + 1.
+
+    Attributes:
+        nodes (NodeViews): Nodes of the geometry, the nodes of a created element are taken from them.
+
+        default_material (Optional[Material]): Material of the elements whose view was not created yet.
+
+        ELEMENT_TYPES (Dict[int, type]): Element type by number of nodes per element.
+    """
+
+    ELEMENT_TYPES: Dict[int, type] = {4: BilinearQuadElement, 8: QuadraticQuadElement}
+
+    def __init__(self, store: MeshStore, nodes: NodeViews):
+        """
+        Initializes an ElementViews object.
+
+        Args:
+            store (MeshStore): Store whose connectivity is viewed.
+
+            nodes (NodeViews): Nodes of the geometry.
+        """
+        super().__init__(store)
+        self.nodes = nodes
+        self.default_material: Optional[Material] = None
+
+    def get_default_type(self, index: int) -> Optional[type]:
+        """Returns the type of an element whose view was not created yet, given by its number of nodes."""
+        return self.ELEMENT_TYPES.get(int(self.store.element_num_nodes[index]))
+
+    def _create_view(self, index: int) -> Element:
+        """Creates the view of an element from its connectivity."""
+        element = self.get_default_type(index)([self.nodes[i] for i in self.store.get_connectivity(index).tolist()], self.default_material)
+        element.bind(self.store, index)
+        element.label = index + 1
+        return element
+
+    def set_all_materials(self, material: Material):
+        """Sets the material of the created views and of the ones to be created."""
+        self.default_material = material
+        for view in self._views:
+            if view is not None:
+                view.material = material
+
+    def group(self) -> Dict[Tuple[type, int], List[int]]:
+        """
+        Groups the element indices by element type and material without creating the views.
+
+        Returns:
+            Dict[Tuple[type, int], List[int]]: Element indices in ascending order keyed by (element type, material id).
+        """
+        # The elements whose view was not created have the default type of their number of nodes and material
+        num_nodes = self.store.element_num_nodes
+        is_default = np.ones(len(self._views), dtype=bool)
+
+        other_groups = {}
+        for index in np.flatnonzero(self.is_created()).tolist():
+            view = self._views[index]
+            key = (type(view), id(view.material))
+            if key != (self.get_default_type(index), id(self.default_material)):
+                other_groups.setdefault(key, []).append(index)
+                is_default[index] = False
+
+        groups = {}
+        for element_num_nodes in np.unique(num_nodes[is_default]).tolist():
+            key = (self.ELEMENT_TYPES.get(element_num_nodes), id(self.default_material))
+            groups[key] = np.flatnonzero(is_default & (num_nodes == element_num_nodes)).tolist()
+        for key, indices in other_groups.items():
+            groups[key] = sorted(groups.get(key, []) + indices)
+        return groups
@@ -1,7 +1,16 @@
+from typing import Optional
+import numpy as np
+
+from Engine.MeshStore import MeshStore
+
+
 class Node(object):
     """
     Represents a node in structural analysis.
 
+    A node is a lightweight view over one row of the arrays of a MeshStore. Nodes created directly own a private
+    one-node store, while the nodes of a Geometry share the store of the geometry.
+
     Attributes:
         x (float): X-coordinate of the node.
 
@@ -21,15 +30,13 @@ class Node(object):
 
         global_index_y (int): Global index of the node in the y-direction.
 
-        stress (list): Stress values from all elements connected to the node.
-
-        strain (list): Strain values from all elements connected to the node.
-
-        stress_avg: Average stress value at the node.
+        stress_avg: Average stress value at the node, None before the stress is recovered.
 
-        strain_avg: Average strain value at the node.
+        strain_avg: Average strain value at the node, None before the strain is recovered.
     """
 
+    __slots__ = ('label', 'store', 'index')
+
     def __init__(self, x: float, y: float):
         """
         Initializes a Node object with given coordinates.
@@ -39,27 +46,131 @@ class Node(object):
 
             y (float): Y-coordinate of the node.
         """
+        store = MeshStore(nodes_capacity=1, elements_capacity=0)
+        self._bind(store, store.add_node(x, y))
+
+    def _bind(self, store: MeshStore, index: int):
+        """Points the node to a row of a store."""
         self.label = None
-        self.x = x
-        self.y = y
-        self.x_constraint = False
-        self.y_constraint = False
+        self.store = store
+        self.index = index
 
-        # Load
-        self.x_load = 0.0
-        self.y_load = 0.0
+    @classmethod
+    def view(cls, store: MeshStore, index: int) -> 'Node':
+        """
+        Creates a node that views an existing row of a store.
 
-        # Global index
-        self.global_index_x = -1
-        self.global_index_y = -1
+        Args:
+            store (MeshStore): Store that holds the node data.
+
+            index (int): Index of the node in the store.
+
+        Returns:
+            Node: The node view.
+        """
+        node = cls.__new__(cls)
+        node._bind(store, index)
+        return node
+
+    @property
+    def x(self) -> float:
+        """Returns the x-coordinate of the node."""
+        return float(self.store.coordinates[self.index, 0])
+
+    @x.setter
+    def x(self, value: float):
+        """Sets the x-coordinate of the node."""
+        self.store.coordinates[self.index, 0] = value
+        self.store.mark_modified('geometry')
 
-        # Stress and strain from all elements
-        self.stress = []
-        self.strain = []
+    @property
+    def y(self) -> float:
+        """Returns the y-coordinate of the node."""
+        return float(self.store.coordinates[self.index, 1])
 
-        # Average stress and strain
-        self.stress_avg = None
-        self.strain_avg = None
+    @y.setter
+    def y(self, value: float):
+        """Sets the y-coordinate of the node."""
+        self.store.coordinates[self.index, 1] = value
+        self.store.mark_modified('geometry')
+
+    @property
+    def x_constraint(self) -> bool:
+        """Returns True if the node is constrained in the x-direction."""
+        return bool(self.store.constraints[self.index, 0])
+
+    @x_constraint.setter
+    def x_constraint(self, value: bool):
+        """Sets the constraint status in the x-direction."""
+        self.store.constraints[self.index, 0] = value
+        self.store.mark_modified('constraints')
+
+    @property
+    def y_constraint(self) -> bool:
+        """Returns True if the node is constrained in the y-direction."""
+        return bool(self.store.constraints[self.index, 1])
+
+    @y_constraint.setter
+    def y_constraint(self, value: bool):
+        """Sets the constraint status in the y-direction."""
+        self.store.constraints[self.index, 1] = value
+        self.store.mark_modified('constraints')
+
+    @property
+    def x_load(self) -> float:
+        """Returns the load applied to the node in the x-direction."""
+        return float(self.store.loads[self.index, 0])
+
+    @x_load.setter
+    def x_load(self, value: float):
+        """Sets the load applied to the node in the x-direction."""
+        self.store.loads[self.index, 0] = value
+        self.store.mark_modified('loads')
+
+    @property
+    def y_load(self) -> float:
+        """Returns the load applied to the node in the y-direction."""
+        return float(self.store.loads[self.index, 1])
+
+    @y_load.setter
+    def y_load(self, value: float):
+        """Sets the load applied to the node in the y-direction."""
+        self.store.loads[self.index, 1] = value
+        self.store.mark_modified('loads')
+
+    @property
+    def global_index_x(self) -> int:
+        """Returns the global index of the node in the x-direction."""
+        return int(self.store.dof_map[self.index, 0])
+
+    @global_index_x.setter
+    def global_index_x(self, value: int):
+        """Sets the global index of the node in the x-direction."""
+        self.store.dof_map[self.index, 0] = value
+
+    @property
+    def global_index_y(self) -> int:
+        """Returns the global index of the node in the y-direction."""
+        return int(self.store.dof_map[self.index, 1])
+
+    @global_index_y.setter
+    def global_index_y(self, value: int):
+        """Sets the global index of the node in the y-direction."""
+        self.store.dof_map[self.index, 1] = value
+
+    @property
+    def stress_avg(self) -> Optional[np.ndarray]:
+        """Returns the average stress at the node."""
+        if self.store.nodal_stress is None:
+            return None
+        return self.store.nodal_stress[self.index]
+
+    @property
+    def strain_avg(self) -> Optional[np.ndarray]:
+        """Returns the average strain at the node."""
+        if self.store.nodal_strain is None:
+            return None
+        return self.store.nodal_strain[self.index]
 
     @property
     def name(self):
@@ -0,0 +1,326 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+import os
+import time
+import numpy as np
+
+
+class ParallelExecutor(object):
+    """
+    Computes element quantities chunk by chunk on a pool of processes or threads.
+
+    The elements are split in chunks of consecutive indices that do not depend on the number of workers, and every
+    element is computed by the same kernel as in the serial path, so the results are bit-identical to it. With the
+    process backend the inputs and outputs live in shared memory: the workers read their chunk of the inputs and write
+    their chunk of the outputs in place, so no large array is pickled. The output segments are kept and reused by the
+    next call with the same shape. Contributions that are summed into a shared output, like the assembly, are
+    scatter-added color by color, see scatter_colored.
+
+    Attributes:
+        num_workers (int): Number of workers of the pool.
+
+        backend (str): Type of pool ('process' or 'thread').
+
+        chunk_size (int): Number of elements computed by a task.
+
+        report (Dict[str, dict]): Scaling numbers of the last call of each stage, see map_chunks.
+    """
+
+    def __init__(self, num_workers: Optional[int] = None, backend: str = 'process', chunk_size: int = 2048):
+        """
+        Initializes a ParallelExecutor object.
+
+        Args:
+            num_workers (Optional[int]): Number of workers, the number of CPUs when None.
+
+            backend (str): Type of pool ('process' or 'thread').
+
+            chunk_size (int): Number of elements computed by a task.
+
+        Raises:
+            ValueError: If the backend is not supported.
+        """
+        if backend not in ('process', 'thread'):
+            raise ValueError('backend must be either "process" or "thread"')
+
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.backend = backend
+        self.chunk_size = chunk_size
+        self.report: Dict[str, dict] = {}
+
+        self._pool: Optional[Executor] = None
+        self._segments: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the executor."""
+        return 'Parallel Executor'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the executor."""
+        return f'{self.name} with {self.num_workers} {self.backend} workers'
+
+    def __enter__(self) -> 'ParallelExecutor':
+        """Returns the executor, which is closed at the end of the with block."""
+        return self
+
+    def __exit__(self, *args):
+        """Closes the executor."""
+        self.close()
+
+    def __del__(self):
+        """Closes the executor when it is garbage collected."""
+        self.close()
+
+    def close(self):
+        """Shuts the pool down and releases the shared memory."""
+        if getattr(self, '_pool', None) is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+        for segment, _ in getattr(self, '_segments', {}).values():
+            segment.close()
+            segment.unlink()
+        self._segments = {}
+
+    def _get_pool(self) -> Executor:
+        """Returns the pool, creating it on first use."""
+        if self._pool is None:
+            pool_type = ProcessPoolExecutor if self.backend == 'process' else ThreadPoolExecutor
+            self._pool = pool_type(max_workers=self.num_workers)
+        return self._pool
+
+    def _get_array(self, name: str, shape: tuple, dtype: np.dtype) -> np.ndarray:
+        """Returns an array of the given shape, in a reused shared memory segment for the process backend."""
+        if self.backend == 'thread':
+            return np.empty(shape, dtype=dtype)
+
+        if name in self._segments:
+            segment, array = self._segments[name]
+            if array.shape == tuple(shape) and array.dtype == dtype:
+                return array
+            segment.close()
+            segment.unlink()
+
+        segment = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+        array = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+        self._segments[name] = (segment, array)
+        return array
+
+    def _describe(self, name: str) -> tuple:
+        """Returns what a worker needs to attach to a shared array: the segment name, the shape and the type."""
+        segment, array = self._segments[name]
+        return segment.name, array.shape, array.dtype.str
+
+    def map_chunks(self, stage: str, kernel: Callable[..., Dict[str, np.ndarray]], num_items: int, inputs: Dict[str, np.ndarray], outputs: Dict[str, tuple], arguments: tuple = ()) -> Dict[str, np.ndarray]:
+        """
+        Runs a kernel on all chunks of a set of items and gathers its outputs.
+
+        Args:
+            stage (str): Name of the stage in the report.
+
+            kernel (Callable[..., Dict[str, np.ndarray]]): Module-level function called as kernel(chunk_inputs,
+                *arguments), returning the outputs of the chunk by name.
+
+            num_items (int): Number of items, the length of the first axis of the inputs and outputs.
+
+            inputs (Dict[str, np.ndarray]): Input arrays by name.
+
+            outputs (Dict[str, tuple]): Shape of one item of each output by name.
+
+            arguments (tuple): Extra arguments of the kernel, shared by all chunks.
+
+        Returns:
+            Dict[str, np.ndarray]: Output arrays by name, with shape (num_items, ...). With the process backend they are
+                views of shared memory owned by the executor, valid until the next call of the same stage.
+        """
+        start_time = time.perf_counter()
+
+        chunks = [(start, min(start + self.chunk_size, num_items)) for start in range(0, num_items, self.chunk_size)]
+
+        output_arrays = {name: self._get_array(f'{stage}:out:{name}', (num_items,) + tuple(item_shape), np.dtype(float))
+                         for name, item_shape in outputs.items()}
+
+        if self.backend == 'process':
+            for name, array in inputs.items():
+                self._get_array(f'{stage}:in:{name}', array.shape, array.dtype)[...] = array
+            input_specs = {name: self._describe(f'{stage}:in:{name}') for name in inputs}
+            output_specs = {name: self._describe(f'{stage}:out:{name}') for name in outputs}
+        else:
+            input_specs = inputs
+            output_specs = output_arrays
+
+        pool = self._get_pool()
+        futures = [pool.submit(run_chunk, kernel, start, end, input_specs, output_specs, arguments) for start, end in chunks]
+        busy_time = sum(future.result() for future in futures)
+
+        wall_time = time.perf_counter() - start_time
+        self.report[stage] = {'backend': self.backend,
+                              'num_workers': self.num_workers,
+                              'num_chunks': len(chunks),
+                              'wall_time': wall_time,
+                              'busy_time': busy_time,
+                              'speedup': busy_time / wall_time if wall_time > 0 else 0.,
+                              'efficiency': busy_time / (wall_time * self.num_workers) if wall_time > 0 else 0.}
+
+        return output_arrays
+
+    def scatter_colored(self, stage: str, kernel: Callable[..., None], color_groups: List[np.ndarray], inputs: Dict[str, np.ndarray], output_shape: tuple) -> np.ndarray:
+        """
+        Scatter-adds the contributions of a set of items into one output, color by color.
+
+        The items of a color never write to the same entry of the output, so the chunks of a color run concurrently
+        without races. The colors run one after the other. The result does not depend on the number of workers or on
+        the chunk size.
+
+        Args:
+            stage (str): Name of the stage in the report.
+
+            kernel (Callable[..., None]): Module-level function called as kernel(chunk_inputs, output), adding the
+                contributions of the chunk to the output in place.
+
+            color_groups (List[np.ndarray]): Item indices of each color, see ElementColoring.
+
+            inputs (Dict[str, np.ndarray]): Input arrays by name, with the items along the first axis.
+
+            output_shape (tuple): Shape of the output.
+
+        Returns:
+            np.ndarray: The output. With the process backend it is a view of shared memory owned by the executor,
+                valid until the next call of the same stage.
+        """
+        start_time = time.perf_counter()
+
+        output = self._get_array(f'{stage}:out', output_shape, np.dtype(float))
+        output[...] = 0.
+
+        if self.backend == 'process':
+            for name, array in inputs.items():
+                self._get_array(f'{stage}:in:{name}', array.shape, array.dtype)[...] = array
+            input_specs = {name: self._describe(f'{stage}:in:{name}') for name in inputs}
+            output_spec = self._describe(f'{stage}:out')
+        else:
+            input_specs = inputs
+            output_spec = output
+
+        pool = self._get_pool()
+        busy_time = 0.
+        num_chunks = 0
+        for items in color_groups:
+            chunks = [items[start:start + self.chunk_size] for start in range(0, len(items), self.chunk_size)]
+            futures = [pool.submit(run_scatter_chunk, kernel, chunk, input_specs, output_spec) for chunk in chunks]
+            busy_time += sum(future.result() for future in futures)
+            num_chunks += len(chunks)
+
+        wall_time = time.perf_counter() - start_time
+        self.report[stage] = {'backend': self.backend,
+                              'num_workers': self.num_workers,
+                              'num_chunks': num_chunks,
+                              'num_colors': len(color_groups),
+                              'wall_time': wall_time,
+                              'busy_time': busy_time,
+                              'speedup': busy_time / wall_time if wall_time > 0 else 0.,
+                              'efficiency': busy_time / (wall_time * self.num_workers) if wall_time > 0 else 0.}
+
+        return output
+
+
+def _attach(spec) -> Tuple[Optional[shared_memory.SharedMemory], np.ndarray]:
+    """Attaches to a shared array described by ParallelExecutor._describe, arrays are returned as they are."""
+    if isinstance(spec, np.ndarray):
+        return None, spec
+
+    name, shape, dtype = spec
+    segment = shared_memory.SharedMemory(name=name)
+    return segment, np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+
+
+def run_chunk(kernel: Callable[..., Dict[str, np.ndarray]], start: int, end: int, input_specs: dict, output_specs: dict, arguments: tuple) -> float:
+    """
+    Runs a kernel on the items [start, end) and writes its outputs in place.
+
+    Returns:
+        float: CPU time spent in the chunk, in seconds.
+    """
+    start_time = time.thread_time()
+
+    segments = []
+    chunk_inputs = {}
+    for name, spec in input_specs.items():
+        segment, array = _attach(spec)
+        segments.append(segment)
+        chunk_inputs[name] = array[start:end]
+
+    chunk_outputs = kernel(chunk_inputs, *arguments)
+
+    for name, spec in output_specs.items():
+        segment, array = _attach(spec)
+        segments.append(segment)
+        array[start:end] = chunk_outputs[name]
+        del array
+
+    # Drop the views before closing the segments
+    del chunk_inputs, chunk_outputs
+    for segment in segments:
+        if segment is not None:
+            segment.close()
+
+    return time.thread_time() - start_time
+
+
+def run_scatter_chunk(kernel: Callable[..., None], items: np.ndarray, input_specs: dict, output_spec) -> float:
+    """
+    Runs a scatter kernel on a chunk of items of the same color.
+
+    Returns:
+        float: CPU time spent in the chunk, in seconds.
+    """
+    start_time = time.thread_time()
+
+    segments = []
+    chunk_inputs = {}
+    for name, spec in input_specs.items():
+        segment, array = _attach(spec)
+        segments.append(segment)
+        chunk_inputs[name] = array[items]
+        del array
+
+    segment, output = _attach(output_spec)
+    segments.append(segment)
+    kernel(chunk_inputs, output)
+
+    # Drop the views before closing the segments
+    del chunk_inputs, output
+    for segment in segments:
+        if segment is not None:
+            segment.close()
+
+    return time.thread_time() - start_time
+
+
+def stiffness_kernel(inputs: Dict[str, np.ndarray], element_type: type, elastic_matrix: np.ndarray, thickness: float, stiff_intgr_type: str) -> Dict[str, np.ndarray]:
+    """Computes the stiffness matrices of a chunk of elements, the COO values of the sparse assembly."""
+    return {'stiffness': element_type.compute_block_stiffness_matrices(inputs['coordinates'], elastic_matrix, thickness, stiff_intgr_type)}
+
+
+def stress_strain_kernel(inputs: Dict[str, np.ndarray], element_type: type, elastic_matrix: np.ndarray, stress_strain_intgr_type: str, extrapolation_matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """Computes the stress and strain of a chunk of elements at the Gauss points and extrapolates them to the nodes."""
+    stress_gp, strain_gp = element_type.compute_block_stress_strain(inputs['coordinates'], inputs['displacements'], elastic_matrix, stress_strain_intgr_type)
+
+    return {'stress': np.einsum('ng,egc->enc', extrapolation_matrix, stress_gp),
+            'strain': np.einsum('ng,egc->enc', extrapolation_matrix, strain_gp)}
+
+
+def stiffness_scatter_kernel(inputs: Dict[str, np.ndarray], data: np.ndarray):
+    """Adds the stiffness matrices of a chunk of elements of the same color to the data of the global CSR matrix."""
+    positions = inputs['positions']
+    free = positions != -1
+    data[positions[free]] += inputs['stiffness'][free]
+
+
+def nodal_scatter_kernel(inputs: Dict[str, np.ndarray], sums: np.ndarray):
+    """Adds the element-nodal values of a chunk of elements of the same color to their nodes, skipping the padding."""
+    nodes = inputs['nodes']
+    valid = nodes != -1
+    sums[nodes[valid]] += inputs['values'][valid]
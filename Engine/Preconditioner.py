@@ -0,0 +1,45 @@
+import numpy as np
+
+
+class Preconditioner(object):
+    """
+    Represents a preconditioner for iterative solvers.
+
+    This is an abstract class. The preconditioner is built once from the system matrix with setup and then applied to
+    the residual at every iteration.
+    """
+
+    def __init__(self):
+        """Initializes a Preconditioner object."""
+        # This is an abstract class, so it does not need to have any attributes
+        pass
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the preconditioner."""
+        return 'Preconditioner'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the preconditioner."""
+        return self.name
+
+    def setup(self, matrix):
+        """
+        Builds the preconditioner from the system matrix.
+
+        Args:
+            matrix: System matrix. Any object with a diagonal method is accepted by the diagonal preconditioners.
+        """
+        raise NotImplementedError('Method setup not implemented')
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        """
+        Applies the inverse of the preconditioner to a residual.
+
+        Args:
+            residual (np.ndarray): Residual vector.
+
+        Returns:
+            np.ndarray: Preconditioned residual.
+        """
+        raise NotImplementedError('Method apply not implemented')
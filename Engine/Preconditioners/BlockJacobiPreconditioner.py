@@ -0,0 +1,84 @@
+import numpy as np
+
+from Engine.Preconditioner import Preconditioner
+
+
+class BlockJacobiPreconditioner(Preconditioner):
+    """
+    Represents the nodal block-Jacobi preconditioner.
+
+    The 2x2 diagonal block that couples the x and y degrees of freedom of each node is inverted in closed form. Nodes
+    with a single free degree of freedom are handled as 1x1 blocks.
+
+    Attributes:
+        nodal_dofs (np.ndarray): Global indices of the x and y degrees of freedom of each node with shape (n_nodes, 2),
+            -1 for constrained degrees of freedom.
+
+        inverse_blocks (np.ndarray): Inverses of the nodal blocks with shape (n_nodes, 2, 2).
+    """
+
+    def __init__(self, nodal_dofs: np.ndarray):
+        """
+        Initializes a BlockJacobiPreconditioner object.
+
+        Args:
+            nodal_dofs (np.ndarray): Global indices of the x and y degrees of freedom of each node with shape
+                (n_nodes, 2), -1 for constrained degrees of freedom.
+        """
+        super().__init__()
+        self.nodal_dofs = np.asarray(nodal_dofs, dtype=int)
+        self.inverse_blocks = None
+        self._num_dofs = 0
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the preconditioner."""
+        return 'Block Jacobi Preconditioner'
+
+    def setup(self, matrix):
+        """
+        Extracts and inverts the nodal blocks of the system matrix.
+
+        Args:
+            matrix: Assembled system matrix, or an operator providing a get_nodal_blocks method.
+
+        Raises:
+            ValueError: If a nodal block is singular.
+        """
+        self._num_dofs = matrix.shape[0]
+        free = self.nodal_dofs != -1
+        dofs = np.where(free, self.nodal_dofs, 0)
+
+        # Matrix-free operators provide their nodal blocks, assembled matrices are indexed directly
+        if hasattr(matrix, 'get_nodal_blocks'):
+            blocks = matrix.get_nodal_blocks(self.nodal_dofs)
+        else:
+            blocks = np.zeros((len(dofs), 2, 2))
+            for a in range(2):
+                for b in range(2):
+                    blocks[:, a, b] = np.asarray(matrix[dofs[:, a], dofs[:, b]]).ravel()
+
+        # Constrained dofs are replaced by the identity so every block can be inverted
+        for a in range(2):
+            for b in range(2):
+                blocks[:, a, b] = np.where(free[:, a] & free[:, b], blocks[:, a, b], float(a == b))
+
+        determinants = blocks[:, 0, 0] * blocks[:, 1, 1] - blocks[:, 0, 1] * blocks[:, 1, 0]
+        if np.any(determinants == 0.):
+            raise ValueError('The block Jacobi preconditioner requires non-singular nodal blocks')
+
+        self.inverse_blocks = np.empty_like(blocks)
+        self.inverse_blocks[:, 0, 0] = blocks[:, 1, 1] / determinants
+        self.inverse_blocks[:, 0, 1] = -blocks[:, 0, 1] / determinants
+        self.inverse_blocks[:, 1, 0] = -blocks[:, 1, 0] / determinants
+        self.inverse_blocks[:, 1, 1] = blocks[:, 0, 0] / determinants
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        """Applies the inverses of the nodal blocks to a residual."""
+        free = self.nodal_dofs != -1
+        nodal_residual = np.where(free, residual[np.where(free, self.nodal_dofs, 0)], 0.)
+        nodal_result = np.einsum('nab,nb->na', self.inverse_blocks, nodal_residual)
+
+        result = np.zeros(self._num_dofs)
+        result[self.nodal_dofs[free]] = nodal_result[free]
+        return result
@@ -0,0 +1,56 @@
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import spilu
+
+from Engine.Preconditioner import Preconditioner
+
+
+class IncompleteLUPreconditioner(Preconditioner):
+    """
+    Represents an incomplete LU preconditioner (threshold ILU from SuperLU).
+
+    For the symmetric positive definite stiffness matrix, the symmetric mode with diagonal pivoting makes it behave as
+    an incomplete Cholesky factorization.
+
+    Attributes:
+        drop_tolerance (float): Relative magnitude under which the entries of the factors are dropped.
+
+        fill_factor (float): Maximum ratio between the number of nonzero entries of the factors and of the matrix.
+
+        column_ordering (str): SuperLU column ordering, 'NATURAL' keeps the numbering of the matrix.
+    """
+
+    def __init__(self, drop_tolerance: float = 1e-4, fill_factor: float = 10., column_ordering: str = 'MMD_AT_PLUS_A'):
+        """
+        Initializes an IncompleteLUPreconditioner object.
+
+        Args:
+            drop_tolerance (float): Relative magnitude under which the entries of the factors are dropped.
+
+            fill_factor (float): Maximum ratio between the number of nonzero entries of the factors and of the matrix.
+
+            column_ordering (str): SuperLU column ordering ('MMD_AT_PLUS_A', 'MMD_ATA', 'COLAMD' or 'NATURAL').
+        """
+        super().__init__()
+        self.drop_tolerance = drop_tolerance
+        self.fill_factor = fill_factor
+        self.column_ordering = column_ordering
+        self._factorization = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the preconditioner."""
+        return 'Incomplete LU Preconditioner'
+
+    def setup(self, matrix):
+        """
+        Builds the incomplete factorization of the system matrix.
+
+        Args:
+            matrix (scipy.sparse matrix or np.ndarray): Assembled system matrix.
+        """
+        self._factorization = spilu(csc_matrix(matrix), drop_tol=self.drop_tolerance, fill_factor=self.fill_factor, permc_spec=self.column_ordering, diag_pivot_thresh=0., options=dict(SymmetricMode=True))
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        """Applies the incomplete factorization to a residual."""
+        return self._factorization.solve(residual)
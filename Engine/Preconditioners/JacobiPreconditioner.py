@@ -0,0 +1,41 @@
+import numpy as np
+
+from Engine.Preconditioner import Preconditioner
+
+
+class JacobiPreconditioner(Preconditioner):
+    """
+    Represents the Jacobi (diagonal) preconditioner.
+
+    Attributes:
+        inverse_diagonal (np.ndarray): Inverse of the diagonal of the system matrix.
+    """
+
+    def __init__(self):
+        """Initializes a JacobiPreconditioner object."""
+        super().__init__()
+        self.inverse_diagonal = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the preconditioner."""
+        return 'Jacobi Preconditioner'
+
+    def setup(self, matrix):
+        """
+        Builds the preconditioner from the system matrix.
+
+        Args:
+            matrix: System matrix, it must provide a diagonal method.
+
+        Raises:
+            ValueError: If the diagonal has zero entries.
+        """
+        diagonal = np.asarray(matrix.diagonal(), dtype=float)
+        if np.any(diagonal == 0.):
+            raise ValueError('The Jacobi preconditioner requires a diagonal without zero entries')
+        self.inverse_diagonal = 1. / diagonal
+
+    def apply(self, residual: np.ndarray) -> np.ndarray:
+        """Applies the inverse of the diagonal to a residual."""
+        return self.inverse_diagonal * residual
@@ -0,0 +1,105 @@
+from typing import Dict, Tuple
+import numpy as np
+
+from Engine.Gauss import Gauss
+
+
+class ReferenceElement(object):
+    """
+    Represents the quantities of an element type that do not depend on the element coordinates.
+
+    Instances are built once per (element type, integration type) and shared by every element of that type through
+    ReferenceElement.get, so the Gauss points, shape functions and extrapolation matrices are not rebuilt per element.
+
+    Attributes:
+        element_type (type): Element class the quantities belong to.
+
+        intgr_type (str): Type of numerical integration ('full' or 'reduced').
+
+        number_gp (int): Number of Gauss points per direction.
+
+        points (np.ndarray): Gauss points used for integration with shape (n_gp, 2), xi varying slowest.
+
+        weights (np.ndarray): Products of the Gauss weights with shape (n_gp,).
+
+        shape_functions (np.ndarray): Shape functions at the integration points with shape (n_gp, n_nodes).
+
+        shape_derivatives (np.ndarray): Parametric derivatives at the integration points with shape (n_gp, 2, n_nodes).
+
+        ordered_points (np.ndarray): Gauss points in the order used for stress and strain recovery with shape (n_gp, 2).
+
+        ordered_shape_derivatives (np.ndarray): Parametric derivatives at the ordered points with shape (n_gp, 2, n_nodes).
+
+        ordered_point_indices (np.ndarray): Index in points of each ordered point with shape (n_gp,), so quantities
+            computed at the integration points can be reused for the recovery.
+
+        extrapolation_matrix (np.ndarray): Operator from the ordered Gauss points to the nodes with shape (n_nodes, n_gp).
+    """
+
+    _registry: Dict[Tuple[type, str], 'ReferenceElement'] = {}
+
+    def __init__(self, element_type: type, intgr_type: str):
+        """
+        Initializes a ReferenceElement object.
+
+        Args:
+            element_type (type): Element class the quantities belong to.
+
+            intgr_type (str): Type of numerical integration ('full' or 'reduced').
+        """
+        element = element_type()
+        gauss = Gauss()
+
+        self.element_type = element_type
+        self.intgr_type = intgr_type
+        self.number_gp = element.get_number_gp(intgr_type)
+
+        # Integration points
+        points = gauss.get_points(self.number_gp)
+        weights = gauss.get_weights(self.number_gp)
+        self.points = np.array([[xi, eta] for xi in points for eta in points])
+        self.weights = np.outer(weights, weights).ravel()
+        self.shape_functions = np.array([element.shape_functions(xi, eta).ravel() for xi, eta in self.points])
+        self.shape_derivatives = np.array([element.shape_functions_derivative(xi, eta) for xi, eta in self.points])
+
+        # Recovery points
+        self.ordered_points = gauss.get_ordered_points(self.number_gp)
+        self.ordered_shape_derivatives = np.array([element.shape_functions_derivative(xi, eta) for xi, eta in self.ordered_points])
+        self.ordered_point_indices = np.argmin(np.linalg.norm(self.ordered_points[:, None] - self.points[None], axis=-1), axis=1)
+        self.extrapolation_matrix = element.construct_extrapolation_matrix(self.number_gp)
+
+        # Make the shared tables read-only so no element can modify them by accident
+        for array in (self.points, self.weights, self.shape_functions, self.shape_derivatives, self.ordered_points, self.ordered_shape_derivatives, self.ordered_point_indices, self.extrapolation_matrix):
+            array.setflags(write=False)
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the reference element."""
+        return f'ReferenceElement({self.element_type.__name__}, {self.intgr_type})'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the reference element."""
+        return self.name
+
+    @classmethod
+    def get(cls, element_type: type, intgr_type: str) -> 'ReferenceElement':
+        """
+        Returns the shared reference element of an element type, building it on first use.
+
+        Args:
+            element_type (type): Element class.
+
+            intgr_type (str): Type of numerical integration ('full' or 'reduced').
+
+        Returns:
+            ReferenceElement: The cached reference element.
+        """
+        key = (element_type, intgr_type)
+        if key not in cls._registry:
+            cls._registry[key] = cls(element_type, intgr_type)
+        return cls._registry[key]
+
+    @classmethod
+    def clear_registry(cls):
+        """Removes all cached reference elements."""
+        cls._registry.clear()
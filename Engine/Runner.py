@@ -1,9 +1,29 @@
-from typing import Optional
+import os
+import tempfile
+from typing import Callable, Dict, List, Optional
 
+from Engine.AnalysisState import AnalysisState
+from Engine.DofRenumberer import DofRenumberer
+from Engine.ElementByElementOperator import ElementByElementOperator
+from Engine.ElementColoring import ElementColoring
 from Engine.Geometry import Geometry
 from Engine.Materials.LinearElasticMaterial import LinearElasticMaterial
+from Engine.ParallelExecutor import ParallelExecutor, stiffness_kernel, stress_strain_kernel
+from Engine.Preconditioners.BlockJacobiPreconditioner import BlockJacobiPreconditioner
+from Engine.Preconditioners.IncompleteLUPreconditioner import IncompleteLUPreconditioner
+from Engine.Preconditioners.JacobiPreconditioner import JacobiPreconditioner
+from Engine.Solver import Solver
+from Engine.Solvers.ConjugateGradientSolver import ConjugateGradientSolver
+from Engine.Solvers.DenseSolver import DenseSolver
+from Engine.Solvers.SparseCholeskySolver import SparseCholeskySolver
+from Engine.Solvers.SparseLUSolver import SparseLUSolver
+from Engine.Solvers.SubstructuringSolver import SubstructuringSolver
+from Engine.StiffnessCache import StiffnessCache
+from Pos.ResultsStore import ResultsStore
 from Pos.Visualizer import Visualizer
+from Pos.VtkExporter import VtkExporter
 import numpy as np
+from scipy.sparse import issparse
 
 
 class Runner(object):
@@ -19,12 +39,67 @@ class Runner(object):
 
         global_force_vector (np.ndarray): Global force vector.
 
-        global_displacement_vector (np.ndarray): Global displacement vector.
+        global_displacement_vector (np.ndarray): Global displacement vector with shape (2 * n_nodes,), the free dofs
+            first and zeros for the constrained ones.
+
+        solver (Solver): Linear solver used in the last analysis, it holds the timings of the solve stage.
+
+        state (AnalysisState): Stages and result buffers of the analyses, so repeated analyses only recompute the
+            stages whose inputs changed.
+
+        executor (Optional[ParallelExecutor]): Pool that computes the element stiffness matrices and the recovery in
+            parallel, None for serial execution.
+
+        colored_scatter (bool): Scatter-adds the sparse assembly and the nodal averaging color by color on the executor,
+            see ElementColoring. Off by default, since it changes the summation order and so the results at round-off
+            level.
+
+        element_color_groups (List[np.ndarray]): Element indices of each color of the last coloring.
+
+        analysis_options (dict): Options of the last analysis, see run_analysis.
+
+        solver_options_used (dict): Arguments of the last prepare_solver call, so solve_load_cases brings the
+            factorization up to date with the same options.
+
+        renumbering_report (Optional[dict]): Renumbering method with the bandwidth and profile of the stiffness matrix
+            before and after the renumbering of the last analysis and whether the new order was applied, None when no
+            renumbering was requested.
+
+        elements_nodal_stress (Optional[np.ndarray]): Unaveraged stress extrapolated to the nodes of each element with
+            shape (n_elem, n_nodes, 3), kept only when requested in run_analysis. The rows of elements with fewer nodes
+            than the others are padded with zeros, like the connectivity of the mesh store.
+
+        elements_nodal_strain (Optional[np.ndarray]): Unaveraged strain extrapolated to the nodes of each element with
+            shape (n_elem, n_nodes, 3), kept only when requested in run_analysis.
+
+        stiffness_cache (Optional[StiffnessCache]): Element stiffness matrices keyed by the geometric signature of the
+            elements, so translated copies of an element are integrated once. None, the default, integrates every
+            element, see set_stiffness_cache.
+
+        b_matrices_cache (dict): B matrices of the element groups kept from the stiffness pass for the recovery, keyed
+            by (element type, material id, integration type).
 
         _number_gp (int): Number of Gauss points.
 
+        SPARSE_ASSEMBLY_MIN_DOFS (int): Number of free degrees of freedom from which the sparse assembly is used by default.
+
+        DENSE_SOLVER_MAX_DOFS (int): Largest number of free degrees of freedom for which the dense solver is selected automatically.
+
+        DENSE_SOLVER_MIN_DENSITY (float): Smallest fraction of nonzero entries of a sparse matrix for which the dense solver
+            is selected automatically.
+
+        B_MATRICES_CACHE_MAX_BYTES (int): Memory budget of the B matrices kept from the stiffness pass.
+
+        STIFFNESS_CACHE_MAX_ENTRIES (int): Default number of element signatures kept in the stiffness cache.
+
     """
 
+    SPARSE_ASSEMBLY_MIN_DOFS = 1000
+    DENSE_SOLVER_MAX_DOFS = 2000
+    DENSE_SOLVER_MIN_DENSITY = 0.1
+    B_MATRICES_CACHE_MAX_BYTES = 256 * 1024 ** 2
+    STIFFNESS_CACHE_MAX_ENTRIES = 4096
+
     def __init__(self):
         """Initializes a Runner object."""
         # Geometry
@@ -36,6 +111,24 @@ class Runner(object):
         self.global_force_vector = None
         self.global_displacement_vector = None
 
+        self.solver = None
+        self.renumbering_report = None
+        self.analysis_options = {}
+        self.solver_options_used = {}
+
+        # Stages and result buffers of the analyses
+        self.state = AnalysisState()
+        self.executor = None
+        self.colored_scatter = False
+        self.element_color_groups = []
+
+        # Element-nodal results
+        self.elements_nodal_stress = None
+        self.elements_nodal_strain = None
+
+        self.b_matrices_cache = {}
+        self.stiffness_cache = None
+
         self._number_gp = None
 
     @property
@@ -130,74 +223,1022 @@ class Runner(object):
         """
         self.geometry.nodes[node].apply_load(x, y)
 
-    def run_analysis(self, stiff_intgr_type: str = 'full', stress_strain_intgr_type: str = 'full'):
-        """Runs the structural analysis."""
-        # Compute nodal global indices for each node
-        self.geometry.compute_nodal_global_indices()
+    def select_nodes(self, position: dict, tolerance: Optional[float] = None) -> np.ndarray:
+        """
+        Selects the nodes at a position given in the format of the example files.
+
+        Args:
+            position (dict): Position {'x': x or None, 'y': y or None}, None meaning any value, so {'x': 60, 'y': None}
+                selects the line x = 60.
+
+            tolerance (Optional[float]): Matching tolerance, see SpatialIndex.
+
+        Returns:
+            np.ndarray: Indices (label - 1) of the selected nodes.
+
+        Raises:
+            ValueError: If no node lies at the position.
+        """
+        indices = self.geometry.get_spatial_index().select_position(position, tolerance)
+        if len(indices) == 0:
+            raise ValueError(f'No node found at position {position}')
+        return indices
+
+    def apply_boundary_conditions(self, nodes_restrictions: List[dict], tolerance: Optional[float] = None):
+        """
+        Sets the boundary conditions given in the format of the example files.
+
+        Args:
+            nodes_restrictions (List[dict]): Entries {'position': {'x': ..., 'y': ...}, 'restrictions': {'x': bool, 'y': bool}}.
+
+            tolerance (Optional[float]): Matching tolerance of the positions, see SpatialIndex.
+        """
+        for restriction_data in nodes_restrictions:
+            indices = self.select_nodes(restriction_data['position'], tolerance)
+            self.geometry.constrain_nodes(indices, restriction_data['restrictions']['x'], restriction_data['restrictions']['y'])
+
+    def apply_nodal_loads(self, nodes_forces: List[dict], tolerance: Optional[float] = None):
+        """
+        Applies the nodal loads given in the format of the example files.
+
+        Args:
+            nodes_forces (List[dict]): Entries {'position': {'x': ..., 'y': ...}, 'forces': {'x': float, 'y': float}},
+                the forces are applied to every selected node.
+
+            tolerance (Optional[float]): Matching tolerance of the positions, see SpatialIndex.
+        """
+        for force_data in nodes_forces:
+            indices = self.select_nodes(force_data['position'], tolerance)
+            self.geometry.apply_nodal_loads(indices, force_data['forces']['x'], force_data['forces']['y'])
+
+    def set_parallel_execution(self, num_workers: Optional[int] = None, backend: Optional[str] = 'process', chunk_size: int = 2048, colored_scatter: bool = False) -> Optional[ParallelExecutor]:
+        """
+        Configures the parallel computation of the element stiffness matrices and of the stress and strain recovery.
+
+        The element matrices and the recovery are bit-identical to the serial execution. Only when the stiffness cache
+        is enabled with set_stiffness_cache, the serial recovery reuses the B matrices of the cached signatures, equal
+        to the recomputed ones up to round-off. The scaling numbers of each stage are kept in parallel_report.
 
-        # Perform the analysis
-        self.global_stiffness_matrix = self.integrate_and_assemble_stiffness_matrix(stiff_intgr_type)
-        self.global_force_vector = self.geometry.assemble_global_forces_vector()
-        self.global_displacement_vector = self.solve_displacements()
+        With colored_scatter, the sparse assembly and the nodal averaging are also run on the pool, color by color.
+        Their summation order is deterministic and does not depend on the number of workers or the backend, but it
+        differs from the serial one, so the stiffness matrix, the displacements and the stresses then only match the
+        serial results up to round-off, not bit for bit.
+
+        Args:
+            num_workers (Optional[int]): Number of workers, the number of CPUs when None.
+
+            backend (Optional[str]): Type of pool ('process' or 'thread'), None goes back to the serial execution.
+
+            chunk_size (int): Number of elements computed by a task.
+
+            colored_scatter (bool): Runs the sparse assembly and the nodal averaging color by color on the pool, which
+                changes the results at round-off level.
+
+        Returns:
+            Optional[ParallelExecutor]: The executor, None for serial execution.
+        """
+        if self.executor is not None:
+            self.executor.close()
+
+        self.executor = None if backend is None else ParallelExecutor(num_workers, backend, chunk_size)
+        self.colored_scatter = colored_scatter and self.executor is not None
+        return self.executor
+
+    def set_stiffness_cache(self, max_entries: Optional[int] = STIFFNESS_CACHE_MAX_ENTRIES, tolerance: Optional[float] = None) -> Optional[StiffnessCache]:
+        """
+        Configures the cache of element stiffness matrices.
+
+        The cache is disabled by default. Elements whose coordinates relative to their first node match within the
+        tolerance, with the same type, material and integration rule, share one integrated matrix. Their matrices are
+        equal to the integrated ones up to round-off, so the results are no longer bit-identical to those without the
+        cache, and the parallel recovery differs from the serial one by round-off, see set_parallel_execution. Groups
+        with mostly distinct shapes bypass the cache, see StiffnessCache. The hits and misses of the cache are counted
+        in stiffness_cache.
+
+        Args:
+            max_entries (Optional[int]): Number of signatures kept, None integrates every element.
+
+            tolerance (Optional[float]): Distance under which coordinates are considered equal, see StiffnessCache.
+
+        Returns:
+            Optional[StiffnessCache]: The cache, None when disabled.
+        """
+        self.stiffness_cache = None if max_entries is None else StiffnessCache(max_entries, tolerance)
+        self.state.invalidate('stiffness')
+        return self.stiffness_cache
+
+    @property
+    def parallel_report(self) -> Dict[str, dict]:
+        """Returns the wall time, busy time, speedup and efficiency of the parallel stages of the last analysis."""
+        return {} if self.executor is None else self.executor.report
+
+    def get_element_color_groups(self) -> List[np.ndarray]:
+        """
+        Returns the element indices of each color, computed again only when the geometry changes.
+
+        Returns:
+            List[np.ndarray]: Element indices of each color, see ElementColoring.
+        """
+        coloring_key = self.geometry.store.versions['geometry']
+        if not self.state.is_up_to_date('coloring', coloring_key):
+            colors = ElementColoring(self.geometry).compute_colors()
+            self.element_color_groups = ElementColoring.group_by_color(colors)
+            self.state.mark_computed('coloring', coloring_key)
+
+        return self.element_color_groups
+
+    def run_analysis(self, stiff_intgr_type: str = 'full', stress_strain_intgr_type: str = 'full', assembly_type: str = 'auto', solver_type: str = 'auto', solver_options: Optional[dict] = None, assembly_options: Optional[dict] = None, renumbering: Optional[str] = None, keep_element_nodal_values: bool = False):
+        """
+        Runs the structural analysis.
+
+        Args:
+            stiff_intgr_type (str): Type of numerical integration of the stiffness matrix ('full' or 'reduced').
+
+            stress_strain_intgr_type (str): Type of numerical integration of the stress and strain ('full' or 'reduced').
+
+            assembly_type (str): Storage of the global stiffness matrix ('auto', 'sparse', 'dense' or 'matrix_free').
+                'auto' uses the sparse assembly for models with at least SPARSE_ASSEMBLY_MIN_DOFS free degrees of freedom.
+
+            solver_type (str): Linear solver backend ('auto', 'dense', 'lu', 'cholesky', 'cg' or 'substructuring'), see select_solver.
+
+            solver_options (Optional[dict]): Keyword arguments of the solver, see create_conjugate_gradient_solver and
+                create_substructuring_solver.
+
+            assembly_options (Optional[dict]): Keyword arguments of the matrix-free operator, see
+                create_element_by_element_operator.
+
+            renumbering (Optional[str]): DOF renumbering method ('rcm', 'amd' or 'nested_dissection'), see number_dofs.
+
+            keep_element_nodal_values (bool): Keeps the unaveraged element-nodal stress and strain, e.g. to check the
+                stress jumps between elements.
+        """
+        self.state.begin_run()
+        versions = self.geometry.store.versions
+        self.analysis_options = {'stiff_intgr_type': stiff_intgr_type, 'stress_strain_intgr_type': stress_strain_intgr_type, 'assembly_type': assembly_type,
+                                 'solver_type': solver_type, 'solver_options': solver_options, 'renumbering': renumbering}
+
+        # Compute nodal global indices, assemble and factorize the stiffness matrix, unless they are up to date
+        solver_key = self.prepare_solver(stiff_intgr_type, assembly_type, solver_type, solver_options, assembly_options, renumbering)
+
+        forces_key = (self.state.get_key('numbering'), versions['loads'])
+        if not self.state.is_up_to_date('forces', forces_key):
+            self.global_force_vector = self.geometry.assemble_global_forces_vector()
+            self.state.mark_computed('forces', forces_key)
+
+        displacements_key = (solver_key, forces_key)
+        if not self.state.is_up_to_date('displacements', displacements_key):
+            # The factorized solver may be reused across load changes, so its warm start is taken from the last solution
+            if isinstance(self.solver, ConjugateGradientSolver) and (solver_options or {}).get('warm_start', True):
+                self.solver.initial_guess = self.get_warm_start()
+            displacements = self.solver.solve(self.global_force_vector.ravel())
+            self.global_displacement_vector = self.scatter_displacements(displacements)
+            self.state.mark_computed('displacements', displacements_key)
 
         # Compute the stress and strain at the gauss points for each element and extrapolate to the nodes
-        self.compute_elements_stress_strain(stress_strain_intgr_type)
-        self.average_nodal_stress_strain()
+        recovery_key = (displacements_key, stress_strain_intgr_type, keep_element_nodal_values)
+        if not self.state.is_up_to_date('recovery', recovery_key):
+            self.compute_elements_stress_strain(stress_strain_intgr_type)
+            self.average_nodal_stress_strain(keep_element_nodal_values)
+            self.state.mark_computed('recovery', recovery_key)
+
+    def prepare_solver(self, stiff_intgr_type: str = 'full', assembly_type: str = 'auto', solver_type: str = 'auto', solver_options: Optional[dict] = None, assembly_options: Optional[dict] = None, renumbering: Optional[str] = None) -> tuple:
+        """
+        Numbers the dofs, assembles the stiffness matrix and factorizes it, skipping the stages that are up to date.
+
+        A stage is recomputed when the geometry, constraints or materials it depends on were modified, when its options
+        change or when a stage it depends on was recomputed.
+
+        Args:
+            stiff_intgr_type (str): Type of numerical integration of the stiffness matrix ('full' or 'reduced').
+
+            assembly_type (str): Storage of the global stiffness matrix ('auto', 'sparse', 'dense' or 'matrix_free').
+
+            solver_type (str): Linear solver backend ('auto', 'dense', 'lu', 'cholesky', 'cg' or 'substructuring').
 
-    def integrate_and_assemble_stiffness_matrix(self, stiff_intgr_type: str):
-        """Integrates and assembles the stiffness matrix."""
-        self.global_stiffness_matrix = np.zeros((self.geometry.count_global_free_dofs(), self.geometry.count_global_free_dofs()))
+            solver_options (Optional[dict]): Keyword arguments of the solver, see create_conjugate_gradient_solver and
+                create_substructuring_solver.
 
-        for element in self.geometry.elements:
-            element_stiffness_matrix = element.compute_elem_stiffness_matrix(stiff_intgr_type)
-            self.global_stiffness_matrix = self.geometry.assemble_global_stiffness_matrix(self.global_stiffness_matrix, element_stiffness_matrix, element)
+            assembly_options (Optional[dict]): Keyword arguments of the matrix-free operator, see
+                create_element_by_element_operator.
+
+            renumbering (Optional[str]): DOF renumbering method ('rcm', 'amd' or 'nested_dissection'), see number_dofs.
+
+        Returns:
+            tuple: Key of the factorized solver in the analysis state.
+        """
+        versions = self.geometry.store.versions
+        self.solver_options_used = {'stiff_intgr_type': stiff_intgr_type, 'assembly_type': assembly_type, 'solver_type': solver_type,
+                                    'solver_options': solver_options, 'assembly_options': assembly_options, 'renumbering': renumbering}
+
+        numbering_key = (versions['geometry'], versions['constraints'], renumbering)
+        if not self.state.is_up_to_date('numbering', numbering_key):
+            self.number_dofs(renumbering)
+            self.state.mark_computed('numbering', numbering_key)
+
+        stiffness_key = (numbering_key, versions['materials'], stiff_intgr_type, assembly_type, repr(sorted((assembly_options or {}).items())))
+        if not self.state.is_up_to_date('stiffness', stiffness_key):
+            self.global_stiffness_matrix = self.integrate_and_assemble_stiffness_matrix(stiff_intgr_type, assembly_type, assembly_options)
+            self.state.mark_computed('stiffness', stiffness_key)
+
+        solver_key = (stiffness_key, solver_type, repr(sorted((solver_options or {}).items())))
+        if not self.state.is_up_to_date('factorization', solver_key):
+            self.solver = self.select_solver(solver_type, solver_options)
+            self.solver.factorize(self.global_stiffness_matrix)
+            self.state.mark_computed('factorization', solver_key)
+
+        return solver_key
+
+    def number_dofs(self, renumbering: Optional[str] = None):
+        """
+        Computes the global indices of the degrees of freedom, optionally renumbering the nodes first.
+
+        The results are still reported per node, so the renumbering only changes the layout of the global matrices.
+        The bandwidth and profile before and after the renumbering are kept in renumbering_report. They measure the
+        envelope of the matrix, which 'rcm' reduces; the creation order is kept when the 'rcm' order increases the
+        bandwidth or the profile, or reduces neither. 'amd' and 'nested_dissection' reduce the fill-in of the sparse
+        factorization instead and usually increase the profile, so their order is always applied. The sparse
+        factorizations keep an applied order instead of reordering the matrix, see get_column_ordering.
+
+        Args:
+            renumbering (Optional[str]): Renumbering method ('rcm', 'amd' or 'nested_dissection'), None keeps the
+                creation order of the nodes.
+        """
+        if renumbering is None:
+            self.geometry.compute_nodal_global_indices()
+            self.renumbering_report = None
+            return
+
+        renumberer = DofRenumberer(self.geometry)
+        node_order = renumberer.compute_node_order(renumbering)
+        bandwidth_before, profile_before = renumberer.compute_bandwidth_and_profile()
+        bandwidth_after, profile_after = renumberer.compute_bandwidth_and_profile(node_order)
+
+        applied = renumbering != 'rcm' or (bandwidth_after <= bandwidth_before and profile_after <= profile_before
+                                           and (bandwidth_after, profile_after) != (bandwidth_before, profile_before))
+        self.geometry.compute_nodal_global_indices(node_order if applied else None)
+
+        self.renumbering_report = {'method': renumbering,
+                                   'applied': applied,
+                                   'bandwidth_before': bandwidth_before,
+                                   'profile_before': profile_before,
+                                   'bandwidth_after': bandwidth_after,
+                                   'profile_after': profile_after}
+
+    def get_column_ordering(self, default: str) -> str:
+        """
+        Returns the SuperLU column ordering of the sparse factorizations.
+
+        A renumbering applied by number_dofs is kept with the 'NATURAL' ordering, otherwise SuperLU would reorder the
+        matrix again and discard it.
+
+        Args:
+            default (str): Column ordering of the solver when the dofs were not renumbered.
+
+        Returns:
+            str: The column ordering.
+        """
+        report = self.renumbering_report
+        if report is not None and report['applied']:
+            return 'NATURAL'
+        return default
+
+    def get_nodal_displacements(self) -> np.ndarray:
+        """
+        Returns the displacements of the last analysis in the node order.
+
+        Returns:
+            np.ndarray: Displacements with shape (n_nodes, 2), zero for constrained degrees of freedom.
+        """
+        nodal_dofs = self.geometry.get_nodal_global_indices()
+        return np.where(nodal_dofs != -1, self.global_displacement_vector[nodal_dofs], 0.)
+
+    def integrate_and_assemble_stiffness_matrix(self, stiff_intgr_type: str, assembly_type: str = 'auto', assembly_options: Optional[dict] = None):
+        """
+        Integrates and assembles the stiffness matrix.
+
+        Args:
+            stiff_intgr_type (str): Type of numerical integration.
+
+            assembly_type (str): Storage of the global stiffness matrix ('auto', 'sparse', 'dense' or 'matrix_free').
+
+            assembly_options (Optional[dict]): Keyword arguments of the matrix-free operator, only used by 'matrix_free'.
+
+        Raises:
+            ValueError: If the assembly type is not supported.
+        """
+        num_dofs = self.geometry.count_global_free_dofs()
+
+        if assembly_type == 'auto':
+            assembly_type = 'sparse' if num_dofs >= self.SPARSE_ASSEMBLY_MIN_DOFS else 'dense'
+
+        if assembly_type == 'matrix_free':
+            # No global matrix is assembled
+            self.global_stiffness_matrix = self.create_element_by_element_operator(stiff_intgr_type, **(assembly_options or {}))
+            return self.global_stiffness_matrix
+
+        if assembly_type not in ('sparse', 'dense'):
+            raise ValueError('assembly_type must be either "auto", "sparse", "dense" or "matrix_free"')
+
+        elements_stiffness_matrices = self.compute_elements_stiffness_matrices(stiff_intgr_type)
+
+        return self.assemble_stiffness_matrix(elements_stiffness_matrices, assembly_type)
+
+    def assemble_stiffness_matrix(self, elements_stiffness_matrices: np.ndarray, assembly_type: str = 'sparse'):
+        """
+        Assembles the element stiffness matrices into the global stiffness matrix.
+
+        Args:
+            elements_stiffness_matrices (np.ndarray): Element stiffness matrices with shape (n_elem, n_dofs, n_dofs), see
+                compute_elements_stiffness_matrices.
+
+            assembly_type (str): Storage of the global stiffness matrix ('sparse' or 'dense').
+        """
+        num_dofs = self.geometry.count_global_free_dofs()
+
+        if assembly_type == 'sparse' and self.colored_scatter:
+            self.global_stiffness_matrix = self.geometry.assemble_colored_sparse_global_stiffness_matrix(elements_stiffness_matrices, self.get_element_color_groups(), self.executor)
+        elif assembly_type == 'sparse':
+            self.global_stiffness_matrix = self.geometry.assemble_sparse_global_stiffness_matrix(elements_stiffness_matrices)
+        else:
+            # Dense assembly is kept for small debug runs
+            self.global_stiffness_matrix = np.zeros((num_dofs, num_dofs))
+
+            for element, element_stiffness_matrix in zip(self.geometry.elements, elements_stiffness_matrices):
+                self.global_stiffness_matrix = self.geometry.assemble_global_stiffness_matrix(self.global_stiffness_matrix, element_stiffness_matrix, element)
 
         return self.global_stiffness_matrix
 
-    def solve_displacements(self) -> np.ndarray:
-        """Solves for displacements."""
-        self.global_displacement_vector = np.zeros(len(self.geometry.nodes) * 2)
-        # numpy division of matrices
-        displacements = np.linalg.solve(self.global_stiffness_matrix, self.global_force_vector)
+    def compute_group_stiffness_matrices(self, element_type: type, indices: List[int], stiff_intgr_type: str, cache_b_matrices: bool = False) -> np.ndarray:
+        """
+        Computes the stiffness matrices of a group of elements that share the same type and material.
+
+        The group is computed as a block by the element type kernel, only for the signatures missing from the
+        stiffness cache when it is enabled. Element types without a block kernel are computed one by one.
+
+        Args:
+            element_type (type): Element class of the group.
+
+            indices (List[int]): Indices of the elements of the group.
+
+            stiff_intgr_type (str): Type of numerical integration.
+
+            cache_b_matrices (bool): Keeps the B matrices of the group in b_matrices_cache for the recovery, as long as
+                they fit in B_MATRICES_CACHE_MAX_BYTES.
+
+        Returns:
+            np.ndarray: Element stiffness matrices with shape (n_elem, n_dofs, n_dofs).
+        """
+        elements = self.geometry.elements
+        first_element = elements[indices[0]]
+        coordinates = self.geometry.get_element_coordinates(indices)
+        elastic_matrix = first_element.material.get_elastic_matrix(True)  # True for plane stress
+        thickness = first_element.get_thickness()
+
+        def compute(block_coordinates: np.ndarray) -> (np.ndarray, np.ndarray):
+            return element_type.compute_block_stiffness_matrices(block_coordinates, elastic_matrix, thickness, stiff_intgr_type, return_b_matrices=True)
+
+        try:
+            if self.stiffness_cache is None:
+                stiffness_matrices, b_matrices = compute(coordinates)
+            else:
+                key = (element_type, elastic_matrix.tobytes(), thickness, stiff_intgr_type)
+                stiffness_matrices, b_matrices = self.stiffness_cache.get_matrices(key, coordinates, compute)
+        except NotImplementedError:
+            return np.array([elements[i].compute_elem_stiffness_matrix(stiff_intgr_type) for i in indices])
+
+        cached_bytes = sum(b.nbytes for _, b in self.b_matrices_cache.values())
+        if cache_b_matrices and b_matrices is not None and cached_bytes + b_matrices.nbytes <= self.B_MATRICES_CACHE_MAX_BYTES:
+            # Stored in the order of the recovery points
+            ordered_point_indices = first_element.get_reference_element(stiff_intgr_type).ordered_point_indices
+            key = (element_type, id(first_element.material), stiff_intgr_type)
+            self.b_matrices_cache[key] = (np.asarray(indices), b_matrices[:, ordered_point_indices])
+
+        return stiffness_matrices
+
+    def compute_elements_stiffness_matrices(self, stiff_intgr_type: str) -> np.ndarray:
+        """
+        Computes the stiffness matrices of all elements.
+
+        The B matrices are kept for the recovery when they fit in B_MATRICES_CACHE_MAX_BYTES. With parallel execution
+        the groups are computed chunk by chunk on the pool of the executor, see set_parallel_execution.
+
+        Args:
+            stiff_intgr_type (str): Type of numerical integration.
+
+        Returns:
+            np.ndarray: Element stiffness matrices with shape (n_elem, n_dofs, n_dofs), in the same order as the elements,
+                padded with zeros for the elements with fewer nodes than the others.
+        """
+        num_elem_dofs = 2 * self.geometry.store.nodes_per_element
+        elements_stiffness_matrices = np.zeros((len(self.geometry.elements), num_elem_dofs, num_elem_dofs))
+
+        self.b_matrices_cache = {}
+        for (element_type, _), indices in self.geometry.group_elements().items():
+            stiffness_matrices = None
+            if self.executor is not None:
+                try:
+                    stiffness_matrices = self.compute_group_stiffness_matrices_in_parallel(element_type, indices, stiff_intgr_type)
+                except NotImplementedError:
+                    pass
+
+            if stiffness_matrices is None:
+                stiffness_matrices = self.compute_group_stiffness_matrices(element_type, indices, stiff_intgr_type, cache_b_matrices=True)
+            group_dofs = stiffness_matrices.shape[1]
+            elements_stiffness_matrices[indices, :group_dofs, :group_dofs] = stiffness_matrices
+
+        return elements_stiffness_matrices
+
+    def compute_group_stiffness_matrices_in_parallel(self, element_type: type, indices: List[int], stiff_intgr_type: str) -> np.ndarray:
+        """
+        Computes the stiffness matrices of a group of elements chunk by chunk on the pool of the executor.
+
+        Only the signatures missing from the stiffness cache are computed when it is enabled.
+
+        Args:
+            element_type (type): Element class of the group.
+
+            indices (List[int]): Indices of the elements of the group.
+
+            stiff_intgr_type (str): Type of numerical integration.
+
+        Returns:
+            np.ndarray: Element stiffness matrices with shape (n_elem, n_dofs, n_dofs), bit-identical to
+                compute_group_stiffness_matrices.
+
+        Raises:
+            NotImplementedError: If the element type has no block kernel.
+        """
+        first_element = self.geometry.elements[indices[0]]
+        coordinates = self.geometry.get_element_coordinates(indices)
+        num_elem_dofs = 2 * coordinates.shape[1]
+        elastic_matrix = first_element.material.get_elastic_matrix(True)
+        thickness = first_element.get_thickness()
+
+        def compute(block_coordinates: np.ndarray) -> (np.ndarray, None):
+            outputs = self.executor.map_chunks('stiffness', stiffness_kernel, len(block_coordinates),
+                                               {'coordinates': block_coordinates},
+                                               {'stiffness': (num_elem_dofs, num_elem_dofs)},
+                                               (element_type, elastic_matrix, thickness, stiff_intgr_type))
+            return outputs['stiffness'], None
+
+        if self.stiffness_cache is None:
+            return compute(coordinates)[0]
+
+        key = (element_type, elastic_matrix.tobytes(), thickness, stiff_intgr_type)
+        return self.stiffness_cache.get_matrices(key, coordinates, compute)[0]
+
+    def get_cached_b_matrices(self, element_type: type, indices: List[int], intgr_type: str) -> Optional[np.ndarray]:
+        """
+        Returns the B matrices of a group of elements kept from the stiffness pass.
+
+        Args:
+            element_type (type): Element class of the group.
 
-        # Assemble the global displacement vector
-        for i, node in enumerate(self.geometry.nodes):
-            if not node.is_constrained_x():
-                self.global_displacement_vector[node.global_index_x] = displacements[node.global_index_x]
-            if not node.is_constrained_y():
-                self.global_displacement_vector[node.global_index_y] = displacements[node.global_index_y]
+            indices (List[int]): Indices of the elements of the group.
+
+            intgr_type (str): Type of numerical integration of the recovery.
+
+        Returns:
+            Optional[np.ndarray]: B matrices at the ordered Gauss points, None when they were not cached for this group
+                and integration type.
+        """
+        key = (element_type, id(self.geometry.elements[indices[0]].material), intgr_type)
+        if key not in self.b_matrices_cache:
+            return None
+
+        cached_indices, b_matrices = self.b_matrices_cache[key]
+        if not np.array_equal(cached_indices, indices):
+            return None
+        return b_matrices
+
+    def create_element_by_element_operator(self, stiff_intgr_type: str, cache_element_matrices: bool = True, chunk_size: int = 4096) -> ElementByElementOperator:
+        """
+        Creates the matrix-free operator of the global stiffness matrix.
+
+        Args:
+            stiff_intgr_type (str): Type of numerical integration.
+
+            cache_element_matrices (bool): Keeps the element stiffness matrices in memory. Otherwise they are recomputed
+                in chunks at every product, which keeps the memory bounded by the chunk size.
+
+            chunk_size (int): Number of elements whose matrices are recomputed at once.
+
+        Returns:
+            ElementByElementOperator: The operator, it supports the @ operator and the diagonal method.
+        """
+        operator = ElementByElementOperator(self.geometry.count_global_free_dofs(), chunk_size)
+
+        for (element_type, _), indices in self.geometry.group_elements().items():
+            connectivity = self.geometry.get_element_dofs(indices)
+
+            if cache_element_matrices:
+                operator.add_group(connectivity, element_matrices=self.compute_group_stiffness_matrices(element_type, indices, stiff_intgr_type))
+            else:
+                group_indices = np.array(indices)
+                operator.add_group(connectivity, compute_element_matrices=lambda local_indices, element_type=element_type, group_indices=group_indices:
+                                   self.compute_group_stiffness_matrices(element_type, group_indices[local_indices], stiff_intgr_type))
+
+        return operator
+
+    def select_solver(self, solver_type: str = 'auto', solver_options: Optional[dict] = None) -> Solver:
+        """
+        Selects the linear solver backend for the global stiffness matrix.
+
+        With 'auto', the dense LAPACK solver is used for small models whose matrix is dense or has at least
+        DENSE_SOLVER_MIN_DENSITY nonzero entries, and the sparse Cholesky solver otherwise, since the stiffness matrix is
+        symmetric positive definite once the constraints are applied.
+
+        Args:
+            solver_type (str): Linear solver backend ('auto', 'dense', 'lu', 'cholesky', 'cg' or 'substructuring').
+
+            solver_options (Optional[dict]): Keyword arguments of the solver, only used by 'cg' and 'substructuring'.
+
+        Returns:
+            Solver: The selected solver.
+
+        Raises:
+            ValueError: If the solver type is not supported.
+        """
+        matrix_free = isinstance(self.global_stiffness_matrix, ElementByElementOperator)
+
+        if solver_type == 'auto' and matrix_free:
+            # Only the iterative solver works without an assembled matrix
+            solver_type = 'cg'
+        elif solver_type == 'auto':
+            num_dofs = self.global_stiffness_matrix.shape[0]
+            if issparse(self.global_stiffness_matrix):
+                density = self.global_stiffness_matrix.nnz / max(num_dofs ** 2, 1)
+            else:
+                density = 1.0
+
+            if num_dofs <= self.DENSE_SOLVER_MAX_DOFS and density >= self.DENSE_SOLVER_MIN_DENSITY:
+                solver_type = 'dense'
+            else:
+                solver_type = 'cholesky'
+
+        if matrix_free and solver_type in ('dense', 'lu', 'cholesky', 'substructuring'):
+            raise ValueError(f'solver_type "{solver_type}" requires an assembled stiffness matrix, use "cg" with the matrix-free assembly')
+
+        if solver_type == 'dense':
+            return DenseSolver()
+        elif solver_type == 'lu':
+            return SparseLUSolver(self.get_column_ordering('COLAMD'))
+        elif solver_type == 'cholesky':
+            return SparseCholeskySolver(self.get_column_ordering('MMD_AT_PLUS_A'))
+        elif solver_type == 'cg':
+            return self.create_conjugate_gradient_solver(**(solver_options or {}))
+        elif solver_type == 'substructuring':
+            return self.create_substructuring_solver(**(solver_options or {}))
+        else:
+            raise ValueError('solver_type must be either "auto", "dense", "lu", "cholesky", "cg" or "substructuring"')
+
+    def create_conjugate_gradient_solver(self, preconditioner: str = 'jacobi', tolerance: float = 1e-10, max_iterations: Optional[int] = None, warm_start: bool = True, callback: Optional[Callable[[int, float], None]] = None) -> ConjugateGradientSolver:
+        """
+        Creates a preconditioned conjugate gradient solver for the current geometry.
+
+        Args:
+            preconditioner (str): Preconditioner ('jacobi', 'ilu', 'block_jacobi' or 'none').
+
+            tolerance (float): Convergence tolerance on the relative residual norm.
+
+            max_iterations (Optional[int]): Maximum number of iterations, defaults to the number of equations.
+
+            warm_start (bool): Starts the iterations from the displacements of the previous analysis, if any.
+
+            callback (Optional[Callable[[int, float], None]]): Called with the iteration number and the relative
+                residual norm after every iteration.
+
+        Returns:
+            ConjugateGradientSolver: The solver, its residual_history is filled by each solve.
+
+        Raises:
+            ValueError: If the preconditioner is not supported.
+        """
+        if preconditioner == 'jacobi':
+            selected_preconditioner = JacobiPreconditioner()
+        elif preconditioner == 'ilu':
+            if isinstance(self.global_stiffness_matrix, ElementByElementOperator):
+                raise ValueError('The "ilu" preconditioner requires an assembled stiffness matrix')
+            selected_preconditioner = IncompleteLUPreconditioner(column_ordering=self.get_column_ordering('MMD_AT_PLUS_A'))
+        elif preconditioner == 'block_jacobi':
+            selected_preconditioner = BlockJacobiPreconditioner(self.geometry.get_nodal_global_indices())
+        elif preconditioner == 'none':
+            selected_preconditioner = None
+        else:
+            raise ValueError('preconditioner must be either "jacobi", "ilu", "block_jacobi" or "none"')
+
+        initial_guess = self.get_warm_start() if warm_start else None
+
+        return ConjugateGradientSolver(selected_preconditioner, tolerance, max_iterations, initial_guess, callback)
+
+    def get_warm_start(self) -> Optional[np.ndarray]:
+        """
+        Returns the free displacements of the previous analysis, the starting point of the iterative solvers.
+
+        Returns:
+            Optional[np.ndarray]: Copy of the free displacements, None if there was no analysis of this mesh.
+        """
+        # The free dofs are numbered first, so the previous free displacements are the head of the global vector
+        if self.global_displacement_vector is None or len(self.global_displacement_vector) != len(self.geometry.nodes) * 2:
+            return None
+        return self.global_displacement_vector[:self.geometry.count_global_free_dofs()].copy()
+
+    def create_substructuring_solver(self, num_subdomains: int = 4, backend: str = 'process') -> SubstructuringSolver:
+        """
+        Creates a domain decomposition solver for the current geometry.
+
+        The nodes are partitioned by recursive bisection of the nodal graph, see DofRenumberer.compute_node_partition,
+        and the dofs of the separator nodes form the interface.
+
+        Args:
+            num_subdomains (int): Number of subdomains.
+
+            backend (str): Where the subdomains are factorized ('process' for one worker process per subdomain or
+                'serial').
+
+        Returns:
+            SubstructuringSolver: The solver.
+        """
+        node_labels = DofRenumberer(self.geometry).compute_node_partition(num_subdomains)
+
+        nodal_dofs = self.geometry.get_nodal_global_indices()
+        free = nodal_dofs != -1
+        dof_labels = np.empty(self.geometry.count_global_free_dofs(), dtype=int)
+        dof_labels[nodal_dofs[free]] = np.broadcast_to(node_labels[:, None], nodal_dofs.shape)[free]
+
+        return SubstructuringSolver(dof_labels, backend)
+
+    def solve_displacements(self, solver_type: str = 'auto', solver_options: Optional[dict] = None) -> np.ndarray:
+        """
+        Solves for displacements.
+
+        Args:
+            solver_type (str): Linear solver backend ('auto', 'dense', 'lu', 'cholesky', 'cg' or 'substructuring').
+
+            solver_options (Optional[dict]): Keyword arguments of the solver, only used by 'cg' and 'substructuring'.
+        """
+        self.solver = self.select_solver(solver_type, solver_options)
+
+        displacements = self.solver.factorize_and_solve(self.global_stiffness_matrix, self.global_force_vector.ravel())
+        self.global_displacement_vector = self.scatter_displacements(displacements)
 
         return self.global_displacement_vector
 
+    def scatter_displacements(self, displacements: np.ndarray) -> np.ndarray:
+        """
+        Writes the solution of the linear system into the global displacement vector.
+
+        The vector is a buffer of the analysis state, so it is reset instead of reallocated by repeated analyses.
+
+        Args:
+            displacements (np.ndarray): Displacements of the global free degrees of freedom.
+
+        Returns:
+            np.ndarray: Global displacement vector with shape (2 * n_nodes,).
+        """
+        global_displacement_vector = self.state.get_buffer('displacements', (len(self.geometry.nodes) * 2,))
+
+        nodal_dofs = self.geometry.get_nodal_global_indices()
+        free = nodal_dofs != -1
+        global_displacement_vector[nodal_dofs[free]] = np.ravel(displacements)[nodal_dofs[free]]
+
+        return global_displacement_vector
+
+    def factorize_stiffness_matrix(self, stiff_intgr_type: str = 'full', assembly_type: str = 'auto', solver_type: str = 'auto', solver_options: Optional[dict] = None, assembly_options: Optional[dict] = None, renumbering: Optional[str] = None) -> Solver:
+        """
+        Assembles and factorizes the stiffness matrix once, so several load cases can be solved with solve_load_cases.
+
+        Args:
+            stiff_intgr_type (str): Type of numerical integration of the stiffness matrix ('full' or 'reduced').
+
+            assembly_type (str): Storage of the global stiffness matrix ('auto', 'sparse', 'dense' or 'matrix_free').
+
+            solver_type (str): Linear solver backend ('auto', 'dense', 'lu', 'cholesky', 'cg' or 'substructuring').
+
+            solver_options (Optional[dict]): Keyword arguments of the solver, see create_conjugate_gradient_solver and
+                create_substructuring_solver.
+
+            assembly_options (Optional[dict]): Keyword arguments of the matrix-free operator, see
+                create_element_by_element_operator.
+
+            renumbering (Optional[str]): DOF renumbering method ('rcm', 'amd' or 'nested_dissection'), see number_dofs.
+
+        Returns:
+            Solver: The factorized solver.
+        """
+        self.state.begin_run()
+        self.prepare_solver(stiff_intgr_type, assembly_type, solver_type, solver_options, assembly_options, renumbering)
+
+        return self.solver
+
+    def solve_load_cases(self, nodal_forces: np.ndarray, stress_strain_intgr_type: str = 'full') -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Solves several load cases with the factorization of the last analysis or of factorize_stiffness_matrix.
+
+        The loads are given as a matrix, so the nodes are not modified. Forces on constrained degrees of freedom are
+        ignored, as in the single load case analysis. The numbering, stiffness matrix and factorization are first
+        brought up to date with the options they were prepared with, so changes of the geometry, constraints or
+        materials since then are taken into account.
+
+        Args:
+            nodal_forces (np.ndarray): Nodal forces with shape (2 * n_nodes, n_cases), the rows ordered as
+                [x load of node 1, y load of node 1, x load of node 2, ...].
+
+            stress_strain_intgr_type (str): Type of numerical integration of the stress and strain ('full' or 'reduced').
+
+        Returns:
+            (np.ndarray, np.ndarray, np.ndarray): Nodal displacements with shape (2 * n_nodes, n_cases), in the same
+                order as the forces, and nodal-averaged stress and strain with shape (n_nodes, 3, n_cases).
+
+        Raises:
+            ValueError: If the stiffness matrix has not been factorized or the forces do not match the number of nodes.
+        """
+        if self.solver is None:
+            raise ValueError('The stiffness matrix must be factorized first, call factorize_stiffness_matrix or run_analysis')
+
+        self.state.begin_run()
+        self.prepare_solver(**self.solver_options_used)
+
+        num_nodes = len(self.geometry.nodes)
+        nodal_forces = np.asarray(nodal_forces, dtype=float)
+        if nodal_forces.ndim == 1:
+            nodal_forces = nodal_forces[:, None]
+        if nodal_forces.shape[0] != 2 * num_nodes:
+            raise ValueError(f'nodal_forces must have {2 * num_nodes} rows, one per nodal degree of freedom')
+
+        # Map between the nodal order and the global free dofs
+        nodal_dofs = self.geometry.get_nodal_global_indices().ravel()
+        free = nodal_dofs != -1
+
+        forces = np.zeros((self.geometry.count_global_free_dofs(), nodal_forces.shape[1]))
+        forces[nodal_dofs[free]] = nodal_forces[free]
+
+        displacements = np.asarray(self.solver.solve(forces)).reshape(forces.shape)
+
+        nodal_displacements = np.zeros_like(nodal_forces)
+        nodal_displacements[free] = displacements[nodal_dofs[free]]
+
+        # Recover the stress and strain of all cases at once and average them at the nodes
+        num_elements = len(self.geometry.elements)
+        num_cases = nodal_forces.shape[1]
+        elements_nodal_stress = np.zeros((num_elements, self.geometry.store.nodes_per_element, 3, num_cases))
+        elements_nodal_strain = np.zeros_like(elements_nodal_stress)
+
+        elements = self.geometry.elements
+        for (element_type, _), indices in self.geometry.group_elements().items():
+            node_indices = self.geometry.get_element_node_indices(indices)
+            elem_dofs = np.stack([2 * node_indices, 2 * node_indices + 1], axis=-1).reshape(len(indices), -1)
+
+            coordinates = self.geometry.get_element_coordinates(indices)
+            elastic_matrix = elements[indices[0]].material.get_elastic_matrix(True)
+            stress_gp, strain_gp = element_type.compute_block_stress_strain(coordinates, nodal_displacements[elem_dofs], elastic_matrix, stress_strain_intgr_type,
+                                                                            self.get_cached_b_matrices(element_type, indices, stress_strain_intgr_type))
+
+            extrapolation_matrix = elements[indices[0]].get_reference_element(stress_strain_intgr_type).extrapolation_matrix
+            elements_nodal_stress[indices, :node_indices.shape[1]] = np.einsum('ng,eg...->en...', extrapolation_matrix, stress_gp)
+            elements_nodal_strain[indices, :node_indices.shape[1]] = np.einsum('ng,eg...->en...', extrapolation_matrix, strain_gp)
+
+        valence = self.geometry.compute_nodal_valence()
+        nodal_stress = self.geometry.average_element_nodal_values(elements_nodal_stress, valence)
+        nodal_strain = self.geometry.average_element_nodal_values(elements_nodal_strain, valence)
+
+        return nodal_displacements, nodal_stress, nodal_strain
+
     def compute_elements_stress_strain(self, stress_strain_intgr_type: str):
-        """Computes stress and strain for elements."""
-        for element in self.geometry.elements:
-            # Compute the stress and strain at the gauss points
-            element.compute_stress_strain(self.global_displacement_vector, stress_strain_intgr_type)
-            element.extrapolate_stress_strain_gp_to_nodes(stress_strain_intgr_type)
-
-    def average_nodal_stress_strain(self):
-        """Averages nodal stress and strain."""
-        for node in self.geometry.nodes:
-            node.stress_avg = np.zeros(3)
-            node.strain_avg = np.zeros(3)
-
-            # Loop over each stress and strain that has the format [[elem_label, (nparray) strain], ...]
-            for i in range(len(node.stress)):
-                # Print all elements contributing to the node stress
-                # print(f'Node {node.label} stress from element {node.stress[i][0]}: {node.stress[i][1]}')
-                node.stress_avg += node.stress[i][1]
-
-            for i in range(len(node.strain)):
-                # Print all elements contributing to the node strain
-                # print(f'Node {node.label} strain from element {node.strain[i][0]}: {node.strain[i][1]}')
-                node.strain_avg += node.strain[i][1]
-
-            node.stress_avg /= len(node.stress)
-            node.strain_avg /= len(node.strain)
-
-    def show_results(self, scale_factor: Optional[float] = 1.0, results_dir: Optional[str] = 'figs'):
-        visualization = Visualizer(self.geometry.nodes, self.geometry.elements, results_dir)
+        """
+        Computes stress and strain for elements and extrapolates them to the nodes of each element.
+
+        The element displacements are gathered from the global displacement vector at once, and elements sharing the
+        same type and material are computed as a block by the element type kernel, reusing the B matrices of the
+        stiffness pass when they are cached. With parallel execution the blocks are computed chunk by chunk on the
+        pool of the executor instead. Element types without a block kernel are computed one by one. The extrapolated
+        values are stored in elements_nodal_stress and elements_nodal_strain.
+
+        Args:
+            stress_strain_intgr_type (str): Type of numerical integration.
+        """
+        elements = self.geometry.elements
+
+        shape = (len(elements), self.geometry.store.nodes_per_element, 3)
+        self.elements_nodal_stress = self.state.get_buffer('elements_nodal_stress', shape)
+        self.elements_nodal_strain = self.state.get_buffer('elements_nodal_strain', shape)
+
+        elements_displacements = self.gather_elements_displacements()
+
+        for (element_type, _), indices in self.geometry.group_elements().items():
+            first_element = elements[indices[0]]
+            coordinates = self.geometry.get_element_coordinates(indices)
+            num_nodes = coordinates.shape[1]
+            group_displacements = elements_displacements[indices, :2 * num_nodes]
+            elastic_matrix = first_element.material.get_elastic_matrix(True)
+            extrapolation_matrix = first_element.get_reference_element(stress_strain_intgr_type).extrapolation_matrix
+
+            if self.executor is not None:
+                try:
+                    outputs = self.executor.map_chunks('recovery', stress_strain_kernel, len(indices),
+                                                       {'coordinates': coordinates, 'displacements': group_displacements},
+                                                       {'stress': (num_nodes, 3), 'strain': (num_nodes, 3)},
+                                                       (element_type, elastic_matrix, stress_strain_intgr_type, extrapolation_matrix))
+                    self.elements_nodal_stress[indices, :num_nodes] = outputs['stress']
+                    self.elements_nodal_strain[indices, :num_nodes] = outputs['strain']
+                    continue
+                except NotImplementedError:
+                    pass
+
+            try:
+                block_stress, block_strain = element_type.compute_block_stress_strain(coordinates, group_displacements, elastic_matrix, stress_strain_intgr_type,
+                                                                                      self.get_cached_b_matrices(element_type, indices, stress_strain_intgr_type))
+            except NotImplementedError:
+                for i in indices:
+                    elements[i].compute_stress_strain(self.global_displacement_vector, stress_strain_intgr_type)
+                    self.elements_nodal_stress[i, :num_nodes], self.elements_nodal_strain[i, :num_nodes] = elements[i].extrapolate_stress_strain_gp_to_nodes(stress_strain_intgr_type)
+            else:
+                # Extrapolate the stress and strain from the gauss points to the nodes
+                self.elements_nodal_stress[indices, :num_nodes] = np.einsum('ng,egc->enc', extrapolation_matrix, block_stress)
+                self.elements_nodal_strain[indices, :num_nodes] = np.einsum('ng,egc->enc', extrapolation_matrix, block_strain)
+
+    def gather_elements_displacements(self) -> np.ndarray:
+        """
+        Gathers the displacements of all elements at once from the global displacement vector.
+
+        Returns:
+            np.ndarray: Element displacements with shape (n_elem, n_dofs), zero for constrained dofs and for the padding
+                of elements with fewer nodes than the others.
+        """
+        elem_dofs = self.geometry.get_element_dofs(np.arange(len(self.geometry.elements)))
+        return np.where(elem_dofs == -1, 0., self.global_displacement_vector[elem_dofs])
+
+    def compute_gauss_point_stress_strain(self, stress_strain_intgr_type: str) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Computes the stress and strain at the Gauss points of all elements.
+
+        The elements may have different numbers of Gauss points, so the values of all elements are concatenated and
+        the points of element e are the rows offsets[e]:offsets[e + 1], in the order of the recovery points.
+
+        Args:
+            stress_strain_intgr_type (str): Type of numerical integration.
+
+        Returns:
+            (np.ndarray, np.ndarray, np.ndarray): Stress and strain with shape (n_points, 3), and offsets of the points of
+                each element with shape (n_elem + 1,).
+        """
+        elements = self.geometry.elements
+        offsets = self.compute_gauss_point_offsets(stress_strain_intgr_type)
+
+        stress = np.zeros((offsets[-1], 3))
+        strain = np.zeros((offsets[-1], 3))
+        elements_displacements = self.gather_elements_displacements()
+
+        for (element_type, _), indices in self.geometry.group_elements().items():
+            first_element = elements[indices[0]]
+            coordinates = self.geometry.get_element_coordinates(indices)
+            try:
+                block_stress, block_strain = element_type.compute_block_stress_strain(coordinates, elements_displacements[indices, :2 * coordinates.shape[1]],
+                                                                                      first_element.material.get_elastic_matrix(True), stress_strain_intgr_type,
+                                                                                      self.get_cached_b_matrices(element_type, indices, stress_strain_intgr_type))
+            except NotImplementedError:
+                for i in indices:
+                    elements[i].compute_stress_strain(self.global_displacement_vector, stress_strain_intgr_type)
+                    stress[offsets[i]:offsets[i + 1]] = elements[i].stress_gp
+                    strain[offsets[i]:offsets[i + 1]] = elements[i].strain_gp
+            else:
+                # The elements of a group have the same number of points
+                rows = (offsets[indices][:, None] + np.arange(block_stress.shape[1])).ravel()
+                stress[rows] = block_stress.reshape(-1, 3)
+                strain[rows] = block_strain.reshape(-1, 3)
+
+        return stress, strain, offsets
+
+    def compute_gauss_point_offsets(self, stress_strain_intgr_type: str) -> np.ndarray:
+        """Returns the offsets of the Gauss points of each element with shape (n_elem + 1,), see compute_gauss_point_stress_strain."""
+        elements = self.geometry.elements
+        num_points = np.zeros(len(elements), dtype=np.int64)
+        for indices in self.geometry.group_elements().values():
+            num_points[indices] = len(elements[indices[0]].get_reference_element(stress_strain_intgr_type).ordered_point_indices)
+        return np.concatenate(([0], np.cumsum(num_points)))
+
+    def compute_gauss_point_coordinates(self, stress_strain_intgr_type: str) -> np.ndarray:
+        """
+        Computes the coordinates of the Gauss points of all elements, in the order of compute_gauss_point_stress_strain.
+
+        Args:
+            stress_strain_intgr_type (str): Type of numerical integration.
+
+        Returns:
+            np.ndarray: Coordinates with shape (n_points, 2).
+        """
+        elements = self.geometry.elements
+        offsets = self.compute_gauss_point_offsets(stress_strain_intgr_type)
+        coordinates = np.zeros((offsets[-1], 2))
+
+        for indices in self.geometry.group_elements().values():
+            reference = elements[indices[0]].get_reference_element(stress_strain_intgr_type)
+            shape_functions = reference.shape_functions[reference.ordered_point_indices]
+            block_coordinates = np.einsum('gn,end->egd', shape_functions, self.geometry.get_element_coordinates(indices))
+
+            rows = (offsets[indices][:, None] + np.arange(block_coordinates.shape[1])).ravel()
+            coordinates[rows] = block_coordinates.reshape(-1, 2)
+
+        return coordinates
+
+    def export_vtk(self, path: str, chunk_rows: Optional[int] = None, store: Optional[ResultsStore] = None, store_path: Optional[str] = None) -> List[str]:
+        """
+        Writes the mesh and the results of the last analysis to binary VTU files for external viewers.
+
+        The VTU files are streamed from the memory-mapped arrays of a results store, a chunk of rows at a time, so the
+        export itself does not hold the results in memory. Without a store, the results are first written to one, in
+        store_path or in a temporary directory next to the VTU files that is removed afterwards. Writing the store
+        computes the Gauss point arrays once, like write_results, so pass the store of write_results to avoid it.
+
+        Args:
+            path (str): Path of the mesh file, the Gauss points are written next to it, see VtkExporter.
+
+            chunk_rows (Optional[int]): Number of rows written at a time.
+
+            store (Optional[ResultsStore]): Store of the last analysis to export, see write_results.
+
+            store_path (Optional[str]): Directory the store is written to and kept in when no store is given.
+
+        Returns:
+            List[str]: Paths of the written files.
+        """
+        if store is not None:
+            return VtkExporter.write_store(store, path, chunk_rows)
+
+        if store_path is not None:
+            return VtkExporter.write_store(self.write_results(store_path), path, chunk_rows)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix='results_store_', dir=directory) as temporary_path:
+            store = self.write_results(temporary_path)
+            paths = VtkExporter.write_store(store, path, chunk_rows)
+            # The memory maps are released before the files are removed
+            del store
+        return paths
+
+    def write_results(self, path: str, metadata: Optional[dict] = None) -> ResultsStore:
+        """
+        Writes the mesh and the results of the last analysis to a binary results store.
+
+        Args:
+            path (str): Directory of the store.
+
+            metadata (Optional[dict]): Additional JSON serializable metadata.
+
+        Returns:
+            ResultsStore: The written store, opened with memory-mapped arrays.
+        """
+        return ResultsStore.write(self, path, metadata)
+
+    def average_nodal_stress_strain(self, keep_element_nodal_values: bool = False):
+        """
+        Averages nodal stress and strain.
+
+        The element-nodal values are scatter-added onto the nodes and divided by the number of elements of each node.
+        The averages are stored in the mesh store and read through Node.stress_avg and Node.strain_avg.
+
+        Args:
+            keep_element_nodal_values (bool): Keeps elements_nodal_stress and elements_nodal_strain, otherwise they are
+                only kept as buffers of the analysis state for the next analysis.
+        """
+        shape = (len(self.geometry.nodes), 3)
+        valence = self.geometry.compute_nodal_valence()
+        color_groups = self.get_element_color_groups() if self.colored_scatter else None
+
+        store = self.geometry.store
+        store.nodal_stress = self.geometry.average_element_nodal_values(self.elements_nodal_stress, valence, self.state.get_buffer('nodal_stress', shape), color_groups, self.executor)
+        store.nodal_strain = self.geometry.average_element_nodal_values(self.elements_nodal_strain, valence, self.state.get_buffer('nodal_strain', shape), color_groups, self.executor)
+
+        if not keep_element_nodal_values:
+            self.elements_nodal_stress = None
+            self.elements_nodal_strain = None
+
+    def show_results(self, scale_factor: Optional[float] = 1.0, results_dir: Optional[str] = 'figs', headless: bool = False, num_workers: Optional[int] = None,
+                     max_contour_triangles: Optional[int] = Visualizer.MAX_CONTOUR_TRIANGLES, mesh_overlay: str = 'auto'):
+        """
+        Saves the figures of the results and shows them one by one.
+
+        Args:
+            scale_factor (Optional[float]): Scale of the displacements in the deformed figures.
+
+            results_dir (Optional[str]): Directory the figures are saved to.
+
+            headless (bool): Only saves the figures, with the non-interactive backend and the nodal fields rendered in
+                parallel worker processes, see Visualizer.export_figures.
+
+            num_workers (Optional[int]): Number of worker processes of the headless export, the number of CPUs when None.
+
+            max_contour_triangles (Optional[int]): Number of triangles above which the nodal fields are resampled onto
+                a raster grid instead of contoured, None always contours them.
+
+            mesh_overlay (str): Mesh drawn over the nodal fields ('auto', 'full', 'outline' or 'none').
+        """
+        if headless:
+            Visualizer(self.geometry, results_dir, False, max_contour_triangles, mesh_overlay).export_figures(self.global_displacement_vector, scale_factor, num_workers)
+            return
+
+        visualization = Visualizer(self.geometry, results_dir, True, max_contour_triangles, mesh_overlay)
 
         visualization.visualize_undeformed_geometry()
         visualization.visualize_deformed_geometry(self.global_displacement_vector, scale_factor, add_nodal_forces=True)
@@ -0,0 +1,71 @@
+import time
+import numpy as np
+
+
+class Solver(object):
+    """
+    Represents a linear solver for the global system of equations.
+
+    This is an abstract class. The system is solved in two stages, factorize and solve, so a factorization can be reused
+    for several right-hand sides.
+
+    Attributes:
+        timings (dict): Wall-clock time in seconds spent in each stage of the last factorization and solution.
+
+        num_dofs (int): Number of equations of the factorized system.
+    """
+
+    def __init__(self):
+        """Initializes a Solver object."""
+        self.timings = {'factorize': 0.0, 'solve': 0.0}
+        self.num_dofs = 0
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the solver."""
+        return 'Solver'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the solver."""
+        timings = ', '.join(f'{stage}: {elapsed:.6f} s' for stage, elapsed in self.timings.items())
+        return f'{self.name} ({timings})'
+
+    def factorize(self, matrix):
+        """
+        Factorizes the system matrix and records the time spent.
+
+        Args:
+            matrix (np.ndarray or scipy.sparse matrix): Symmetric positive definite system matrix.
+        """
+        start = time.perf_counter()
+        self.num_dofs = matrix.shape[0]
+        self._factorize(matrix)
+        self.timings['factorize'] = time.perf_counter() - start
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """
+        Solves the factorized system and records the time spent.
+
+        Args:
+            rhs (np.ndarray): Right-hand side with shape (n,) or (n, n_cases).
+
+        Returns:
+            np.ndarray: Solution with the same shape as the right-hand side.
+        """
+        start = time.perf_counter()
+        solution = self._solve(rhs)
+        self.timings['solve'] = time.perf_counter() - start
+        return solution
+
+    def factorize_and_solve(self, matrix, rhs: np.ndarray) -> np.ndarray:
+        """Factorizes the system matrix and solves for the given right-hand side."""
+        self.factorize(matrix)
+        return self.solve(rhs)
+
+    def _factorize(self, matrix):
+        """Factorizes the system matrix."""
+        raise NotImplementedError('Method _factorize not implemented')
+
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves the factorized system."""
+        raise NotImplementedError('Method _solve not implemented')
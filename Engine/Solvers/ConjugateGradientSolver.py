@@ -0,0 +1,138 @@
+from typing import Callable, List, Optional
+import numpy as np
+
+from Engine.Preconditioner import Preconditioner
+from Engine.Solver import Solver
+
+
+class ConjugateGradientSolver(Solver):
+    """
+    Represents a preconditioned conjugate gradient (PCG) solver for symmetric positive definite systems.
+
+    The factorize stage only builds the preconditioner, so the memory stays close to the one of the system matrix. The
+    system matrix may be any object supporting the @ operator, which allows matrix-free operators.
+
+    Attributes:
+        preconditioner (Optional[Preconditioner]): Preconditioner, None for plain conjugate gradient.
+
+        tolerance (float): Convergence tolerance on the residual norm relative to the norm of the right-hand side.
+
+        max_iterations (Optional[int]): Maximum number of iterations, defaults to the number of equations.
+
+        initial_guess (Optional[np.ndarray]): Starting point of the iterations (warm start), zero when None.
+
+        callback (Optional[Callable[[int, float], None]]): Called with the iteration number and the relative residual
+            norm after every iteration.
+
+        residual_history (List[float]): Relative residual norm at the start and after every iteration of the last solve.
+
+        iterations (int): Number of iterations of the last solve.
+    """
+
+    def __init__(self, preconditioner: Optional[Preconditioner] = None, tolerance: float = 1e-10, max_iterations: Optional[int] = None, initial_guess: Optional[np.ndarray] = None, callback: Optional[Callable[[int, float], None]] = None):
+        """
+        Initializes a ConjugateGradientSolver object.
+
+        Args:
+            preconditioner (Optional[Preconditioner]): Preconditioner, None for plain conjugate gradient.
+
+            tolerance (float): Convergence tolerance on the relative residual norm.
+
+            max_iterations (Optional[int]): Maximum number of iterations, defaults to the number of equations.
+
+            initial_guess (Optional[np.ndarray]): Starting point of the iterations (warm start), zero when None.
+
+            callback (Optional[Callable[[int, float], None]]): Called with the iteration number and the relative
+                residual norm after every iteration.
+        """
+        super().__init__()
+        self.preconditioner = preconditioner
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.initial_guess = initial_guess
+        self.callback = callback
+
+        self.residual_history: List[float] = []
+        self.iterations = 0
+        self._matrix = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the solver."""
+        if self.preconditioner is None:
+            return 'Conjugate Gradient Solver'
+        return f'Conjugate Gradient Solver with {self.preconditioner.name}'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the solver."""
+        return f'{super().__str__()}, {self.iterations} iterations'
+
+    def _factorize(self, matrix):
+        """Stores the system matrix and builds the preconditioner."""
+        self._matrix = matrix
+        if self.preconditioner is not None:
+            self.preconditioner.setup(matrix)
+
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves the system for each column of the right-hand side."""
+        rhs = np.asarray(rhs, dtype=float)
+        if rhs.ndim == 1:
+            return self._solve_vector(rhs)
+        return np.column_stack([self._solve_vector(rhs[:, i]) for i in range(rhs.shape[1])])
+
+    def _precondition(self, residual: np.ndarray) -> np.ndarray:
+        """Applies the preconditioner to a residual."""
+        if self.preconditioner is None:
+            return residual.copy()
+        return self.preconditioner.apply(residual)
+
+    def _solve_vector(self, rhs: np.ndarray) -> np.ndarray:
+        """
+        Runs the preconditioned conjugate gradient iterations for a single right-hand side.
+
+        Raises:
+            RuntimeError: If the tolerance is not reached within the maximum number of iterations.
+        """
+        max_iterations = self.max_iterations if self.max_iterations is not None else max(self.num_dofs, 1)
+
+        if self.initial_guess is not None and len(self.initial_guess) == len(rhs):
+            x = np.array(self.initial_guess, dtype=float)
+            residual = rhs - self._matrix @ x
+        else:
+            x = np.zeros_like(rhs)
+            residual = rhs.copy()
+
+        rhs_norm = np.linalg.norm(rhs)
+        if rhs_norm == 0.:
+            self.residual_history = [0.]
+            self.iterations = 0
+            return np.zeros_like(rhs)
+
+        self.residual_history = [np.linalg.norm(residual) / rhs_norm]
+        self.iterations = 0
+
+        preconditioned_residual = self._precondition(residual)
+        direction = preconditioned_residual.copy()
+        rz = residual @ preconditioned_residual
+
+        while self.residual_history[-1] > self.tolerance:
+            if self.iterations >= max_iterations:
+                raise RuntimeError(f'Conjugate gradient did not converge in {max_iterations} iterations (relative residual {self.residual_history[-1]:.3e})')
+
+            matrix_direction = self._matrix @ direction
+            alpha = rz / (direction @ matrix_direction)
+
+            x += alpha * direction
+            residual -= alpha * matrix_direction
+
+            self.iterations += 1
+            self.residual_history.append(np.linalg.norm(residual) / rhs_norm)
+            if self.callback is not None:
+                self.callback(self.iterations, self.residual_history[-1])
+
+            preconditioned_residual = self._precondition(residual)
+            rz_new = residual @ preconditioned_residual
+            direction = preconditioned_residual + (rz_new / rz) * direction
+            rz = rz_new
+
+        return x
@@ -0,0 +1,33 @@
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse import issparse
+
+from Engine.Solver import Solver
+
+
+class DenseSolver(Solver):
+    """
+    Represents a dense LAPACK solver (LU factorization with partial pivoting).
+
+    Meant for small models and debug runs, its cost grows with the cube of the number of equations.
+    """
+
+    def __init__(self):
+        """Initializes a DenseSolver object."""
+        super().__init__()
+        self._factorization = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the solver."""
+        return 'Dense LAPACK Solver'
+
+    def _factorize(self, matrix):
+        """Factorizes the system matrix, converting it to a dense array if needed."""
+        if issparse(matrix):
+            matrix = matrix.toarray()
+        self._factorization = lu_factor(matrix)
+
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves the factorized system."""
+        return lu_solve(self._factorization, rhs)
@@ -0,0 +1,57 @@
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu
+
+from Engine.Solver import Solver
+
+try:
+    from sksparse.cholmod import cholesky
+except ImportError:  # scikit-sparse is optional
+    cholesky = None
+
+
+class SparseCholeskySolver(Solver):
+    """
+    Represents a sparse direct solver for symmetric positive definite systems.
+
+    Uses the CHOLMOD Cholesky factorization when scikit-sparse is installed. Otherwise SuperLU is run in symmetric mode,
+    with a minimum degree ordering on the structure of K + K^T and no pivoting off the diagonal, which keeps the
+    factorization symmetric like a LDL^T decomposition.
+
+    Attributes:
+        column_ordering (str): SuperLU column ordering, 'NATURAL' keeps the numbering of the matrix, e.g. when the dofs
+            were already renumbered to reduce the fill-in.
+    """
+
+    def __init__(self, column_ordering: str = 'MMD_AT_PLUS_A'):
+        """
+        Initializes a SparseCholeskySolver object.
+
+        Args:
+            column_ordering (str): SuperLU column ordering ('MMD_AT_PLUS_A', 'MMD_ATA', 'COLAMD' or 'NATURAL').
+        """
+        super().__init__()
+        self.column_ordering = column_ordering
+        self._factorization = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the solver."""
+        if cholesky is not None:
+            return 'Sparse Cholesky Solver (CHOLMOD)'
+        return 'Sparse Cholesky Solver (SuperLU symmetric mode)'
+
+    def _factorize(self, matrix):
+        """Factorizes the system matrix."""
+        matrix = csc_matrix(matrix)
+        if cholesky is not None:
+            self._factorization = cholesky(matrix, ordering_method='natural' if self.column_ordering == 'NATURAL' else 'default')
+        else:
+            self._factorization = splu(matrix, permc_spec=self.column_ordering, diag_pivot_thresh=0., options=dict(SymmetricMode=True))
+
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves the factorized system."""
+        rhs = np.asarray(rhs, dtype=float)
+        if cholesky is not None:
+            return self._factorization(rhs)
+        return self._factorization.solve(rhs)
@@ -0,0 +1,41 @@
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu
+
+from Engine.Solver import Solver
+
+
+class SparseLUSolver(Solver):
+    """
+    Represents a sparse direct solver based on the SuperLU factorization with COLAMD column ordering.
+
+    It does not rely on the symmetry of the system, so it is the most robust of the sparse backends.
+
+    Attributes:
+        column_ordering (str): SuperLU column ordering, 'NATURAL' keeps the numbering of the matrix, e.g. when the dofs
+            were already renumbered to reduce the fill-in.
+    """
+
+    def __init__(self, column_ordering: str = 'COLAMD'):
+        """
+        Initializes a SparseLUSolver object.
+
+        Args:
+            column_ordering (str): SuperLU column ordering ('COLAMD', 'MMD_AT_PLUS_A', 'MMD_ATA' or 'NATURAL').
+        """
+        super().__init__()
+        self.column_ordering = column_ordering
+        self._factorization = None
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the solver."""
+        return 'Sparse LU Solver'
+
+    def _factorize(self, matrix):
+        """Factorizes the system matrix."""
+        self._factorization = splu(csc_matrix(matrix), permc_spec=self.column_ordering)
+
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Solves the factorized system."""
+        return self._factorization.solve(np.asarray(rhs, dtype=float))
@@ -0,0 +1,246 @@
+import multiprocessing
+from typing import List
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+
+from Engine.Solver import Solver
+from Engine.Solvers.SparseCholeskySolver import SparseCholeskySolver
+
+
+class Subdomain(object):
+    """
+    Represents the interior of a subdomain: its factorized stiffness matrix and its coupling to the interface.
+
+    Attributes:
+        coupling_matrix (csr_matrix): Coupling K_ib between the interior dofs and the interface dofs of the subdomain.
+
+        solver (SparseCholeskySolver): Factorization of the interior stiffness matrix K_ii.
+
+        SCHUR_BLOCK_COLUMNS (int): Number of interface columns solved at a time for the Schur contribution.
+    """
+
+    SCHUR_BLOCK_COLUMNS = 64
+
+    def __init__(self, interior_matrix: csr_matrix, coupling_matrix: csr_matrix):
+        """
+        Initializes a Subdomain object and factorizes its interior stiffness matrix.
+
+        Args:
+            interior_matrix (csr_matrix): Stiffness matrix K_ii of the interior dofs.
+
+            coupling_matrix (csr_matrix): Coupling K_ib between the interior dofs and the interface dofs.
+        """
+        self.coupling_matrix = coupling_matrix
+        self.solver = SparseCholeskySolver()
+        self.solver.factorize(interior_matrix)
+
+    def compute_schur_contribution(self) -> coo_matrix:
+        """
+        Returns K_bi K_ii^-1 K_ib, the part of the interface matrix condensed out of the subdomain.
+
+        The interface columns are solved SCHUR_BLOCK_COLUMNS at a time, so the dense right-hand sides and solutions
+        never exceed n_interior x SCHUR_BLOCK_COLUMNS, and the contribution is accumulated block by block.
+        """
+        num_interface_dofs = self.coupling_matrix.shape[1]
+        coupling_columns = self.coupling_matrix.tocsc()
+        transposed_coupling = self.coupling_matrix.T.tocsr()
+
+        rows, columns, values = [], [], []
+        for start in range(0, num_interface_dofs, self.SCHUR_BLOCK_COLUMNS):
+            stop = min(start + self.SCHUR_BLOCK_COLUMNS, num_interface_dofs)
+            block = transposed_coupling @ self.solver.solve(coupling_columns[:, start:stop].toarray())
+            block_rows, block_columns = np.nonzero(block)
+            rows.append(block_rows)
+            columns.append(block_columns + start)
+            values.append(block[block_rows, block_columns])
+
+        if not rows:
+            return coo_matrix((num_interface_dofs, num_interface_dofs))
+        return coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))), shape=(num_interface_dofs, num_interface_dofs))
+
+    def condense(self, interior_rhs: np.ndarray) -> np.ndarray:
+        """Returns K_bi K_ii^-1 f_i, the part of the interface right-hand side condensed out of the subdomain."""
+        return self.coupling_matrix.T @ self.solver.solve(interior_rhs)
+
+    def back_substitute(self, interior_rhs: np.ndarray, interface_solution: np.ndarray) -> np.ndarray:
+        """Returns the interior solution K_ii^-1 (f_i - K_ib u_b) for the solution on the interface."""
+        return self.solver.solve(interior_rhs - self.coupling_matrix @ interface_solution)
+
+
+def run_subdomain_worker(connection):
+    """
+    Serves a subdomain in a worker process, so its factorization stays in the memory of the worker.
+
+    The first message holds the arguments of Subdomain, the next ones a method name and its arguments. The result, or
+    the raised exception, is sent back. None stops the worker.
+    """
+    subdomain = None
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+
+        try:
+            if subdomain is None:
+                subdomain = Subdomain(*message)
+                result = subdomain.compute_schur_contribution()
+            else:
+                method, arguments = message
+                result = getattr(subdomain, method)(*arguments)
+        except Exception as error:
+            result = error
+        connection.send(result)
+
+    connection.close()
+
+
+class SubstructuringSolver(Solver):
+    """
+    Represents a domain decomposition solver that condenses the subdomains onto the interface (Schur complement).
+
+    The dofs are split into the interiors of the subdomains and the interface between them. Interiors of different
+    subdomains are not coupled, so each one is factorized on its own, in a worker process with the 'process' backend.
+    The factorize stage assembles the interface matrix S = K_bb - sum K_bi K_ii^-1 K_ib and factorizes it with the sparse
+    Cholesky solver. Each subdomain only couples the interface dofs it touches, so S is kept sparse and its size grows
+    with the sum of the squared local interface sizes rather than with the square of the whole interface. The solve
+    stage condenses the right-hand side, solves the interface system and back-substitutes in each subdomain, so a new
+    load case reuses the factorizations of the subdomains and of the interface.
+
+    Attributes:
+        dof_labels (np.ndarray): Subdomain of each dof, -1 for the interface dofs.
+
+        backend (str): Where the subdomains are factorized ('process' for one worker process per subdomain or 'serial').
+
+        interface_dofs (np.ndarray): Indices of the interface dofs.
+
+        interior_dofs (List[np.ndarray]): Indices of the interior dofs of each subdomain.
+
+        interface_solver (SparseCholeskySolver): Factorization of the interface matrix.
+    """
+
+    def __init__(self, dof_labels: np.ndarray, backend: str = 'process'):
+        """
+        Initializes a SubstructuringSolver object.
+
+        Args:
+            dof_labels (np.ndarray): Subdomain of each dof, -1 for the interface dofs. Dofs of different subdomains
+                must not be coupled.
+
+            backend (str): Where the subdomains are factorized ('process' or 'serial').
+
+        Raises:
+            ValueError: If the backend is not supported.
+        """
+        super().__init__()
+        self.dof_labels = np.asarray(dof_labels)
+        self.backend = backend
+
+        self.interface_dofs = np.flatnonzero(self.dof_labels == -1)
+        self.interior_dofs: List[np.ndarray] = [dofs for dofs in (np.flatnonzero(self.dof_labels == label) for label in range(self.dof_labels.max() + 1)) if len(dofs)]
+        self.interface_solver = SparseCholeskySolver()
+
+        self._local_interface_dofs: List[np.ndarray] = []
+        self._subdomains: List[Subdomain] = []
+        self._workers: list = []
+
+        if backend not in ('process', 'serial'):
+            raise ValueError('backend must be either "process" or "serial"')
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the solver."""
+        return f'Substructuring Solver ({len(self.interior_dofs)} subdomains, {len(self.interface_dofs)} interface dofs)'
+
+    def __del__(self):
+        """Stops the worker processes."""
+        self.close()
+
+    def close(self):
+        """Stops the worker processes, the solver must be factorized again before the next solve."""
+        for process, connection in self._workers:
+            try:
+                connection.send(None)
+                connection.close()
+            except (OSError, ValueError):
+                pass
+            process.join()
+        self._workers = []
+        self._subdomains = []
+
+    def _call_subdomains(self, method: str, arguments: List[tuple]) -> list:
+        """Calls a method of every subdomain, concurrently on the workers with the 'process' backend."""
+        if self.backend == 'serial':
+            return [getattr(subdomain, method)(*subdomain_arguments) for subdomain, subdomain_arguments in zip(self._subdomains, arguments)]
+
+        for (_, connection), subdomain_arguments in zip(self._workers, arguments):
+            connection.send((method, subdomain_arguments))
+        return self._receive_results()
+
+    def _receive_results(self) -> list:
+        """Receives the result of every worker, raising the first exception."""
+        results = [connection.recv() for _, connection in self._workers]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _factorize(self, matrix):
+        """Factorizes the subdomains and the interface matrix."""
+        self.close()
+
+        matrix = csr_matrix(matrix)
+        interface_columns = matrix[:, self.interface_dofs].tocsr()
+
+        subdomain_matrices = []
+        self._local_interface_dofs = []
+        for interior_dofs in self.interior_dofs:
+            # Only the interface dofs coupled to the subdomain
+            coupling_matrix = interface_columns[interior_dofs]
+            local_interface_dofs = np.unique(coupling_matrix.indices)
+            self._local_interface_dofs.append(local_interface_dofs)
+            subdomain_matrices.append((matrix[interior_dofs][:, interior_dofs], coupling_matrix[:, local_interface_dofs]))
+
+        if self.backend == 'serial':
+            self._subdomains = [Subdomain(*arguments) for arguments in subdomain_matrices]
+            contributions = [subdomain.compute_schur_contribution() for subdomain in self._subdomains]
+        else:
+            for arguments in subdomain_matrices:
+                connection, worker_connection = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=run_subdomain_worker, args=(worker_connection,), daemon=True)
+                process.start()
+                worker_connection.close()
+                connection.send(arguments)
+                self._workers.append((process, connection))
+            contributions = self._receive_results()
+
+        # The contributions are scattered to the interface numbering and summed with K_bb as COO triplets
+        interface_matrix = interface_columns[self.interface_dofs].tocoo()
+        rows, columns, values = [interface_matrix.row], [interface_matrix.col], [interface_matrix.data]
+        for local_interface_dofs, contribution in zip(self._local_interface_dofs, contributions):
+            rows.append(local_interface_dofs[contribution.row])
+            columns.append(local_interface_dofs[contribution.col])
+            values.append(-contribution.data)
+        num_interface_dofs = len(self.interface_dofs)
+        interface_matrix = coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))), shape=(num_interface_dofs, num_interface_dofs)).tocsr()
+
+        if len(self.interface_dofs):
+            self.interface_solver.factorize(interface_matrix)
+
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        """Condenses the right-hand side, solves the interface system and back-substitutes in the subdomains."""
+        rhs = np.asarray(rhs, dtype=float)
+        interior_rhs = [rhs[interior_dofs] for interior_dofs in self.interior_dofs]
+
+        interface_rhs = rhs[self.interface_dofs].copy()
+        for local_interface_dofs, condensed_rhs in zip(self._local_interface_dofs, self._call_subdomains('condense', [(subdomain_rhs,) for subdomain_rhs in interior_rhs])):
+            interface_rhs[local_interface_dofs] -= condensed_rhs
+
+        interface_solution = self.interface_solver.solve(interface_rhs) if len(self.interface_dofs) else interface_rhs
+
+        solution = np.empty_like(rhs)
+        solution[self.interface_dofs] = interface_solution
+        arguments = [(subdomain_rhs, interface_solution[local_interface_dofs]) for subdomain_rhs, local_interface_dofs in zip(interior_rhs, self._local_interface_dofs)]
+        for interior_dofs, interior_solution in zip(self.interior_dofs, self._call_subdomains('back_substitute', arguments)):
+            solution[interior_dofs] = interior_solution
+
+        return solution
@@ -0,0 +1,202 @@
+from typing import Optional
+import numpy as np
+
+
+class SpatialIndex(object):
+    """
+    Represents a uniform grid hash over the nodal coordinates, used to select nodes by position.
+
+    The nodes are sorted by the linear index of the grid cell they fall in, so the nodes of a column of cells are a
+    contiguous slice found with a binary search. Queries only look at the cells that overlap the searched region and
+    compare coordinates with a tolerance instead of exact float equality.
+
+    Attributes:
+        coordinates (np.ndarray): Nodal coordinates with shape (n_nodes, 2).
+
+        tolerance (float): Default distance under which a coordinate matches the searched one.
+
+        cell_size (float): Size of the square cells of the grid.
+
+        RELATIVE_TOLERANCE (float): Default tolerance relative to the largest side of the bounding box of the nodes.
+    """
+
+    RELATIVE_TOLERANCE = 1e-9
+
+    def __init__(self, coordinates: np.ndarray, tolerance: Optional[float] = None, cell_size: Optional[float] = None):
+        """
+        Initializes a SpatialIndex object.
+
+        Args:
+            coordinates (np.ndarray): Nodal coordinates with shape (n_nodes, 2).
+
+            tolerance (Optional[float]): Default matching tolerance, RELATIVE_TOLERANCE times the largest side of the
+                bounding box when None.
+
+            cell_size (Optional[float]): Size of the cells, chosen to hold about one node each when None.
+        """
+        self.coordinates = np.asarray(coordinates, dtype=float)
+
+        num_nodes = len(self.coordinates)
+        self._lower = self.coordinates.min(axis=0) if num_nodes else np.zeros(2)
+        extent = (self.coordinates.max(axis=0) - self._lower) if num_nodes else np.zeros(2)
+        largest_side = max(float(extent.max()), 1.)
+
+        self.tolerance = self.RELATIVE_TOLERANCE * largest_side if tolerance is None else tolerance
+        if cell_size is None:
+            # About one node per cell, without degenerating for nodes on a line
+            cell_size = max(np.sqrt(extent[0] * extent[1] / max(num_nodes, 1)), largest_side / max(num_nodes, 1))
+        self.cell_size = cell_size
+
+        self._num_cells = np.maximum(np.floor(extent / self.cell_size).astype(int) + 1, 1)
+
+        cell_keys = self._cell_keys(self._cells(self.coordinates))
+        self._order = np.argsort(cell_keys, kind='stable')
+        self._sorted_keys = cell_keys[self._order]
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the spatial index."""
+        return 'SpatialIndex'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the spatial index."""
+        return f'{self.name} with {len(self.coordinates)} nodes in a {self._num_cells[0]}x{self._num_cells[1]} grid'
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        """Returns the (i, j) cells of points, clipped to the grid."""
+        cells = np.clip((points - self._lower) / self.cell_size, 0, self._num_cells - 1)
+        return np.floor(cells).astype(int)
+
+    def _cell_keys(self, cells: np.ndarray) -> np.ndarray:
+        """Returns the linear keys of (i, j) cells."""
+        return cells[..., 0] * self._num_cells[1] + cells[..., 1]
+
+    def _candidates(self, x_min: float, y_min: float, x_max: float, y_max: float) -> np.ndarray:
+        """Returns the nodes in the cells that overlap a box."""
+        first_cell, last_cell = self._cells(np.array([[x_min, y_min], [x_max, y_max]]))
+
+        # The cells of a column are consecutive keys, so each column of the box is one slice of the sorted nodes
+        columns = np.arange(first_cell[0], last_cell[0] + 1)
+        starts = np.searchsorted(self._sorted_keys, columns * self._num_cells[1] + first_cell[1])
+        ends = np.searchsorted(self._sorted_keys, columns * self._num_cells[1] + last_cell[1] + 1)
+
+        lengths = ends - starts
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        return self._order[offsets + np.arange(lengths.sum())]
+
+    def select_box(self, x_min: float, y_min: float, x_max: float, y_max: float, tolerance: Optional[float] = None) -> np.ndarray:
+        """
+        Selects the nodes inside a box, borders included.
+
+        Args:
+            x_min (float): Lower x-coordinate of the box.
+
+            y_min (float): Lower y-coordinate of the box.
+
+            x_max (float): Upper x-coordinate of the box.
+
+            y_max (float): Upper y-coordinate of the box.
+
+            tolerance (Optional[float]): Distance by which the box is enlarged, the default tolerance when None.
+
+        Returns:
+            np.ndarray: Sorted indices (label - 1) of the selected nodes.
+        """
+        tolerance = self.tolerance if tolerance is None else tolerance
+        x_min, y_min, x_max, y_max = x_min - tolerance, y_min - tolerance, x_max + tolerance, y_max + tolerance
+
+        candidates = self._candidates(x_min, y_min, x_max, y_max)
+        points = self.coordinates[candidates]
+        inside = (points[:, 0] >= x_min) & (points[:, 0] <= x_max) & (points[:, 1] >= y_min) & (points[:, 1] <= y_max)
+
+        return np.sort(candidates[inside])
+
+    def select_point(self, x: float, y: float, tolerance: Optional[float] = None) -> np.ndarray:
+        """
+        Selects the nodes that lie on a point.
+
+        Args:
+            x (float): X-coordinate of the point.
+
+            y (float): Y-coordinate of the point.
+
+            tolerance (Optional[float]): Largest distance to the point, the default tolerance when None.
+
+        Returns:
+            np.ndarray: Sorted indices (label - 1) of the selected nodes, usually a single one.
+        """
+        tolerance = self.tolerance if tolerance is None else tolerance
+
+        candidates = self.select_box(x, y, x, y, tolerance)
+        distances = np.hypot(self.coordinates[candidates, 0] - x, self.coordinates[candidates, 1] - y)
+
+        return candidates[distances <= tolerance]
+
+    def select_line(self, x: Optional[float] = None, y: Optional[float] = None, tolerance: Optional[float] = None) -> np.ndarray:
+        """
+        Selects the nodes on a vertical line x = c, a horizontal line y = c or, when both are given, on a point.
+
+        Args:
+            x (Optional[float]): X-coordinate of a vertical line, any x when None.
+
+            y (Optional[float]): Y-coordinate of a horizontal line, any y when None.
+
+            tolerance (Optional[float]): Largest distance to the line, the default tolerance when None.
+
+        Returns:
+            np.ndarray: Sorted indices (label - 1) of the selected nodes.
+        """
+        if x is not None and y is not None:
+            return self.select_point(x, y, tolerance)
+
+        x_min, x_max = (-np.inf, np.inf) if x is None else (x, x)
+        y_min, y_max = (-np.inf, np.inf) if y is None else (y, y)
+        return self.select_box(x_min, y_min, x_max, y_max, tolerance)
+
+    def select_position(self, position: dict, tolerance: Optional[float] = None) -> np.ndarray:
+        """
+        Selects the nodes of a position given in the format of the example files, {'x': x or None, 'y': y or None}.
+
+        Args:
+            position (dict): Position where a missing or None coordinate means any value.
+
+            tolerance (Optional[float]): Matching tolerance, the default tolerance when None.
+
+        Returns:
+            np.ndarray: Sorted indices (label - 1) of the selected nodes.
+        """
+        return self.select_line(position.get('x'), position.get('y'), tolerance)
+
+    def nearest_node(self, x: float, y: float) -> int:
+        """
+        Finds the node nearest to a point.
+
+        The search box grows from the cell of the point until it holds a node, then it is widened to the distance of
+        that node, which bounds the distance of the nearest one.
+
+        Args:
+            x (float): X-coordinate of the point.
+
+            y (float): Y-coordinate of the point.
+
+        Returns:
+            int: Index (label - 1) of the nearest node.
+
+        Raises:
+            ValueError: If the index is empty.
+        """
+        if len(self.coordinates) == 0:
+            raise ValueError('The spatial index has no nodes')
+
+        radius = self.cell_size
+        candidates = self.select_box(x - radius, y - radius, x + radius, y + radius, 0.)
+        while len(candidates) == 0:
+            radius *= 2
+            candidates = self.select_box(x - radius, y - radius, x + radius, y + radius, 0.)
+
+        distances = np.hypot(self.coordinates[candidates, 0] - x, self.coordinates[candidates, 1] - y)
+        radius = distances.min()
+        candidates = self.select_box(x - radius, y - radius, x + radius, y + radius, 0.)
+
+        distances = np.hypot(self.coordinates[candidates, 0] - x, self.coordinates[candidates, 1] - y)
+        return int(candidates[np.argmin(distances)])
@@ -0,0 +1,135 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+import numpy as np
+
+
+class StiffnessCache(object):
+    """
+    Represents a bounded cache of element stiffness matrices keyed by the geometric signature of the elements.
+
+    The signature of an element is its nodal coordinates relative to its first node, rounded to the tolerance, so the
+    translated copies of a shape, like the elements of a uniform BeamMeshGenerator mesh, share one entry. The matrices
+    of translated copies are equal up to round-off, so elements that hit the cache get the matrix of the first copy
+    instead of being integrated. The least recently used entries are dropped when the cache is full. Groups whose
+    fraction of distinct signatures exceeds MAX_DISTINCT_FRACTION, like graded or distorted meshes, would gain little
+    from the lookups, so they are integrated as a whole without touching the entries.
+
+    Attributes:
+        max_entries (int): Largest number of kept entries.
+
+        tolerance (Optional[float]): Distance under which coordinates are considered equal, RELATIVE_TOLERANCE times
+            the largest relative coordinate of each lookup when None.
+
+        hits (int): Number of elements whose matrices were taken from the cache or from an identical element.
+
+        misses (int): Number of elements that were integrated.
+
+        RELATIVE_TOLERANCE (float): Default tolerance relative to the size of the elements.
+
+        MAX_DISTINCT_FRACTION (float): Fraction of distinct signatures in a group above which the cache is bypassed.
+    """
+
+    RELATIVE_TOLERANCE = 1e-9
+    MAX_DISTINCT_FRACTION = 0.5
+
+    def __init__(self, max_entries: int = 4096, tolerance: Optional[float] = None):
+        """
+        Initializes a StiffnessCache object.
+
+        Args:
+            max_entries (int): Largest number of kept entries.
+
+            tolerance (Optional[float]): Distance under which coordinates are considered equal, relative to the size
+                of the elements when None.
+        """
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the cache."""
+        return 'StiffnessCache'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the cache."""
+        return f'{self.name} with {len(self)} entries ({self.hits} hits, {self.misses} misses)'
+
+    def __len__(self) -> int:
+        """Returns the number of kept entries."""
+        return len(self._entries)
+
+    def clear(self):
+        """Drops every entry and resets the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def compute_signatures(self, coordinates: np.ndarray) -> np.ndarray:
+        """
+        Computes the translation-normalized signatures of a group of elements.
+
+        Args:
+            coordinates (np.ndarray): Nodal coordinates with shape (n_elem, n_nodes, 2).
+
+        Returns:
+            np.ndarray: Integer signatures with shape (n_elem, 2 * n_nodes).
+        """
+        relative_coordinates = coordinates - coordinates[:, :1]
+
+        tolerance = self.tolerance
+        if tolerance is None:
+            tolerance = self.RELATIVE_TOLERANCE * max(float(np.abs(relative_coordinates).max(initial=0.)), 1e-300)
+
+        return np.round(relative_coordinates / tolerance).astype(np.int64).reshape(len(coordinates), -1)
+
+    def get_matrices(self, key: Hashable, coordinates: np.ndarray, compute: Callable[[np.ndarray], Tuple[np.ndarray, Optional[np.ndarray]]]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Returns the stiffness and B matrices of a group of elements, integrating only the signatures not yet cached.
+
+        Args:
+            key (Hashable): Everything but the geometry the matrices depend on: element type, material and integration
+                rule.
+
+            coordinates (np.ndarray): Nodal coordinates with shape (n_elem, n_nodes, 2).
+
+            compute (Callable[[np.ndarray], Tuple[np.ndarray, Optional[np.ndarray]]]): Computes the stiffness matrices
+                and the B matrices, or None, of elements given by their coordinates.
+
+        Returns:
+            Tuple[np.ndarray, Optional[np.ndarray]]: Stiffness matrices with shape (n_elem, n_dofs, n_dofs) and B
+                matrices, None if they are not known for every element.
+        """
+        signatures = self.compute_signatures(coordinates)
+        unique_signatures, first_elements, inverse = np.unique(signatures, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+
+        if len(unique_signatures) > self.MAX_DISTINCT_FRACTION * len(coordinates):
+            self.misses += len(coordinates)
+            return compute(coordinates)
+
+        entry_keys = [(key, signature.tobytes()) for signature in unique_signatures]
+        entries = [self._entries.get(entry_key) for entry_key in entry_keys]
+
+        missing = [position for position, entry in enumerate(entries) if entry is None]
+        if missing:
+            # The copies are integrated at the coordinates of their first element
+            stiffness_matrices, b_matrices = compute(coordinates[first_elements[missing]])
+            for i, position in enumerate(missing):
+                entries[position] = (stiffness_matrices[i].copy(), None if b_matrices is None else b_matrices[i].copy())
+
+        for entry_key, entry in zip(entry_keys, entries):
+            self._entries[entry_key] = entry
+            self._entries.move_to_end(entry_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        self.misses += len(missing)
+        self.hits += len(coordinates) - len(missing)
+
+        stiffness_matrices = np.array([stiffness_matrix for stiffness_matrix, _ in entries])[inverse]
+        if any(b_matrices is None for _, b_matrices in entries):
+            return stiffness_matrices, None
+        return stiffness_matrices, np.array([b_matrices for _, b_matrices in entries])[inverse]
@@ -0,0 +1,286 @@
+import json
+import os
+import time
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+
+
+class ResultsStore(object):
+    """
+    Represents the results of an analysis persisted to disk, read back with memory-mapped arrays.
+
+    A store is a directory holding a JSON header and one raw NumPy array file per result:
+
+        header.json: {'format': 'fem-results', 'version': FORMAT_VERSION, 'metadata': {...},
+                      'arrays': {name: {'file': '<name>.npy', 'dtype': str, 'shape': [int, ...]}}}
+
+        <name>.npy: The array in the .npy format, a short text header followed by the raw C-ordered data, so it can be
+            memory-mapped without reading it.
+
+    The arrays written from a Runner are:
+
+        coordinates (n_nodes, 2), connectivity (n_elem, n_nodes_elem), element_types (n_elem,),
+        element_materials (n_elem,), constraints (n_nodes, 2), loads (n_nodes, 2), global_indices (n_nodes, 2),
+        global_displacement_vector (2 * n_nodes,), nodal_displacements (n_nodes, 2), gauss_point_stress (n_points, 3),
+        gauss_point_strain (n_points, 3), gauss_point_coordinates (n_points, 2), gauss_point_offsets (n_elem + 1,), nodal_stress (n_nodes, 3),
+        nodal_strain (n_nodes, 3), and elements_nodal_stress and elements_nodal_strain (n_elem, n_nodes_elem, 3)
+        when they were kept.
+
+    The global_displacement_vector has two entries per node: the free dofs first, at their global indices, then zeros
+    for the constrained dofs. The global_indices are -1 for the constrained dofs, so nodal_displacements is the one
+    to read per node.
+
+    The Gauss points of element e are the rows gauss_point_offsets[e]:gauss_point_offsets[e + 1]. When the elements have
+    different numbers of nodes, the rows of connectivity, elements_nodal_stress and elements_nodal_strain are padded
+    with -1 and zeros up to the largest one. The element_types and
+    element_materials codes index the 'element_types' and 'materials' lists of the metadata.
+
+    Attributes:
+        path (str): Directory of the store.
+
+        header (dict): Contents of header.json.
+
+        mmap_mode (Optional[str]): Memory-map mode of the arrays ('r', 'r+', 'c'), None loads them in memory.
+
+        FORMAT_VERSION (int): Version of the layout.
+
+        HEADER_FILE (str): Name of the header file.
+
+        CHUNK_ROWS (int): Number of rows processed at a time by the chunked operations.
+    """
+
+    FORMAT_VERSION = 1
+    HEADER_FILE = 'header.json'
+    CHUNK_ROWS = 1 << 20
+
+    def __init__(self, path: str, mmap_mode: Optional[str] = 'r'):
+        """
+        Opens a ResultsStore.
+
+        Args:
+            path (str): Directory of the store.
+
+            mmap_mode (Optional[str]): Memory-map mode of the arrays, None loads them in memory.
+
+        Raises:
+            ValueError: If the directory does not hold a results store.
+        """
+        self.path = path
+        self.mmap_mode = mmap_mode
+
+        with open(os.path.join(path, self.HEADER_FILE), 'r') as file:
+            self.header = json.load(file)
+        if self.header.get('format') != 'fem-results':
+            raise ValueError(f'{path} is not a results store')
+
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the store."""
+        return 'ResultsStore'
+
+    def __str__(self) -> str:
+        """Returns a string representation of the store."""
+        return f'{self.name} at {self.path} with arrays {self.names}'
+
+    @property
+    def metadata(self) -> dict:
+        """Returns the metadata of the run."""
+        return self.header['metadata']
+
+    @property
+    def names(self) -> List[str]:
+        """Returns the names of the stored arrays."""
+        return list(self.header['arrays'])
+
+    def __contains__(self, name: str) -> bool:
+        """Checks if an array is stored."""
+        return name in self.header['arrays']
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Returns a stored array, memory-mapped unless the store was opened with mmap_mode None."""
+        if name not in self._arrays:
+            if name not in self:
+                raise KeyError(f'No array {name} in {self.path}')
+            self._arrays[name] = np.load(os.path.join(self.path, self.header['arrays'][name]['file']), mmap_mode=self.mmap_mode)
+        return self._arrays[name]
+
+    def iterate_chunks(self, name: str, chunk_rows: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Iterates over the rows of a stored array in chunks, so only one chunk is read in memory at a time.
+
+        Args:
+            name (str): Name of the array.
+
+            chunk_rows (Optional[int]): Number of rows per chunk, CHUNK_ROWS when None.
+
+        Yields:
+            np.ndarray: Consecutive chunks of rows.
+        """
+        array = self[name]
+        chunk_rows = chunk_rows or self.CHUNK_ROWS
+        for start in range(0, max(len(array), 1), chunk_rows):
+            yield np.asarray(array[start:start + chunk_rows])
+
+    def compare(self, other: 'ResultsStore', names: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Compares the arrays of two stores chunk by chunk.
+
+        Args:
+            other (ResultsStore): Store to compare with.
+
+            names (Optional[List[str]]): Arrays to compare, the floating point arrays stored in both when None.
+
+        Returns:
+            Dict[str, float]: Largest absolute difference of each array, inf when the shapes differ.
+        """
+        if names is None:
+            names = [name for name in self.names if name in other and np.issubdtype(np.dtype(self.header['arrays'][name]['dtype']), np.floating)]
+
+        differences = {}
+        for name in names:
+            if self[name].shape != other[name].shape:
+                differences[name] = np.inf
+                continue
+
+            difference = 0.
+            for chunk, other_chunk in zip(self.iterate_chunks(name), other.iterate_chunks(name)):
+                if chunk.size:
+                    difference = max(difference, float(np.abs(chunk - other_chunk).max()))
+            differences[name] = difference
+
+        return differences
+
+    @classmethod
+    def write_arrays(cls, path: str, arrays: Dict[str, np.ndarray], metadata: dict) -> 'ResultsStore':
+        """
+        Writes arrays and metadata to a store, overwriting a previous store in the same directory.
+
+        Args:
+            path (str): Directory of the store, created if needed.
+
+            arrays (Dict[str, np.ndarray]): Arrays by name.
+
+            metadata (dict): JSON serializable metadata.
+
+        Returns:
+            ResultsStore: The written store.
+        """
+        os.makedirs(path, exist_ok=True)
+
+        # The header is removed first and written last, so an interrupted write leaves no valid header behind
+        header_path = os.path.join(path, cls.HEADER_FILE)
+        if os.path.exists(header_path):
+            os.remove(header_path)
+
+        header = {'format': 'fem-results', 'version': cls.FORMAT_VERSION, 'metadata': metadata, 'arrays': {}}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            file_name = f'{name}.npy'
+            np.save(os.path.join(path, file_name), array)
+            header['arrays'][name] = {'file': file_name, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+
+        with open(header_path, 'w') as file:
+            json.dump(header, file, indent=2, default=cls._to_json)
+
+        return cls(path)
+
+    @staticmethod
+    def _to_json(value):
+        """Converts the NumPy values of the metadata to JSON types, and anything else to its string."""
+        if isinstance(value, (np.generic, np.ndarray)):
+            return value.tolist()
+        return str(value)
+
+    @classmethod
+    def write(cls, runner, path: str, metadata: Optional[dict] = None) -> 'ResultsStore':
+        """
+        Writes the mesh and the results of the last analysis of a Runner.
+
+        Args:
+            runner (Runner): Runner after run_analysis.
+
+            path (str): Directory of the store.
+
+            metadata (Optional[dict]): Additional JSON serializable metadata.
+
+        Returns:
+            ResultsStore: The written store.
+
+        Raises:
+            ValueError: If the runner has no results.
+        """
+        return cls.write_arrays(path, *cls.collect(runner, metadata))
+
+    @staticmethod
+    def collect(runner, metadata: Optional[dict] = None) -> (Dict[str, np.ndarray], dict):
+        """
+        Collects the arrays and the metadata of the last analysis of a Runner, as they are written to a store.
+
+        Args:
+            runner (Runner): Runner after run_analysis.
+
+            metadata (Optional[dict]): Additional JSON serializable metadata.
+
+        Returns:
+            (Dict[str, np.ndarray], dict): Arrays by name and metadata of the run.
+
+        Raises:
+            ValueError: If the runner has no results.
+        """
+        if runner.global_displacement_vector is None or runner.geometry.store.nodal_stress is None:
+            raise ValueError('The runner has no results, run the analysis first')
+
+        geometry = runner.geometry
+        store = geometry.store
+        elements = geometry.elements
+        stress_strain_intgr_type = runner.analysis_options.get('stress_strain_intgr_type', 'full')
+
+        # The codes are filled group by group, so the element views are not created
+        groups = geometry.group_elements()
+        element_types = list(dict.fromkeys(element_type for element_type, _ in groups))
+        material_elements = {material_id: elements[indices[0]] for (_, material_id), indices in groups.items()}
+        materials = list(material_elements.values())
+
+        element_type_codes = np.zeros(len(elements), dtype=np.int32)
+        element_material_codes = np.zeros(len(elements), dtype=np.int32)
+        for (element_type, material_id), indices in groups.items():
+            element_type_codes[indices] = element_types.index(element_type)
+            element_material_codes[indices] = list(material_elements).index(material_id)
+
+        gauss_point_stress, gauss_point_strain, gauss_point_offsets = runner.compute_gauss_point_stress_strain(stress_strain_intgr_type)
+
+        arrays = {'coordinates': store.coordinates,
+                  'connectivity': store.connectivity,
+                  'element_types': element_type_codes,
+                  'element_materials': element_material_codes,
+                  'constraints': store.constraints,
+                  'loads': store.loads,
+                  'global_indices': geometry.get_nodal_global_indices(),
+                  'global_displacement_vector': runner.global_displacement_vector,
+                  'nodal_displacements': runner.get_nodal_displacements(),
+                  'gauss_point_stress': gauss_point_stress,
+                  'gauss_point_strain': gauss_point_strain,
+                  'gauss_point_coordinates': runner.compute_gauss_point_coordinates(stress_strain_intgr_type),
+                  'gauss_point_offsets': gauss_point_offsets,
+                  'nodal_stress': store.nodal_stress,
+                  'nodal_strain': store.nodal_strain}
+        if runner.elements_nodal_stress is not None:
+            arrays['elements_nodal_stress'] = runner.elements_nodal_stress
+            arrays['elements_nodal_strain'] = runner.elements_nodal_strain
+
+        run_metadata = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                        'num_nodes': store.num_nodes,
+                        'num_elements': len(elements),
+                        'num_free_dofs': geometry.count_global_free_dofs(),
+                        'element_types': [element_type.__name__ for element_type in element_types],
+                        'materials': [{'name': element.material.name,
+                                       'elastic_matrix': element.material.get_elastic_matrix(True).tolist(),
+                                       'thickness': element.get_thickness()} for element in materials],
+                        'analysis_options': runner.analysis_options,
+                        'solver': None if runner.solver is None else {'name': runner.solver.name, 'timings': runner.solver.timings},
+                        'renumbering': runner.renumbering_report,
+                        'user': metadata or {}}
+
+        return arrays, run_metadata
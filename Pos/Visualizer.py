@@ -1,35 +1,164 @@
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.tri as tri
+from matplotlib.collections import LineCollection, PolyCollection
+import numpy as np
 import os
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from Engine.Element import Element
-from Engine.Node import Node
+from Engine.Geometry import Geometry
+from Engine.MeshStore import MeshStore
+from Engine.MeshViews import ElementViews, NodeViews
 
 
 class Visualizer:
     """
     A class to visualize the finite element analysis results.
 
+    The mesh is drawn as a single collection built from the connectivity arrays and the nodes as one scatter per
+    constraint class, so the number of matplotlib artists does not grow with the size of the mesh. The arrays are read
+    from the mesh store, without creating the node and element views.
+
     Attributes:
-        nodes (List[Node]): List of nodes in the finite element model.
+        nodes (NodeViews): Lazy node views of the finite element model.
+
+        elements (ElementViews): Lazy element views of the finite element model.
 
-        elements (List[Element]): List of elements in the finite element model.
+        store (MeshStore): Mesh store of the finite element model, read for the loads and the nodal stress and strain.
 
         results_dir (str): Directory to save the results.
 
         base_dir (str): Base directory to save the results.
 
+        interactive (bool): Shows each figure with plt.show() after saving it, otherwise the figure is closed.
+
+        coordinates (np.ndarray): Nodal coordinates with shape (n_nodes, 2), indexed by label - 1.
+
+        connectivity (Dict[int, np.ndarray]): Node indices (label - 1) of the elements, by number of nodes per element.
+
+        constraints (np.ndarray): Constraint flags of the nodes with shape (n_nodes, 2).
+
+        global_indices (np.ndarray): Global indices of the nodal dofs with shape (n_nodes, 2), -1 when constrained.
+
+        max_contour_triangles (Optional[int]): Number of triangles above which the nodal fields are resampled onto a
+            raster grid sized to the axes in pixels instead of contoured, None always contours them.
+
+        mesh_overlay (str): Mesh drawn over the nodal fields ('full' for every element edge, 'outline' for the boundary
+            of the mesh only, 'none', or 'auto' for the outline when the field is resampled and every edge otherwise).
+
+        NODE_LABELS_MAX_NODES (int): Largest number of nodes for which the node labels are drawn.
+
+        CONSTRAINT_CLASSES (List[tuple]): Marker color and legend label of the free, x, y and x & y constrained nodes.
+
+        MAX_CONTOUR_TRIANGLES (int): Default of max_contour_triangles.
+
     """
 
-    def __init__(self, nodes: List[Node], elements: List[Element], results_dir: str):
+    NODE_LABELS_MAX_NODES = 200
+    MAX_CONTOUR_TRIANGLES = 200000
+
+    # Indexed by constrained x + 2 * constrained y
+    CONSTRAINT_CLASSES = [('b', 'Free'), ('r', 'Constrained (x)'), ('g', 'Constrained (y)'), ('m', 'Constrained (x & y)')]
+
+    def __init__(self, geometry: Geometry, results_dir: str, interactive: bool = True,
+                 max_contour_triangles: Optional[int] = MAX_CONTOUR_TRIANGLES, mesh_overlay: str = 'auto'):
         """Initializes the Visualizer."""
-        self.nodes = nodes
-        self.elements = elements
+        self.nodes = geometry.nodes
+        self.elements = geometry.elements
+        self.store = geometry.store
 
         self.base_dir = 'results'
         self.results_dir = results_dir
+        self.interactive = interactive
+
+        if mesh_overlay not in ('auto', 'full', 'outline', 'none'):
+            raise ValueError('mesh_overlay must be "auto", "full", "outline" or "none"')
+        self.max_contour_triangles = max_contour_triangles
+        self.mesh_overlay = mesh_overlay
+
+        self.coordinates = self.store.coordinates.copy()
+        self.constraints = self.store.constraints.copy()
+        self.global_indices = geometry.get_nodal_global_indices()
+
+        element_num_nodes = self.store.element_num_nodes
+        self.connectivity: Dict[int, np.ndarray] = {}
+        for num_nodes in dict.fromkeys(element_num_nodes.tolist()):
+            self.connectivity[num_nodes] = self.store.connectivity[element_num_nodes == num_nodes, :num_nodes]
+
+    def __getstate__(self) -> dict:
+        """Returns the state sent to the export workers, the arrays without the views and the mesh store."""
+        state = self.__dict__.copy()
+        state['nodes'] = []
+        state['elements'] = []
+        state['store'] = None
+        return state
+
+    def show(self):
+        """Shows the current figure when interactive, otherwise closes it."""
+        if self.interactive:
+            plt.show()
+        else:
+            plt.close()
+
+    def get_triangulation(self, coordinates: np.ndarray) -> tri.Triangulation:
+        """Returns the triangulation of all elements at the given nodal coordinates."""
+        return tri.Triangulation(coordinates[:, 0], coordinates[:, 1], self.connectivity_to_tris())
+
+    def get_nodal_displacements(self, displacements) -> np.ndarray:
+        """Returns the displacements of the nodes with shape (n_nodes, 2), zero for the constrained dofs."""
+        displacements = np.asarray(displacements, dtype=float).ravel()
+        return np.where(self.global_indices != -1, displacements[self.global_indices], 0.)
+
+    def get_displaced_coordinates(self, displacements, scale_factor: Optional[float] = 1.0) -> np.ndarray:
+        """Returns the nodal coordinates moved by the scaled displacements, constrained dofs do not move."""
+        if displacements is None:
+            return self.coordinates
+
+        return self.coordinates + scale_factor * self.get_nodal_displacements(displacements)
+
+    def get_element_polygons(self, coordinates: np.ndarray):
+        """Returns the outline of each element, its nodes in order, as an array or a list of arrays for mixed meshes."""
+        if len(self.connectivity) == 1:
+            return coordinates[next(iter(self.connectivity.values()))]
+        return [polygon for connectivity in self.connectivity.values() for polygon in coordinates[connectivity]]
+
+    def get_boundary_edges(self) -> np.ndarray:
+        """Returns the node indices (label - 1) of the element edges that belong to a single element, the outline of the mesh."""
+        edges = np.concatenate([np.stack([connectivity, np.roll(connectivity, -1, axis=1)], axis=2).reshape(-1, 2)
+                                for connectivity in self.connectivity.values()])
+        unique_edges, counts = np.unique(np.sort(edges, axis=1), axis=0, return_counts=True)
+        return unique_edges[counts == 1]
+
+    def plot_mesh_and_nodes(self, ax, coordinates: np.ndarray, label_offset: float) -> List[bool]:
+        """
+        Draws the element edges as one collection, the nodes as one scatter per constraint class and, for small
+        meshes, the node labels.
+
+        Returns:
+            List[bool]: Whether each constraint class of CONSTRAINT_CLASSES was drawn.
+        """
+        ax.add_collection(PolyCollection(self.get_element_polygons(coordinates), facecolors='none', edgecolors='b', linewidths=1))
+        ax.autoscale_view()
+
+        classes = self.constraints[:, 0] + 2 * self.constraints[:, 1]
+        drawn = []
+        for constraint_class, (color, _) in enumerate(self.CONSTRAINT_CLASSES):
+            selected = classes == constraint_class
+            if np.any(selected):
+                ax.scatter(coordinates[selected, 0], coordinates[selected, 1], s=100, c=color, zorder=5)
+            drawn.append(bool(np.any(selected)))
+
+        if len(self.coordinates) <= self.NODE_LABELS_MAX_NODES:
+            for index, (x, y) in enumerate(coordinates):
+                ax.text(x + label_offset,
+                        y + label_offset,
+                        f'{index + 1}',
+                        fontsize=10,
+                        color='black')
+
+        return drawn
 
     def create_undeformed_geometry(self):
         """Create a plot of the undeformed geometry."""
@@ -37,36 +166,7 @@ class Visualizer:
 
         ax = fig.gca()
 
-        label_offset = 0.4
-
-        constrained_x_added = False
-        constrained_y_added = False
-        constrained_both_added = False
-
-        for node in self.nodes:
-            if node.is_constrained_x() and node.is_constrained_y():
-                ax.plot(node.x, node.y, 'mo', markersize=10, zorder=5)
-                constrained_both_added = True
-            elif node.is_constrained_x():
-                ax.plot(node.x, node.y, 'ro', markersize=10, zorder=5)
-                constrained_x_added = True
-            elif node.is_constrained_y():
-                ax.plot(node.x, node.y, 'go', markersize=10, zorder=5)
-                constrained_y_added = True
-            else:
-                ax.plot(node.x, node.y, 'bo', markersize=10, zorder=5)
-
-            ax.text(node.x + label_offset,
-                    node.y + label_offset,
-                    f'{node.label}',  # Change 'Node' to your desired label
-                    fontsize=10,  # Adjust font size as needed
-                    color='black')  # Adjust color as needed
-
-        for element in self.elements:
-            for i in range(len(element.nodes)):
-                node1 = element.nodes[i]
-                node2 = element.nodes[(i + 1) % len(element.nodes)]  # Connect last node with first node
-                plt.plot([node1.x, node2.x], [node1.y, node2.y], 'b-', linewidth=1)
+        _, constrained_x_added, constrained_y_added, constrained_both_added = self.plot_mesh_and_nodes(ax, self.coordinates, label_offset=0.4)
 
         ax.set_xlabel('X-axis')
         ax.set_ylabel('Y-axis')
@@ -85,37 +185,8 @@ class Visualizer:
 
         ax = fig.gca()
 
-        label_offset = 0.6
-
-        constrained_x_added = False
-        constrained_y_added = False
-        constrained_both_added = False
-
-        for node in self.nodes:
-            if node.is_constrained_x() and node.is_constrained_y():
-                ax.plot(node.x + scale_factor * displacements[node.global_index_x], node.y + scale_factor * displacements[node.global_index_y], 'mo', markersize=10, label=node.label, zorder=5)
-                constrained_both_added = True
-            elif node.is_constrained_x():
-                ax.plot(node.x + scale_factor * displacements[node.global_index_x], node.y + scale_factor * displacements[node.global_index_y], 'ro', markersize=10, label=node.label, zorder=5)
-                constrained_x_added = True
-            elif node.is_constrained_y():
-                ax.plot(node.x + scale_factor * displacements[node.global_index_x], node.y + scale_factor * displacements[node.global_index_y], 'go', markersize=10, label=node.label, zorder=5)
-                constrained_y_added = True
-            else:
-                ax.plot(node.x + scale_factor * displacements[node.global_index_x], node.y + scale_factor * displacements[node.global_index_y], 'bo', markersize=10, label=node.label, zorder=5)
-
-            ax.text(node.x + label_offset + scale_factor * displacements[node.global_index_x],
-                    node.y + label_offset + scale_factor * displacements[node.global_index_y],
-                    f'{node.label}',  # Change 'Node' to your desired label
-                    fontsize=10,  # Adjust font size as needed
-                    color='black')  # Adjust color as needed
-
-        for element in self.elements:
-            for i in range(len(element.nodes)):
-                node1 = element.nodes[i]
-                node2 = element.nodes[(i + 1) % len(element.nodes)]  # Connect last node with first node
-                plt.plot([node1.x + scale_factor * displacements[node1.global_index_x], node2.x + scale_factor * displacements[node2.global_index_x]],
-                         [node1.y + scale_factor * displacements[node1.global_index_y], node2.y + scale_factor * displacements[node2.global_index_y]], 'b-', linewidth=1)
+        coordinates = self.get_displaced_coordinates(displacements, scale_factor)
+        _, constrained_x_added, constrained_y_added, constrained_both_added = self.plot_mesh_and_nodes(ax, coordinates, label_offset=0.6)
 
         ax.set_xlabel('X-axis')
         ax.set_ylabel('Y-axis')
@@ -149,14 +220,16 @@ class Visualizer:
         ax = fig.gca()
 
         # Calculate the minimum element size or any other criterion
-        min_element_size = min(element.max_size() for element in self.elements)  # Example calculation of the minimum element size
+        min_element_size = min(np.ptp(self.coordinates[connectivity], axis=1).max(axis=1).min() for connectivity in self.connectivity.values())
 
         # Define a fraction of the element size to scale down the forces
         force_scaling_factor = min_element_size * 0.5  # Adjust the fraction as needed
 
-        for node in self.nodes:
-            force_x = node.x_load
-            force_y = node.y_load
+        coordinates = self.get_displaced_coordinates(displacements, scale_factor)
+
+        loads = self.store.loads
+        for index in np.flatnonzero(np.any(loads != 0, axis=1)):
+            force_x, force_y = loads[index]
 
             # Scale down the forces if they exceed the specified fraction of the element size
             if abs(force_x) > force_scaling_factor or abs(force_y) > force_scaling_factor:
@@ -170,8 +243,8 @@ class Visualizer:
                 scaled_force_x = force_x * scaling_factor
                 scaled_force_y = force_y * scaling_factor
 
-                ax.arrow(node.x + scale_factor * displacements[node.global_index_x] - scaled_force_x,
-                         node.y + scale_factor * displacements[node.global_index_y] - scaled_force_y,
+                ax.arrow(coordinates[index, 0] - scaled_force_x,
+                         coordinates[index, 1] - scaled_force_y,
                          scaled_force_x,
                          scaled_force_y,
                          color='purple', width=0.3, head_width=1, length_includes_head=True, zorder=10)
@@ -188,7 +261,8 @@ class Visualizer:
 
         # # Define the table data and headers
         headers = ['Node', 'X Displacement', 'Y Displacement']
-        table_data = [[f'Node {node.label}', f'{displacements[node.global_index_x]:.6f}', f'{displacements[node.global_index_y]:.6f}'] for node in self.nodes]
+        nodal_displacements = self.get_nodal_displacements(displacements)
+        table_data = [[f'Node {index + 1}', f'{displacement_x:.6f}', f'{displacement_y:.6f}'] for index, (displacement_x, displacement_y) in enumerate(nodal_displacements)]
 
         # Create the table and add it to the figure
         table = ax.table(cellText=table_data, colLabels=headers, loc='center', cellLoc='center', colLoc='center')
@@ -209,7 +283,7 @@ class Visualizer:
 
         self.save_fig('undeformed')
 
-        plt.show()
+        self.show()
 
     def visualize_deformed_geometry(self, displacements: List[float], scale_factor: float, add_nodal_forces: Optional[bool] = False):
         """Visualize the deformed geometry."""
@@ -219,22 +293,22 @@ class Visualizer:
 
         self.save_fig('deformed')
 
-        plt.show()
+        self.show()
 
     def visualize_disp_table(self, displacements):
         """Visualize a table of the nodal displacements."""
         self.create_displacement_table(displacements)
-        plt.show()
+        self.show()
 
     def visualize_displacement(self, displacements, direction: str = 'x', scale_factor: Optional[float] = 1.0):
         """Visualize a color map of the nodal displacement."""
 
         if direction == 'x':
             title = 'Displacement in x direction'
-            displacement_dir = [displacements[node.global_index_x] if node.global_index_x != -1 else 0 for node in self.nodes]
+            displacement_dir = self.get_nodal_displacements(displacements)[:, 0]
         elif direction == 'y':
             title = 'Displacement in y direction'
-            displacement_dir = [displacements[node.global_index_y] if node.global_index_y != -1 else 0 for node in self.nodes]
+            displacement_dir = self.get_nodal_displacements(displacements)[:, 1]
         else:
             raise ValueError("Invalid direction. Choose from 'x' or 'y'.")
 
@@ -245,13 +319,13 @@ class Visualizer:
 
         # Extract the specified stress component
         if stress_component == 'xx':
-            stress = [node.stress_avg[0] for node in self.nodes]
+            stress = self.store.nodal_stress[:, 0]
             title = 'Stress xx'
         elif stress_component == 'yy':
-            stress = [node.stress_avg[1] for node in self.nodes]
+            stress = self.store.nodal_stress[:, 1]
             title = 'Stress yy'
         elif stress_component == 'xy':
-            stress = [node.stress_avg[2] for node in self.nodes]
+            stress = self.store.nodal_stress[:, 2]
             title = 'Stress xy'
         else:
             raise ValueError("Invalid stress component. Choose from 'xx', 'yy', or 'xy'.")
@@ -263,42 +337,29 @@ class Visualizer:
 
         # Extract the specified strain component
         if strain_component == 'xx':
-            strain = [node.strain_avg[0] for node in self.nodes]
+            strain = self.store.nodal_strain[:, 0]
             title = 'Strain xx'
         elif strain_component == 'yy':
-            strain = [node.strain_avg[1] for node in self.nodes]
+            strain = self.store.nodal_strain[:, 1]
             title = 'Strain yy'
         elif strain_component == 'xy':
-            strain = [node.strain_avg[2] for node in self.nodes]
+            strain = self.store.nodal_strain[:, 2]
             title = 'Strain xy'
         else:
             raise ValueError("Invalid strain component. Choose from 'xx', 'yy', or 'xy'.")
 
         self.visualize_nodal_field(strain, 'Strain', title, displacements, scale_factor)
 
-    def visualize_nodal_field(self, field: [], field_name: str, title: str, displacements: List[float] = None, scale_factor: Optional[float] = 1.0):
-        """Visualize a color map of a field."""
+    def visualize_nodal_field(self, field: [], field_name: str, title: str, displacements: List[float] = None, scale_factor: Optional[float] = 1.0, triangulation: Optional[tri.Triangulation] = None):
+        """Visualize a color map of a field, on the given triangulation of the displaced nodes if any."""
 
         # Create new plot
         _, ax = plt.subplots(figsize=(12, 9))
 
-        x = [node.x + scale_factor * displacements[node.global_index_x] for node in self.nodes]
-        y = [node.y + scale_factor * displacements[node.global_index_y] for node in self.nodes]
-
-        elem_nodes_map = [[] for _ in self.elements]
-
-        for i, elem in enumerate(self.elements):
-            for node in elem.nodes:
-                elem_nodes_map[i].append(node.label - 1)
-
-        # convert all elements into triangles
-        elements_all_tris = self.shapes_to_tris(elem_nodes_map)
-
-        # create an unstructured triangular grid instance
-        triangulation = tri.Triangulation(x, y, elements_all_tris)
-
-        # plot the finite element mesh
-        self.plot_fem_mesh(x, y, elem_nodes_map)
+        if triangulation is None:
+            # create an unstructured triangular grid instance, with all elements converted into triangles
+            triangulation = self.get_triangulation(self.get_displaced_coordinates(displacements, scale_factor))
+        coordinates = np.column_stack([triangulation.x, triangulation.y])
 
         # Choose one of the following color maps:
         # 'Accent', 'Accent_r', 'Blues', 'Blues_r', 'BrBG', 'BrBG_r', 'BuGn', 'BuGn_r', 'BuPu', 'BuPu_r', 'CMRmap', 'CMRmap_r',
@@ -318,24 +379,35 @@ class Visualizer:
         # 'tab20c', 'tab20c_r', 'terrain', 'terrain_r', 'turbo', 'turbo_r', 'twilight', 'twilight_r', 'twilight_shifted',
         # 'twilight_shifted_r', 'viridis', 'viridis_r', 'winter', 'winter_r'
 
-        # plot the contours
-        plt.tricontourf(triangulation, field, cmap='jet', levels=40)
+        field = np.asarray(field, dtype=float)
+        resample = self.max_contour_triangles is not None and len(triangulation.triangles) > self.max_contour_triangles
 
         ax.set_title(title)
         ax.set_aspect('equal', adjustable='box')
 
-        # Plot elements grid
-        for element in self.elements:
-            for i in range(len(element.nodes)):
-                node1 = element.nodes[i]
-                node2 = element.nodes[(i + 1) % len(element.nodes)]  # Connect last node with first node
-                ax.plot([node1.x + scale_factor * displacements[node1.global_index_x], node2.x + scale_factor * displacements[node2.global_index_x]],
-                        [node1.y + scale_factor * displacements[node1.global_index_y], node2.y + scale_factor * displacements[node2.global_index_y]],
-                        '-', linewidth=0.1, color='black')
+        # plot the contours, or the field resampled to the resolution of the axes for very large meshes
+        if resample:
+            self.plot_resampled_field(ax, triangulation, field)
+        else:
+            plt.tricontourf(triangulation, field, cmap='jet', levels=40)
 
-        # Show max and min stress values
-        max_field = max(field)
-        min_field = min(field)
+        # plot the finite element mesh
+        mesh_overlay = self.mesh_overlay
+        if mesh_overlay == 'auto':
+            mesh_overlay = 'outline' if resample else 'full'
+        if mesh_overlay == 'full':
+            self.plot_fem_mesh(coordinates[:, 0], coordinates[:, 1], linewidth=0.1)
+        elif mesh_overlay == 'outline':
+            ax.add_collection(LineCollection(coordinates[self.get_boundary_edges()], colors='black', linewidths=0.5))
+
+        # Show max and min stress values, of the nodal field itself and not of its resampling
+        max_field = np.max(field)
+        min_field = np.min(field)
+
+        if resample:
+            # Mark where they are reached, since the raster may not show the peaks
+            ax.plot(*coordinates[np.argmax(field)], marker='^', color='black', markersize=8, linestyle='none')
+            ax.plot(*coordinates[np.argmin(field)], marker='v', color='black', markersize=8, linestyle='none')
 
         # Get plot size in figure coordinates
         x, y = ax.transAxes.inverted().transform((0, 0))
@@ -346,7 +418,159 @@ class Visualizer:
 
         self.save_fig(title)
 
-        plt.show()
+        self.show()
+
+    @staticmethod
+    def plot_resampled_field(ax, triangulation: tri.Triangulation, field: np.ndarray):
+        """
+        Draws a nodal field linearly interpolated onto a raster grid with one cell per pixel of the axes, so the cost
+        and the size of the figure do not depend on the number of triangles.
+
+        :param ax: axes to draw on, with its final size in the figure
+        :param triangulation: triangulation of the nodes
+        :param field: nodal values
+        :return: None
+        """
+        x_min, x_max = triangulation.x.min(), triangulation.x.max()
+        y_min, y_max = triangulation.y.min(), triangulation.y.max()
+        width = max(x_max - x_min, 1e-300)
+        height = max(y_max - y_min, 1e-300)
+
+        # The largest grid of the aspect of the mesh that fits in the axes
+        pixels = min(ax.bbox.width / width, ax.bbox.height / height)
+        num_x = max(int(np.ceil(width * pixels)), 2)
+        num_y = max(int(np.ceil(height * pixels)), 2)
+
+        raster = Visualizer.rasterize_field(triangulation, field, (x_min, x_max, y_min, y_max), (num_x, num_y))
+
+        image = ax.imshow(np.ma.masked_invalid(raster), cmap='jet', origin='lower', extent=(x_min, x_max, y_min, y_max),
+                          interpolation='nearest', vmin=np.min(field), vmax=np.max(field))
+        plt.sci(image)
+
+    @staticmethod
+    def rasterize_field(triangulation: tri.Triangulation, field: np.ndarray, extent: tuple, shape: tuple) -> np.ndarray:
+        """
+        Linearly interpolates a nodal field at the points of a regular grid, triangle by triangle.
+
+        Each triangle is only tested against the grid points of its bounding box, so the cost is linear in the number
+        of triangles plus the number of grid points, without the search structure of tri.LinearTriInterpolator.
+
+        :param triangulation: triangulation of the nodes
+        :param field: nodal values
+        :param extent: (x_min, x_max, y_min, y_max) of the grid
+        :param shape: (num_x, num_y) number of grid points in each direction
+        :return: array of shape (num_y, num_x), NaN outside the mesh
+        """
+        x_min, x_max, y_min, y_max = extent
+        num_x, num_y = shape
+        raster = np.full((num_y, num_x), np.nan)
+
+        # Vertex coordinates in grid units
+        triangles = triangulation.triangles
+        grid_x = (triangulation.x - x_min) * ((num_x - 1) / max(x_max - x_min, 1e-300))
+        grid_y = (triangulation.y - y_min) * ((num_y - 1) / max(y_max - y_min, 1e-300))
+        vertices_x = grid_x[triangles]
+        vertices_y = grid_y[triangles]
+
+        # Grid points in the bounding box of each triangle
+        first_x = np.clip(np.ceil(vertices_x.min(axis=1) - 1e-9), 0, num_x).astype(int)
+        last_x = np.clip(np.floor(vertices_x.max(axis=1) + 1e-9), -1, num_x - 1).astype(int)
+        first_y = np.clip(np.ceil(vertices_y.min(axis=1) - 1e-9), 0, num_y).astype(int)
+        last_y = np.clip(np.floor(vertices_y.max(axis=1) + 1e-9), -1, num_y - 1).astype(int)
+        widths = np.maximum(last_x - first_x + 1, 0)
+        counts = widths * np.maximum(last_y - first_y + 1, 0)
+
+        candidates = np.repeat(np.arange(len(triangles)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        points_x = first_x[candidates] + offsets % widths[candidates]
+        points_y = first_y[candidates] + offsets // widths[candidates]
+
+        # Barycentric coordinates of the grid points in their candidate triangles
+        origin_x, origin_y = vertices_x[candidates, 0], vertices_y[candidates, 0]
+        edge_1x, edge_1y = vertices_x[candidates, 1] - origin_x, vertices_y[candidates, 1] - origin_y
+        edge_2x, edge_2y = vertices_x[candidates, 2] - origin_x, vertices_y[candidates, 2] - origin_y
+        relative_x, relative_y = points_x - origin_x, points_y - origin_y
+        determinant = edge_1x * edge_2y - edge_1y * edge_2x
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight_1 = (relative_x * edge_2y - relative_y * edge_2x) / determinant
+            weight_2 = (edge_1x * relative_y - edge_1y * relative_x) / determinant
+        weight_0 = 1. - weight_1 - weight_2
+
+        inside = (weight_0 >= -1e-9) & (weight_1 >= -1e-9) & (weight_2 >= -1e-9) & (determinant != 0)
+        values = field[triangles[candidates]]
+        raster[points_y[inside], points_x[inside]] = (weight_0 * values[:, 0] + weight_1 * values[:, 1] + weight_2 * values[:, 2])[inside]
+
+        return raster
+
+    def get_result_fields(self, displacements) -> List[tuple]:
+        """
+        Returns the nodal fields drawn by Runner.show_results, in its order.
+
+        :param displacements: global displacement vector
+        :return: list of (field, field_name, title), the fields indexed by label - 1
+        """
+        nodal_displacements = self.get_nodal_displacements(displacements)
+        stress, strain = self.store.nodal_stress, self.store.nodal_strain
+
+        fields = [(stress[:, i], 'Stress', f'Stress {component}') for i, component in enumerate(('xx', 'yy', 'xy'))]
+        fields += [(strain[:, i], 'Strain', f'Strain {component}') for i, component in enumerate(('xx', 'yy', 'xy'))]
+        fields += [(nodal_displacements[:, i], 'Displacement', f'Displacement in {direction} direction') for i, direction in enumerate(('x', 'y'))]
+        return fields
+
+    def export_figures(self, displacements, scale_factor: Optional[float] = 1.0, num_workers: Optional[int] = None):
+        """
+        Saves all the figures of Runner.show_results to results_dir without any GUI interaction.
+
+        The figures are drawn with the non-interactive Agg backend. The displaced coordinates and the triangulation
+        are built once and shared by all nodal fields, which are rendered in parallel worker processes while this
+        process renders the undeformed and deformed geometries.
+
+        :param displacements: global displacement vector
+        :param scale_factor: scale of the displacements
+        :param num_workers: number of worker processes, the number of CPUs when None and no workers when 1
+        """
+        plt.switch_backend('Agg')
+        self.interactive = False
+
+        triangulation = self.get_triangulation(self.get_displaced_coordinates(displacements, scale_factor))
+        fields = self.get_result_fields(displacements)
+
+        os.makedirs(self.base_dir, exist_ok=True)
+        os.makedirs(self.results_dir, exist_ok=True)
+
+        num_workers = min(num_workers or os.cpu_count() or 1, len(fields))
+        if num_workers <= 1:
+            self.visualize_undeformed_geometry()
+            self.visualize_deformed_geometry(displacements, scale_factor, add_nodal_forces=True)
+            for field, field_name, title in fields:
+                self.visualize_nodal_field(field, field_name, title, triangulation=triangulation)
+            return
+
+        with ProcessPoolExecutor(num_workers, initializer=initialize_export_worker, initargs=(self, triangulation)) as pool:
+            futures = [pool.submit(export_nodal_field, field, field_name, title) for field, field_name, title in fields]
+
+            self.visualize_undeformed_geometry()
+            self.visualize_deformed_geometry(displacements, scale_factor, add_nodal_forces=True)
+
+            for future in futures:
+                future.result()
+
+    def connectivity_to_tris(self) -> np.ndarray:
+        """
+        Converts all elements into triangles at once, with the same splits as shapes_to_tris.
+
+        :return: array of triangles with shape (n_tris, 3)
+        """
+        corners = {3: [[0, 1, 2]],
+                   4: [[0, 1, 2], [2, 3, 0]],
+                   8: [[0, 1, 7], [1, 2, 3], [3, 4, 5], [5, 6, 7], [1, 5, 7], [1, 5, 3]]}
+
+        tris = []
+        for num_nodes, connectivity in self.connectivity.items():
+            if num_nodes not in corners:
+                raise ValueError("Invalid shape. Must be a triangle, quad, or 8-node quad.")
+            tris.append(connectivity[:, corners[num_nodes]].reshape(-1, 3))
+        return np.concatenate(tris)
 
     def shapes_to_tris(self, shapes):
         """
@@ -455,12 +679,14 @@ class Visualizer:
         return tris
 
     # plots a finite element mesh
-    def plot_fem_mesh(self, nodes_x, nodes_y, elements):
-        """This function plots the finite element mesh."""
-        for element in elements:
-            x = [nodes_x[element[i]] for i in range(len(element))]
-            y = [nodes_y[element[i]] for i in range(len(element))]
-            plt.fill(x, y, edgecolor='black', fill=False)
+    def plot_fem_mesh(self, nodes_x, nodes_y, elements=None, linewidth: float = 1.0):
+        """This function plots the finite element mesh as a single collection of element outlines."""
+        coordinates = np.column_stack([nodes_x, nodes_y])
+        if elements is None:
+            polygons = self.get_element_polygons(coordinates)
+        else:
+            polygons = [coordinates[element] for element in elements]
+        plt.gca().add_collection(PolyCollection(polygons, facecolors='none', edgecolors='black', linewidths=linewidth))
 
     def save_fig(self, title: str):
         """
@@ -469,12 +695,30 @@ class Visualizer:
         :param title:  Title of the figure
         :return:  None
         """
-        if not os.path.exists(self.base_dir):
-            os.makedirs(self.base_dir)
+        os.makedirs(self.base_dir, exist_ok=True)
 
         directory = self.base_dir = self.results_dir
 
         # Save fig in svg format in the directory named 'results'. If it doesn't exist, create it.
-        if not os.path.exists(directory):
-            os.makedirs(directory)
+        os.makedirs(directory, exist_ok=True)
         plt.savefig(f'{directory}/{title}.svg', format='svg')
+
+
+# State of the export worker processes, set once per worker by initialize_export_worker
+_export_visualizer = None
+_export_triangulation = None
+
+
+def initialize_export_worker(visualizer: Visualizer, triangulation: tri.Triangulation):
+    """Selects the Agg backend and keeps the shared visualizer arrays and triangulation of an export worker."""
+    global _export_visualizer, _export_triangulation
+    matplotlib.use('Agg', force=True)
+
+    _export_visualizer = visualizer
+    _export_visualizer.interactive = False
+    _export_triangulation = triangulation
+
+
+def export_nodal_field(field: np.ndarray, field_name: str, title: str):
+    """Renders and saves a nodal field in an export worker."""
+    _export_visualizer.visualize_nodal_field(field, field_name, title, triangulation=_export_triangulation)
@@ -0,0 +1,284 @@
+import os
+from typing import Callable, List, Mapping, NamedTuple, Optional
+import numpy as np
+
+
+class DataArray(NamedTuple):
+    """
+    Describes an array of a VTU file and how to read it a block of rows at a time.
+
+    Attributes:
+        name (Optional[str]): Name of the array, None for the points.
+
+        dtype (np.dtype): Little-endian type of the written values.
+
+        width (int): Number of values per row.
+
+        num_rows (int): Number of rows.
+
+        read (Callable[[int, int], np.ndarray]): Returns the rows start:stop with shape (stop - start, width).
+
+        num_components (Optional[int]): NumberOfComponents of the array, None for the cell arrays.
+
+        component_names (Optional[List[str]]): Names of the components shown by the viewers.
+    """
+    name: Optional[str]
+    dtype: np.dtype
+    width: int
+    num_rows: int
+    read: Callable[[int, int], np.ndarray]
+    num_components: Optional[int] = 1
+    component_names: Optional[List[str]] = None
+
+    @property
+    def num_bytes(self) -> int:
+        """Returns the size of the data of the array."""
+        return self.num_rows * self.width * self.dtype.itemsize
+
+
+class VtkExporter(object):
+    """
+    Writes the mesh and the results of an analysis to VTK XML unstructured grid files (.vtu) for external viewers
+    like ParaView.
+
+    The files use the appended raw binary encoding: an XML header describing the arrays, followed by the data of every
+    array, each one preceded by its size in bytes as a UInt64. The sizes are known up front, so the header is written
+    first and then every array is streamed a block of rows at a time, and the memory used does not depend on the size
+    of the mesh when the arrays are memory-mapped, like those of a ResultsStore.
+
+    Two files are written:
+
+        <name>.vtu: The mesh, VTK_QUAD cells for BilinearQuadElement and VTK_QUADRATIC_QUAD cells for
+            QuadraticQuadElement, possibly mixed, with the point data displacement, stress, strain, constraints and
+            loads and the cell data material.
+
+        <name>_gauss.vtu: One VTK_VERTEX cell per Gauss point, with the point data stress, strain and element, when the
+            Gauss point coordinates are known.
+
+    Attributes:
+        CELL_TYPES (dict): VTK cell type and order of the element nodes in the VTK cell, by element type name.
+
+        VTK_VERTEX (int): VTK cell type of the Gauss points.
+
+        CHUNK_ROWS (int): Default number of rows written at a time.
+
+        VTK_TYPE_NAMES (dict): VTK type name of the written NumPy types.
+    """
+
+    # The QuadraticQuadElement nodes alternate corner and midside nodes, VTK lists the corners first
+    CELL_TYPES = {'BilinearQuadElement': (9, [0, 1, 2, 3]),
+                  'QuadraticQuadElement': (23, [0, 2, 4, 6, 1, 3, 5, 7])}
+    VTK_VERTEX = 1
+    CHUNK_ROWS = 1 << 18
+
+    VTK_TYPE_NAMES = {'f8': 'Float64', 'i8': 'Int64', 'i4': 'Int32', 'u1': 'UInt8'}
+
+    @classmethod
+    def write_store(cls, store, path: str, chunk_rows: Optional[int] = None) -> List[str]:
+        """
+        Writes the mesh and the results of a ResultsStore.
+
+        Args:
+            store (ResultsStore): Store to export, read one chunk at a time when it is memory-mapped.
+
+            path (str): Path of the mesh file.
+
+            chunk_rows (Optional[int]): Number of rows written at a time, CHUNK_ROWS when None.
+
+        Returns:
+            List[str]: Paths of the written files.
+        """
+        return cls.write_arrays(path, store, store.metadata['element_types'], chunk_rows)
+
+    @classmethod
+    def write_arrays(cls, path: str, arrays: Mapping[str, np.ndarray], element_types: List[str], chunk_rows: Optional[int] = None) -> List[str]:
+        """
+        Writes the arrays of a results store, see ResultsStore for their names and shapes.
+
+        Args:
+            path (str): Path of the mesh file, '.vtu' is added when missing.
+
+            arrays (Mapping[str, np.ndarray]): Arrays by name, a ResultsStore or a dictionary.
+
+            element_types (List[str]): Names of the element types the element_types codes index.
+
+            chunk_rows (Optional[int]): Number of rows written at a time, CHUNK_ROWS when None.
+
+        Returns:
+            List[str]: Paths of the written files.
+
+        Raises:
+            ValueError: If the mesh has no elements or elements of a type without VTK cell.
+        """
+        chunk_rows = chunk_rows or cls.CHUNK_ROWS
+        base_path = path[:-4] if path.endswith('.vtu') else path
+        directory = os.path.dirname(base_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        element_type_codes = np.asarray(arrays['element_types'])
+        codes = np.unique(element_type_codes)
+        if len(codes) == 0:
+            raise ValueError('The mesh has no elements')
+        for code in codes:
+            if element_types[int(code)] not in cls.CELL_TYPES:
+                raise ValueError(f'No VTK cell for {element_types[int(code)]}')
+
+        coordinates = arrays['coordinates']
+        connectivity = arrays['connectivity']
+
+        point_data = [cls.vector_array('displacement', arrays['nodal_displacements'], ['x', 'y', 'z']),
+                      cls.table_array('stress', arrays['nodal_stress'], ['xx', 'yy', 'xy']),
+                      cls.table_array('strain', arrays['nodal_strain'], ['xx', 'yy', 'xy']),
+                      cls.table_array('constraints', arrays['constraints'], ['x', 'y'], np.dtype('<u1')),
+                      cls.vector_array('loads', arrays['loads'], ['x', 'y', 'z'])]
+        cell_data = [cls.table_array('material', arrays['element_materials'], None, np.dtype('<i4'))]
+        if len(codes) == 1:
+            cells = cls.uniform_cell_arrays(connectivity, *cls.CELL_TYPES[element_types[int(codes[0])]])
+        else:
+            cells = cls.mixed_cell_arrays(connectivity, element_type_codes, [cls.CELL_TYPES.get(element_type, (0, [])) for element_type in element_types])
+
+        mesh_path = base_path + '.vtu'
+        cls.write_vtu(mesh_path, cls.vector_array(None, coordinates), point_data, cell_data, cells, chunk_rows)
+        paths = [mesh_path]
+
+        if 'gauss_point_coordinates' in arrays:
+            gauss_point_offsets = np.asarray(arrays['gauss_point_offsets'])
+            num_points = len(arrays['gauss_point_coordinates'])
+
+            point_data = [cls.table_array('stress', arrays['gauss_point_stress'], ['xx', 'yy', 'xy']),
+                          cls.table_array('strain', arrays['gauss_point_strain'], ['xx', 'yy', 'xy']),
+                          DataArray('element', np.dtype('<i8'), 1, num_points,
+                                    lambda start, stop: np.searchsorted(gauss_point_offsets, np.arange(start, stop), side='right')[:, None] - 1)]
+            cells = [DataArray('connectivity', np.dtype('<i8'), 1, num_points, lambda start, stop: np.arange(start, stop)[:, None], None),
+                     DataArray('offsets', np.dtype('<i8'), 1, num_points, lambda start, stop: np.arange(start + 1, stop + 1)[:, None], None),
+                     DataArray('types', np.dtype('<u1'), 1, num_points, lambda start, stop: np.full((stop - start, 1), cls.VTK_VERTEX), None)]
+
+            gauss_path = base_path + '_gauss.vtu'
+            cls.write_vtu(gauss_path, cls.vector_array(None, arrays['gauss_point_coordinates']), point_data, [], cells, chunk_rows)
+            paths.append(gauss_path)
+
+        return paths
+
+    @staticmethod
+    def uniform_cell_arrays(connectivity: np.ndarray, cell_type: int, node_order: List[int]) -> List[DataArray]:
+        """Returns the connectivity, offsets and types arrays of a mesh with a single cell type."""
+        num_nodes_elem = len(node_order)
+        return [DataArray('connectivity', np.dtype('<i8'), num_nodes_elem, len(connectivity),
+                          lambda start, stop: connectivity[start:stop][:, node_order], None),
+                DataArray('offsets', np.dtype('<i8'), 1, len(connectivity),
+                          lambda start, stop: num_nodes_elem * np.arange(start + 1, stop + 1)[:, None], None),
+                DataArray('types', np.dtype('<u1'), 1, len(connectivity),
+                          lambda start, stop: np.full((stop - start, 1), cell_type), None)]
+
+    @staticmethod
+    def mixed_cell_arrays(connectivity: np.ndarray, element_type_codes: np.ndarray, cell_types: List[tuple]) -> List[DataArray]:
+        """
+        Returns the connectivity, offsets and types arrays of a mesh with several cell types.
+
+        The connectivity rows are padded with -1, so the VTK connectivity is streamed by position: a block of positions
+        is read from the rows of the elements that hold it.
+
+        Args:
+            connectivity (np.ndarray): Node indices of the elements padded with -1.
+
+            element_type_codes (np.ndarray): Index in cell_types of the type of each element.
+
+            cell_types (List[tuple]): VTK cell type and node order of each element type.
+        """
+        cell_sizes = np.array([len(node_order) for _, node_order in cell_types])
+        # End of the nodes of each cell in the VTK connectivity, the VTK offsets
+        cell_ends = np.cumsum(cell_sizes[element_type_codes])
+        vtk_cell_types = np.array([cell_type for cell_type, _ in cell_types])
+
+        def read_connectivity(start: int, stop: int) -> np.ndarray:
+            first = int(np.searchsorted(cell_ends, start, side='right'))
+            last = int(np.searchsorted(cell_ends, stop, side='left')) + 1
+            rows = np.asarray(connectivity[first:last])
+            block_codes = element_type_codes[first:last]
+
+            ordered = np.full(rows.shape, -1, dtype=np.int64)
+            for code in np.unique(block_codes):
+                node_order = cell_types[code][1]
+                ordered[block_codes == code, :len(node_order)] = rows[block_codes == code][:, node_order]
+
+            begin = start - (cell_ends[first - 1] if first else 0)
+            return ordered[ordered != -1][begin:begin + stop - start, None]
+
+        return [DataArray('connectivity', np.dtype('<i8'), 1, int(cell_ends[-1]), read_connectivity, None),
+                DataArray('offsets', np.dtype('<i8'), 1, len(connectivity), lambda start, stop: cell_ends[start:stop, None], None),
+                DataArray('types', np.dtype('<u1'), 1, len(connectivity), lambda start, stop: vtk_cell_types[element_type_codes[start:stop], None], None)]
+
+    @staticmethod
+    def vector_array(name: Optional[str], array: np.ndarray, component_names: Optional[List[str]] = None) -> DataArray:
+        """Returns a planar vector array (n, 2) written as the 3D vectors that VTK expects, with a zero z component."""
+        def read(start: int, stop: int) -> np.ndarray:
+            block = np.zeros((stop - start, 3))
+            block[:, :2] = array[start:stop]
+            return block
+        return DataArray(name, np.dtype('<f8'), 3, len(array), read, 3, component_names)
+
+    @staticmethod
+    def table_array(name: str, array: np.ndarray, component_names: Optional[List[str]], dtype: np.dtype = np.dtype('<f8')) -> DataArray:
+        """Returns an array with one component per column, or a single component when it has one dimension."""
+        width = array.shape[1] if array.ndim == 2 else 1
+        return DataArray(name, dtype, width, len(array), lambda start, stop: np.asarray(array[start:stop]).reshape(stop - start, width), width, component_names)
+
+    @classmethod
+    def write_vtu(cls, path: str, points: DataArray, point_data: List[DataArray], cell_data: List[DataArray], cells: List[DataArray], chunk_rows: int):
+        """
+        Writes a VTU file with appended raw binary data, streaming the arrays a block of rows at a time.
+
+        Args:
+            path (str): Path of the file.
+
+            points (DataArray): Coordinates of the points with 3 components.
+
+            point_data (List[DataArray]): Arrays with one row per point.
+
+            cell_data (List[DataArray]): Arrays with one row per cell.
+
+            cells (List[DataArray]): The connectivity, offsets and types arrays.
+
+            chunk_rows (int): Number of rows written at a time.
+        """
+        offset = 0
+        offsets = []
+        for data_array in point_data + cell_data + [points] + cells:
+            offsets.append(offset)
+            offset += 8 + data_array.num_bytes
+        offsets = iter(offsets)
+
+        lines = ['<?xml version="1.0"?>',
+                 '<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" header_type="UInt64">',
+                 '  <UnstructuredGrid>',
+                 f'    <Piece NumberOfPoints="{points.num_rows}" NumberOfCells="{cells[-1].num_rows}">']
+        for section, data_arrays in (('PointData', point_data), ('CellData', cell_data), ('Points', [points]), ('Cells', cells)):
+            lines.append(f'      <{section}>')
+            for data_array in data_arrays:
+                lines.append(f'        {cls._data_array_tag(data_array, next(offsets))}')
+            lines.append(f'      </{section}>')
+        lines += ['    </Piece>', '  </UnstructuredGrid>', '  <AppendedData encoding="raw">', '   _']
+
+        with open(path, 'wb') as file:
+            file.write('\n'.join(lines).encode('ascii'))
+
+            for data_array in point_data + cell_data + [points] + cells:
+                file.write(np.uint64(data_array.num_bytes).astype('<u8').tobytes())
+                for start in range(0, data_array.num_rows, chunk_rows):
+                    stop = min(start + chunk_rows, data_array.num_rows)
+                    file.write(np.ascontiguousarray(data_array.read(start, stop), dtype=data_array.dtype).tobytes())
+
+            file.write(b'\n  </AppendedData>\n</VTKFile>\n')
+
+    @classmethod
+    def _data_array_tag(cls, data_array: DataArray, offset: int) -> str:
+        """Returns the XML element describing an appended array."""
+        attributes = f'type="{cls.VTK_TYPE_NAMES[data_array.dtype.str[1:]]}"'
+        if data_array.name is not None:
+            attributes += f' Name="{data_array.name}"'
+        if data_array.num_components is not None:
+            attributes += f' NumberOfComponents="{data_array.num_components}"'
+            for i, component_name in enumerate(data_array.component_names or []):
+                attributes += f' ComponentName{i}="{component_name}"'
+        return f'<DataArray {attributes} format="appended" offset="{offset}"/>'
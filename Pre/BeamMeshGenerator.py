@@ -1,4 +1,5 @@
 from typing import Optional
+import numpy as np
 
 from Engine.Geometry import Geometry
 
@@ -6,6 +7,9 @@ from Engine.Geometry import Geometry
 class BeamMeshGenerator:
     """
     A class to generate mesh for beam elements.
+
+    The nodal coordinates and the element connectivity are built as arrays and added to the geometry in bulk. The
+    spacing can be graded with a bias, the ratio between the sizes of the last and the first element along an axis.
     """
 
     def __init__(self, geometry: Geometry):
@@ -17,10 +21,74 @@ class BeamMeshGenerator:
         """
         self.geometry = geometry
 
-    def generate_bilinear_mesh(self, width: float, height: float, num_elements_x: int, num_elements_y: int, x_origin: Optional[float] = 0., y_origin: Optional[float] = 0.):
+    @staticmethod
+    def compute_graded_coordinates(length: float, num_divisions: int, origin: Optional[float] = 0., bias: Optional[float] = 1.) -> np.ndarray:
+        """
+        Computes the coordinates of the divisions of a segment.
+
+        The sizes of the divisions follow a geometric progression whose ratio between the last and the first division
+        is the bias. A bias greater than 1 refines the mesh near the origin, a bias smaller than 1 near the end.
+
+        Args:
+            length (float): The length of the segment.
+
+            num_divisions (int): The number of divisions.
+
+            origin (Optional[float], optional): The coordinate of the start of the segment. Defaults to 0.
+
+            bias (Optional[float], optional): The ratio between the last and the first division. Defaults to 1.
+
+        Returns:
+            np.ndarray: The coordinates with shape (num_divisions + 1,).
+
+        Raises:
+            ValueError: If the bias is not positive.
+        """
+        if bias <= 0:
+            raise ValueError('bias must be positive')
+
+        if bias == 1. or num_divisions == 1:
+            return origin + np.arange(num_divisions + 1) * (length / num_divisions)
+
+        ratio = bias ** (1. / (num_divisions - 1))
+        sizes = ratio ** np.arange(num_divisions)
+        coordinates = origin + length * np.concatenate(([0.], np.cumsum(sizes))) / sizes.sum()
+        coordinates[-1] = origin + length
+        return coordinates
+
+    @staticmethod
+    def compute_quadratic_coordinates(length: float, num_elements: int, origin: Optional[float] = 0., bias: Optional[float] = 1.) -> np.ndarray:
+        """
+        Computes the coordinates of the corner and mid-side nodes of the quadratic elements along a segment.
+
+        Args:
+            length (float): The length of the segment.
+
+            num_elements (int): The number of elements.
+
+            origin (Optional[float], optional): The coordinate of the start of the segment. Defaults to 0.
+
+            bias (Optional[float], optional): The ratio between the last and the first element. Defaults to 1.
+
+        Returns:
+            np.ndarray: The coordinates with shape (2 * num_elements + 1,), the mid-side nodes halfway between corners.
+        """
+        if bias == 1.:
+            return BeamMeshGenerator.compute_graded_coordinates(length, 2 * num_elements, origin)
+
+        corners = BeamMeshGenerator.compute_graded_coordinates(length, num_elements, origin, bias)
+
+        coordinates = np.empty(2 * num_elements + 1)
+        coordinates[0::2] = corners
+        coordinates[1::2] = 0.5 * (corners[:-1] + corners[1:])
+        return coordinates
+
+    def generate_bilinear_mesh(self, width: float, height: float, num_elements_x: int, num_elements_y: int, x_origin: Optional[float] = 0., y_origin: Optional[float] = 0., x_bias: Optional[float] = 1., y_bias: Optional[float] = 1.):
         """
         Generates a bilinear mesh.
 
+        The nodes are numbered column by column, bottom to top, and so are the elements.
+
         Args:
             width (float): The width of the mesh.
 
@@ -33,34 +101,36 @@ class BeamMeshGenerator:
             x_origin (Optional[float], optional): The x-coordinate origin. Defaults to 0.
 
             y_origin (Optional[float], optional): The y-coordinate origin. Defaults to 0.
+
+            x_bias (Optional[float], optional): The ratio between the last and the first element width. Defaults to 1.
+
+            y_bias (Optional[float], optional): The ratio between the last and the first element height. Defaults to 1.
         """
-        num_x_nodes = num_elements_x + 1
         num_y_nodes = num_elements_y + 1
 
-        x_spacing = width / num_elements_x
-        y_spacing = height / num_elements_y
-
-        for i in range(num_x_nodes):
-            for j in range(num_y_nodes):
-                x = x_origin + i * x_spacing
-                y = y_origin + j * y_spacing
-                self.geometry.add_node(x, y)
-
-        for i in range(num_elements_x):
-            for j in range(num_elements_y):
-                n1 = j + i * num_y_nodes
-                n2 = j + (i + 1) * num_y_nodes
-                n3 = n1 + 1
-                n4 = n2 + 1
-                self.geometry.add_element([self.geometry.nodes[n1],
-                                           self.geometry.nodes[n2],
-                                           self.geometry.nodes[n4],
-                                           self.geometry.nodes[n3]])
-
-    def generate_biquadratic_mesh(self, width: float, height: float, num_elements_x: int, num_elements_y: int, x_origin: Optional[float] = 0., y_origin: Optional[float] = 0.):
+        x = self.compute_graded_coordinates(width, num_elements_x, x_origin, x_bias)
+        y = self.compute_graded_coordinates(height, num_elements_y, y_origin, y_bias)
+
+        coordinates = np.stack(np.meshgrid(x, y, indexing='ij'), axis=-1).reshape(-1, 2)
+
+        # Bottom left node of each element, x index varying slowest
+        i, j = np.meshgrid(np.arange(num_elements_x), np.arange(num_elements_y), indexing='ij')
+        n1 = (j + i * num_y_nodes).ravel()
+        n2 = n1 + num_y_nodes
+        connectivity = np.stack([n1, n2, n2 + 1, n1 + 1], axis=1)
+
+        first_node = len(self.geometry.nodes)
+        first_element = len(self.geometry.elements)
+        self.geometry.add_nodes(coordinates)
+        self.geometry.add_elements(connectivity + first_node)
+        self.geometry.structured_grids.append({'first_element': first_element, 'shape': (num_elements_x, num_elements_y), 'order': 'column'})
+
+    def generate_biquadratic_mesh(self, width: float, height: float, num_elements_x: int, num_elements_y: int, x_origin: Optional[float] = 0., y_origin: Optional[float] = 0., x_bias: Optional[float] = 1., y_bias: Optional[float] = 1.):
         """
         Generates a biquadratic mesh.
 
+        The nodes are numbered column by column, bottom to top, and the elements row by row, left to right.
+
         Args:
             width (float): The width of the mesh.
 
@@ -73,35 +143,37 @@ class BeamMeshGenerator:
             x_origin (Optional[float], optional): The x-coordinate origin. Defaults to 0.
 
             y_origin (Optional[float], optional): The y-coordinate origin. Defaults to 0.
+
+            x_bias (Optional[float], optional): The ratio between the last and the first element width. Defaults to 1.
+
+            y_bias (Optional[float], optional): The ratio between the last and the first element height. Defaults to 1.
         """
-        num_rows = 2 * num_elements_x + 1
         num_columns = 2 * num_elements_y + 1
 
-        x_spacing = width / (2 * num_elements_x)
-        y_spacing = height / (2 * num_elements_y)
-
-        for column in range(num_rows):
-            for row in range(num_columns):
-                if column % 2 == 0 or row % 2 == 0:
-                    x = x_origin + column * x_spacing
-                    y = y_origin + row * y_spacing
-                    self.geometry.add_node(x, y)
-
-        for row in range(num_elements_y):
-            for column in range(num_elements_x):
-                n1 = column * (2 * num_elements_y + 1) + column * (num_elements_y + 1) + 2 * row
-                n2 = n1 + 2 * (num_elements_y - row) + 1 + row
-                n3 = n2 + (num_elements_y - row) + 1 + 2 * row
-                n4 = n3 + 1
-                n5 = n3 + 2
-                n6 = n2 + 1
-                n7 = n1 + 2
-                n8 = n1 + 1
-                self.geometry.add_element([self.geometry.nodes[n1],
-                                           self.geometry.nodes[n2],
-                                           self.geometry.nodes[n3],
-                                           self.geometry.nodes[n4],
-                                           self.geometry.nodes[n5],
-                                           self.geometry.nodes[n6],
-                                           self.geometry.nodes[n7],
-                                           self.geometry.nodes[n8]])
+        x = self.compute_quadratic_coordinates(width, num_elements_x, x_origin, x_bias)
+        y = self.compute_quadratic_coordinates(height, num_elements_y, y_origin, y_bias)
+
+        # Serendipity grid: the nodes in odd columns and odd rows at the same time are not part of the mesh
+        column, row = np.meshgrid(np.arange(len(x)), np.arange(num_columns), indexing='ij')
+        exists = ((column % 2 == 0) | (row % 2 == 0)).ravel()
+        coordinates = np.stack([x[column], y[row]], axis=-1).reshape(-1, 2)[exists]
+
+        # Index of the first node of each column of the grid
+        column_sizes = np.where(np.arange(len(x)) % 2 == 0, num_columns, num_elements_y + 1)
+        column_starts = np.concatenate(([0], np.cumsum(column_sizes)[:-1]))
+
+        # Element indices, y index varying slowest
+        row, column = np.meshgrid(np.arange(num_elements_y), np.arange(num_elements_x), indexing='ij')
+        row = row.ravel()
+        column = column.ravel()
+
+        n1 = column_starts[2 * column] + 2 * row
+        n2 = column_starts[2 * column + 1] + row
+        n3 = column_starts[2 * column + 2] + 2 * row
+        connectivity = np.stack([n1, n2, n3, n3 + 1, n3 + 2, n2 + 1, n1 + 2, n1 + 1], axis=1)
+
+        first_node = len(self.geometry.nodes)
+        first_element = len(self.geometry.elements)
+        self.geometry.add_nodes(coordinates)
+        self.geometry.add_elements(connectivity + first_node)
+        self.geometry.structured_grids.append({'first_element': first_element, 'shape': (num_elements_x, num_elements_y), 'order': 'row'})
@@ -20,18 +20,9 @@ if __name__ == '__main__':
     # Setting the material
     linear_elastic_material = runner.set_linear_elastic_material(young_modulus=elements_material['E'], poisson_ratio=elements_material['poisson'], thickness=elements_material['thickness'])
 
-    for node in runner.geometry.nodes:
-        for restriction_data in nodes_restrictions:
-            pos_x = restriction_data['position']['x']
-            pos_y = restriction_data['position']['y']
-            if (pos_x is None or pos_x == node.x) and (pos_y is None or pos_y == node.y):
-                runner.set_boundary_conditions(node.label - 1, restriction_data['restrictions']['x'], restriction_data['restrictions']['y'])
-
-        for force_data in nodes_forces:
-            pos_x = force_data['position']['x']
-            pos_y = force_data['position']['y']
-            if (pos_x == node.x) and (pos_y == node.y):
-                runner.apply_nodal_load(node.label - 1, force_data['forces']['x'], force_data['forces']['y'])
+    # Setting the boundary conditions and loads
+    runner.apply_boundary_conditions(nodes_restrictions)
+    runner.apply_nodal_loads(nodes_forces)
 
     start = time.time()
     runner.run_analysis()
@@ -7,6 +7,8 @@ import sys
 sys.path.insert(0, os.path.abspath('../Engine'))
 sys.path.insert(0, os.path.abspath('../Engine/Elements'))
 sys.path.insert(0, os.path.abspath('../Engine/Materials'))
+sys.path.insert(0, os.path.abspath('../Engine/Solvers'))
+sys.path.insert(0, os.path.abspath('../Engine/Preconditioners'))
 sys.path.insert(0, os.path.abspath('../Pre'))
 sys.path.insert(0, os.path.abspath('../Pos'))
 
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The packages are imported from the root of the repository, like main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Engine.Runner import Runner  # noqa: E402
+from Pre.BeamMeshGenerator import BeamMeshGenerator  # noqa: E402
+
+
+def create_beam(tip_load: float) -> (Runner, int):
+    """Builds a quadratic beam clamped at its right end and loaded at its lower left corner."""
+    runner = Runner()
+    BeamMeshGenerator(runner.geometry).generate_biquadratic_mesh(width=60, height=20, num_elements_x=20, num_elements_y=5, x_origin=0, y_origin=-10)
+    runner.set_linear_elastic_material(young_modulus=200000, poisson_ratio=0.3, thickness=5)
+
+    coordinates = runner.geometry.store.coordinates
+    for node in np.flatnonzero(coordinates[:, 0] == 60):
+        runner.set_boundary_conditions(node, True, True)
+    tip = int(np.flatnonzero((coordinates[:, 0] == 0) & (coordinates[:, 1] == -10))[0])
+    runner.apply_nodal_load(tip, 0, tip_load)
+
+    return runner, tip
+
+
+@pytest.fixture
+def build_beam():
+    """Returns the builder of the quadratic beam, called with the tip load, see create_beam."""
+    return create_beam
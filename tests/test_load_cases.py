@@ -0,0 +1,32 @@
+import numpy as np
+
+
+def test_load_cases_follow_a_material_change(build_beam):
+    runner, tip = build_beam(-1000)
+    runner.factorize_stiffness_matrix(solver_type='cholesky')
+    forces = np.zeros((2 * len(runner.geometry.nodes), 1))
+    forces[2 * tip + 1] = -1000
+    displacements, stress, _ = runner.solve_load_cases(forces)
+
+    runner.set_linear_elastic_material(young_modulus=100000, poisson_ratio=0.3, thickness=5)
+    softer_displacements, softer_stress, _ = runner.solve_load_cases(forces)
+
+    assert 'factorization' in runner.state.executed_stages
+    np.testing.assert_allclose(softer_displacements, 2 * displacements, rtol=1e-9, atol=1e-14)
+    np.testing.assert_allclose(softer_stress, stress, rtol=1e-7, atol=1e-9 * np.abs(stress).max())
+
+
+def test_load_cases_follow_a_constraint_change(build_beam):
+    runner, tip = build_beam(-1000)
+    runner.run_analysis(solver_type='cholesky')
+
+    runner.set_boundary_conditions(tip, True, False)
+    displacements, _, _ = runner.solve_load_cases(np.ones(2 * len(runner.geometry.nodes)))
+
+    # The same load applied to the nodes and solved as a single load case
+    for node in range(len(runner.geometry.nodes)):
+        runner.apply_nodal_load(node, 1, 1)
+    runner.run_analysis(solver_type='cholesky')
+
+    assert displacements[2 * tip, 0] == 0
+    np.testing.assert_allclose(displacements[:, 0], runner.get_nodal_displacements().ravel(), rtol=1e-9, atol=1e-14)
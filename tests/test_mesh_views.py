@@ -0,0 +1,58 @@
+import time
+
+import numpy as np
+
+from Engine.Geometry import Geometry
+from Engine.Materials.LinearElasticMaterial import LinearElasticMaterial
+from Pre.BeamMeshGenerator import BeamMeshGenerator
+
+
+def generate(num_elements_x: int, num_elements_y: int, quadratic: bool = False) -> Geometry:
+    """Generates a beam mesh on a new geometry."""
+    geometry = Geometry()
+    generator = BeamMeshGenerator(geometry)
+    if quadratic:
+        generator.generate_biquadratic_mesh(60, 20, num_elements_x, num_elements_y)
+    else:
+        generator.generate_bilinear_mesh(60, 20, num_elements_x, num_elements_y)
+    return geometry
+
+
+def test_mesh_generation_creates_no_views():
+    geometry = generate(200, 50)
+    geometry.set_all_materials(LinearElasticMaterial(200000, 0.3))
+    groups = geometry.group_elements()
+
+    assert not geometry.nodes.is_created().any()
+    assert not geometry.elements.is_created().any()
+    assert [len(indices) for indices in groups.values()] == [200 * 50]
+
+
+def test_views_match_the_store():
+    geometry = generate(6, 3, quadratic=True)
+    material = LinearElasticMaterial(200000, 0.3)
+    geometry.set_all_materials(material)
+
+    element = geometry.elements[-1]
+    assert element is geometry.elements[len(geometry.elements) - 1]
+    assert element.label == len(geometry.elements)
+    assert element.material is material
+    assert [node.label - 1 for node in element.nodes] == geometry.store.connectivity[-1].tolist()
+    np.testing.assert_array_equal(element.get_coordinates(), geometry.store.coordinates[geometry.store.connectivity[-1]])
+    assert [node.label for node in geometry.nodes[2:5]] == [3, 4, 5]
+
+
+def test_mesh_generation_scales_linearly_without_views():
+    def best_time(num_elements_x: int) -> (float, Geometry):
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            geometry = generate(num_elements_x, num_elements_x // 5)
+            times.append(time.perf_counter() - start)
+        return min(times), geometry
+
+    # 100 times more elements, only the ratio is checked and with a generous bound, as absolute times depend on the machine
+    (small, _), (large, geometry) = best_time(100), best_time(1000)
+    assert not geometry.nodes.is_created().any()
+    assert not geometry.elements.is_created().any()
+    assert large < 500 * small
@@ -0,0 +1,44 @@
+import numpy as np
+
+from Engine.Runner import Runner
+from Pre.BeamMeshGenerator import BeamMeshGenerator
+
+MESH_GENERATORS = {'quad4': 'generate_bilinear_mesh', 'quad8': 'generate_biquadratic_mesh'}
+
+
+def build_beams(element_types, **analysis_options) -> Runner:
+    """Analyzes separate cantilever beams, one per element type, stacked 40 apart in a single geometry."""
+    runner = Runner()
+    generator = BeamMeshGenerator(runner.geometry)
+    for k, element_type in enumerate(element_types):
+        getattr(generator, MESH_GENERATORS[element_type])(width=60, height=20, num_elements_x=12, num_elements_y=4, x_origin=0, y_origin=40 * k)
+    runner.set_linear_elastic_material(young_modulus=200000, poisson_ratio=0.3, thickness=5)
+
+    coordinates = runner.geometry.store.coordinates
+    for node in np.flatnonzero(coordinates[:, 0] == 60):
+        runner.set_boundary_conditions(node, True, True)
+    for k in range(len(element_types)):
+        runner.apply_nodal_load(int(np.flatnonzero((coordinates[:, 0] == 0) & (coordinates[:, 1] == 40 * k))[0]), 0, -1000)
+
+    runner.run_analysis(**analysis_options)
+    return runner
+
+
+def test_mixed_mesh_matches_the_separate_meshes(tmp_path):
+    mixed = build_beams(['quad4', 'quad8'], assembly_type='sparse', solver_type='cholesky', keep_element_nodal_values=True)
+    store = mixed.geometry.store
+    num_quad4_nodes = len(build_beams(['quad4']).geometry.nodes)
+
+    assert store.nodes_per_element == 8 and not store.is_uniform
+    assert {element_type.__name__ for element_type, _ in mixed.geometry.group_elements()} == {'BilinearQuadElement', 'QuadraticQuadElement'}
+
+    for element_type, nodes in (('quad4', slice(None, num_quad4_nodes)), ('quad8', slice(num_quad4_nodes, None))):
+        separate = build_beams([element_type], assembly_type='sparse', solver_type='cholesky')
+        np.testing.assert_allclose(mixed.get_nodal_displacements()[nodes], separate.get_nodal_displacements(), rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(store.nodal_stress[nodes], separate.geometry.store.nodal_stress, rtol=1e-9, atol=1e-9)
+
+    # The element views of the bilinear elements only hold their own nodes
+    assert len(mixed.geometry.elements[0].nodes) == 4 and len(mixed.geometry.elements[-1].nodes) == 8
+
+    paths = mixed.export_vtk(str(tmp_path / 'mixed'))
+    assert b'NumberOfCells="96"' in open(paths[0], 'rb').read(4096)
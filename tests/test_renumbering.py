@@ -0,0 +1,48 @@
+import numpy as np
+
+from Engine.Runner import Runner
+from Pre.BeamMeshGenerator import BeamMeshGenerator
+
+
+def test_renumbering_is_applied_and_kept_by_the_factorization(build_beam):
+    runner, _ = build_beam(-1000)
+    runner.run_analysis(solver_type='cholesky')
+    reference = runner.get_nodal_displacements()
+    creation_dofs = runner.geometry.get_nodal_global_indices()
+
+    runner.run_analysis(solver_type='cholesky', renumbering='amd')
+
+    assert runner.renumbering_report['applied']
+    assert runner.solver.column_ordering == 'NATURAL'
+    assert not np.array_equal(runner.geometry.get_nodal_global_indices(), creation_dofs)
+    np.testing.assert_allclose(runner.get_nodal_displacements(), reference, rtol=1e-9, atol=1e-14)
+
+
+def test_rcm_keeps_the_creation_order_when_it_widens_the_band(build_beam):
+    runner, _ = build_beam(-1000)
+    creation_dofs = runner.geometry.number_nodal_dofs()
+    runner.run_analysis(solver_type='cholesky', renumbering='rcm')
+    report = runner.renumbering_report
+
+    assert report['bandwidth_after'] > report['bandwidth_before']
+    assert not report['applied']
+    assert runner.solver.column_ordering == 'MMD_AT_PLUS_A'
+    np.testing.assert_array_equal(runner.geometry.get_nodal_global_indices(), creation_dofs)
+
+
+def test_rcm_is_applied_when_it_narrows_the_band():
+    # Nodes numbered along the long side of a column
+    runner = Runner()
+    BeamMeshGenerator(runner.geometry).generate_bilinear_mesh(width=20, height=60, num_elements_x=5, num_elements_y=20, x_origin=0, y_origin=0)
+    runner.set_linear_elastic_material(young_modulus=200000, poisson_ratio=0.3, thickness=5)
+    coordinates = runner.geometry.store.coordinates
+    for node in np.flatnonzero(coordinates[:, 1] == 0):
+        runner.set_boundary_conditions(node, True, True)
+    runner.apply_nodal_load(int(np.flatnonzero(coordinates[:, 1] == 60)[0]), 0, -1000)
+
+    runner.run_analysis(solver_type='cholesky', renumbering='rcm')
+    report = runner.renumbering_report
+
+    assert report['applied'] and report['bandwidth_after'] < report['bandwidth_before']
+    # The measurements are queries, the applied numbering is the one measured after the renumbering
+    assert runner.geometry.compute_bandwidth_and_profile() == (report['bandwidth_after'], report['profile_after'])
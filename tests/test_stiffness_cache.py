@@ -0,0 +1,33 @@
+import numpy as np
+
+
+def test_parallel_recovery_is_bit_identical_without_opting_in(build_beam):
+    serial, _ = build_beam(-1000)
+    serial.run_analysis(keep_element_nodal_values=True)
+
+    parallel, _ = build_beam(-1000)
+    parallel.set_parallel_execution(num_workers=2, backend='thread', chunk_size=16)
+    parallel.run_analysis(keep_element_nodal_values=True)
+
+    assert serial.stiffness_cache is None
+    np.testing.assert_array_equal(parallel.elements_nodal_stress, serial.elements_nodal_stress)
+    np.testing.assert_array_equal(parallel.geometry.store.nodal_stress, serial.geometry.store.nodal_stress)
+
+
+def test_cache_is_bypassed_when_the_shapes_are_distinct(build_beam):
+    uniform, _ = build_beam(-1000)
+    cache = uniform.set_stiffness_cache()
+    uniform.run_analysis()
+    assert cache.misses == 1 and len(cache) == 1
+
+    graded, _ = build_beam(-1000)
+    coordinates = graded.geometry.store.coordinates
+    coordinates[:, 0] = 60 * (coordinates[:, 0] / 60) ** 1.5
+    coordinates[:, 1] = 20 * ((coordinates[:, 1] + 10) / 20) ** 1.3 - 10
+    cache = graded.set_stiffness_cache()
+    stiffness_matrices = graded.compute_elements_stiffness_matrices('full')
+
+    # Integrated as a whole, like without the cache, and without filling the entries
+    graded.set_stiffness_cache(None)
+    np.testing.assert_array_equal(stiffness_matrices, graded.compute_elements_stiffness_matrices('full'))
+    assert cache.hits == 0 and cache.misses == len(graded.geometry.elements) and len(cache) == 0
@@ -0,0 +1,40 @@
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+
+from Engine.Solvers.SubstructuringSolver import Subdomain, SubstructuringSolver
+
+
+def build_stiffness_matrix(build_beam) -> (csr_matrix, np.ndarray):
+    """Returns the stiffness matrix and the forces of the free dofs of the quadratic beam, as the runner assembles them."""
+    runner, _ = build_beam(-1000)
+    runner.run_analysis(assembly_type='sparse', solver_type='cholesky')
+    return runner.global_stiffness_matrix.tocsr(), runner.global_force_vector.ravel()
+
+
+def test_blocked_schur_contribution_matches_the_dense_one(build_beam):
+    matrix, _ = build_stiffness_matrix(build_beam)
+    interior, interface = np.arange(0, matrix.shape[0] - 150), np.arange(matrix.shape[0] - 150, matrix.shape[0])
+    subdomain = Subdomain(matrix[interior][:, interior], matrix[interior][:, interface])
+    subdomain.SCHUR_BLOCK_COLUMNS = 16
+
+    coupling = matrix[interior][:, interface].toarray()
+    expected = coupling.T @ np.linalg.solve(matrix[interior][:, interior].toarray(), coupling)
+
+    contribution = subdomain.compute_schur_contribution()
+    assert issparse(contribution)
+    assert np.allclose(contribution.toarray(), expected, rtol=1e-10, atol=1e-10 * np.abs(expected).max())
+
+
+def test_substructuring_matches_the_direct_solution(build_beam):
+    matrix, forces = build_stiffness_matrix(build_beam)
+    labels = np.repeat(np.arange(4), -(-matrix.shape[0] // 4))[:matrix.shape[0]]
+    # Dofs coupled to another subdomain go to the interface
+    rows, columns = matrix.nonzero()
+    labels[rows[labels[rows] != labels[columns]]] = -1
+
+    solver = SubstructuringSolver(labels, backend='serial')
+    solver.factorize(matrix)
+    displacements = solver.solve(forces)
+
+    assert len(solver.interface_dofs) > 0
+    assert np.allclose(displacements, np.linalg.solve(matrix.toarray(), forces), rtol=1e-9, atol=1e-12)
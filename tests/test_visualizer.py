@@ -0,0 +1,21 @@
+import numpy as np
+
+from Engine.Geometry import Geometry
+from Pos.Visualizer import Visualizer
+from Pre.BeamMeshGenerator import BeamMeshGenerator
+
+
+def test_visualizer_reads_the_store_without_creating_views(tmp_path):
+    geometry = Geometry()
+    BeamMeshGenerator(geometry).generate_biquadratic_mesh(60, 20, 30, 10)
+    geometry.constrain_nodes(np.arange(5), True, True)
+    geometry.compute_nodal_global_indices()
+
+    visualizer = Visualizer(geometry, str(tmp_path), interactive=False)
+
+    assert not geometry.nodes.is_created().any()
+    assert not geometry.elements.is_created().any()
+    np.testing.assert_array_equal(visualizer.coordinates, geometry.store.coordinates)
+    np.testing.assert_array_equal(visualizer.global_indices, geometry.get_nodal_global_indices())
+    assert list(visualizer.connectivity) == [8]
+    np.testing.assert_array_equal(visualizer.connectivity[8], geometry.store.connectivity)
@@ -0,0 +1,16 @@
+import os
+
+
+def test_export_streams_from_a_temporary_store(tmp_path, build_beam):
+    runner, _ = build_beam(-1000)
+    runner.run_analysis(solver_type='cholesky')
+
+    paths = runner.export_vtk(str(tmp_path / 'vtk' / 'beam'), chunk_rows=100)
+    store = runner.write_results(str(tmp_path / 'store'))
+    store_paths = runner.export_vtk(str(tmp_path / 'beam'), chunk_rows=100, store=store)
+
+    # The temporary store is removed and the files match those streamed from a kept store
+    assert sorted(os.listdir(tmp_path / 'vtk')) == ['beam.vtu', 'beam_gauss.vtu']
+    for path, store_path in zip(paths, store_paths):
+        with open(path, 'rb') as file, open(store_path, 'rb') as store_file:
+            assert file.read() == store_file.read()
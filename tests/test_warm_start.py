@@ -0,0 +1,33 @@
+import numpy as np
+
+
+def test_load_change_warm_starts_the_cached_conjugate_gradient_solver(build_beam):
+    runner, tip = build_beam(-1000)
+    runner.run_analysis(solver_type='cg')
+    solver = runner.solver
+    previous_displacements = runner.get_warm_start()
+
+    runner.apply_nodal_load(tip, 0, -1010)
+    runner.run_analysis(solver_type='cg')
+
+    # The factorization stage is reused, the solve starts from the previous solution
+    assert runner.solver is solver
+    np.testing.assert_array_equal(solver.initial_guess, previous_displacements)
+    assert solver.residual_history[0] < 0.02
+
+    cold_runner, _ = build_beam(-1010)
+    cold_runner.run_analysis(solver_type='cg')
+
+    assert solver.iterations < cold_runner.solver.iterations
+    np.testing.assert_allclose(runner.global_displacement_vector, cold_runner.global_displacement_vector, atol=1e-10)
+
+
+def test_load_change_without_warm_start_starts_from_zero(build_beam):
+    runner, tip = build_beam(-1000)
+    runner.run_analysis(solver_type='cg', solver_options={'warm_start': False})
+
+    runner.apply_nodal_load(tip, 0, -1010)
+    runner.run_analysis(solver_type='cg', solver_options={'warm_start': False})
+
+    assert runner.solver.initial_guess is None
+    assert runner.solver.residual_history[0] == 1.